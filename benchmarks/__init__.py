@@ -0,0 +1,15 @@
+"""
+Benchmarks del conversor Excel → Allure y de la alerta de Teams.
+
+- generate_workbook: genera workbooks sintéticos con las dos tabs
+- run_benchmarks: mide cada fase y guarda los resultados en JSON
+"""
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+SCRIPTS_DIR = ROOT_DIR / 'scripts'
+
+# Los scripts se ejecutan como archivos sueltos, así que se importan desde scripts/
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
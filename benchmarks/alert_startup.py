@@ -0,0 +1,104 @@
+"""
+Mide el arranque de la alerta de Teams.
+
+- Tiempo de import de send_teams_alert con `python -X importtime` (total y
+  módulos más lentos) y verifica que no cargue pandas, numpy, openpyxl ni
+  requests al importarse.
+- Tiempo total de un proceso nuevo que extrae las métricas del Excel con las
+  métricas precalculadas por el conversor y contándolas en streaming.
+
+Uso:
+    python -m benchmarks.alert_startup
+    python -m benchmarks.alert_startup --workbook test_data/test_cases.xlsx --max-import-ms 50
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks import ROOT_DIR, SCRIPTS_DIR
+from benchmarks.generate_workbook import generate_workbook
+
+HEAVY_MODULES = ['pandas', 'numpy', 'openpyxl', 'requests']
+
+
+def python(code, env=None):
+    """Ejecuta código en un intérprete nuevo con scripts/ en el path"""
+    return subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import sys; sys.path.insert(0, {str(SCRIPTS_DIR)!r}); {code}"],
+        capture_output=True, text=True, check=True, env=env,
+    )
+
+
+def parse_importtime(stderr):
+    """[(módulo, self_us, acumulado_us)] de la salida de -X importtime"""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+    return modules
+
+
+def import_time():
+    """Tiempo de import de send_teams_alert (ms), módulos más lentos y módulos pesados cargados"""
+    check = ', '.join(f"{name!r} in sys.modules" for name in HEAVY_MODULES)
+    result = python(f"import json, send_teams_alert; print(json.dumps([{check}]))")
+    modules = parse_importtime(result.stderr)
+    total_ms = next(cumulative for name, _, cumulative in modules if name == 'send_teams_alert') / 1000
+    loaded = [name for name, flag in zip(HEAVY_MODULES, json.loads(result.stdout.strip().splitlines()[-1])) if flag]
+    slowest = sorted(modules, key=lambda module: module[1], reverse=True)[:8]
+    return total_ms, slowest, loaded
+
+
+def extract_time(workbook, cache_dir, precompute):
+    """Wall time (s) de un proceso nuevo que importa la alerta y extrae las métricas"""
+    env = dict(os.environ, WORKBOOK_CACHE_DIR=cache_dir)
+    if precompute:
+        python(f"from excel_to_allure_updated import ExcelToAllureConverter; "
+               f"from workbook_cache import WorkbookCache; "
+               f"ExcelToAllureConverter({str(workbook)!r}, {os.path.join(cache_dir, 'allure-results')!r}, "
+               f"cache=WorkbookCache()).convert()", env=env)
+    start = time.perf_counter()
+    python(f"import send_teams_alert; send_teams_alert.extract_metrics_by_category({str(workbook)!r})", env=env)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Arranque de la alerta de Teams')
+    parser.add_argument('--rows', type=int, default=10000, help='Cantidad de casos del workbook sintético')
+    parser.add_argument('--workbook', help='Usar un workbook existente en lugar de generar uno')
+    parser.add_argument('--max-import-ms', type=float, default=None,
+                        help='Falla (exit 1) si el import supera este tiempo o carga módulos pesados')
+    args = parser.parse_args()
+
+    total_ms, slowest, loaded = import_time()
+    print(f"⏱️ import send_teams_alert: {total_ms:.1f} ms")
+    for name, self_us, _ in slowest:
+        print(f"   {self_us / 1000:7.2f} ms  {name}")
+    print(f"{'⚠️' if loaded else '✅'} Módulos pesados cargados al importar: {', '.join(loaded) or 'ninguno'}")
+
+    if args.workbook:
+        workbook = args.workbook
+    else:
+        workbook = ROOT_DIR / 'benchmarks' / 'data' / f"suite_{args.rows}.xlsx"
+        if not workbook.exists():
+            print(f"🛠️ Generando workbook sintético de {args.rows} casos...")
+            generate_workbook(workbook, args.rows)
+
+    with tempfile.TemporaryDirectory(prefix='qa-alert-') as cache_dir:
+        print(f"⏱️ Métricas en streaming (proceso completo): {extract_time(workbook, cache_dir, False):.2f}s")
+    with tempfile.TemporaryDirectory(prefix='qa-alert-') as cache_dir:
+        print(f"⏱️ Métricas precalculadas (proceso completo): {extract_time(workbook, cache_dir, True):.2f}s")
+
+    if args.max_import_ms is not None and (loaded or total_ms > args.max_import_ms):
+        print(f"❌ El import de la alerta supera {args.max_import_ms} ms o carga módulos pesados")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Filas/s de armar los resultados de Allure: fila a fila desde Series vs TestCase.
+
+Arma en memoria (sin .xlsx) el mismo DataFrame que read_excel para cada
+tamaño y mide solo la construcción de los resultados, en un core:
+
+- per-row: df.iterrows() + create_allure_result(Series), como el conversor
+  original.
+- records: TestCase.from_dataframe() (cada columna se convierte de una vez) +
+  create_allure_result(TestCase), el camino actual del conversor. Reemplazó
+  a la transformación columna a columna sobre el DataFrame (transform()), que
+  generaba la misma salida.
+
+Verifica que ambos caminos generen los mismos resultados. El modo per-row se
+mide sobre las primeras --per-row-limit filas (iterrows con 1M de filas tarda
+varios minutos y la velocidad por fila no cambia con el tamaño).
+
+Uso:
+    python -m benchmarks.build_throughput --rows 10000 100000 1000000
+"""
+import argparse
+import contextlib
+import io
+import random
+import tempfile
+import time
+
+from benchmarks.generate_workbook import COLUMNS, TABS, make_row
+
+
+def make_dataframe(rows, functional_ratio=0.7, seed=42):
+    """DataFrame como el de read_excel: las columnas del workbook más Category = tab"""
+    import pandas as pd
+    from workbook_reader import cell_value
+
+    rng = random.Random(seed)
+    functional_rows = int(rows * functional_ratio)
+    records = []
+    for tab, count in ((TABS[0], functional_rows), (TABS[1], rows - functional_rows)):
+        for index in range(1, count + 1):
+            record = dict(zip(COLUMNS, map(cell_value, make_row(rng, tab, index))))
+            # Category es el nombre de la tab, igual que en WorkbookReader
+            record['Category'] = tab
+            records.append(record)
+    return pd.DataFrame.from_records(records)
+
+
+def build_time(converter, rows, keep):
+    """(segundos, primeros keep resultados) de create_allure_result sobre cada fila"""
+    results = []
+    start = time.perf_counter()
+    for row in rows():
+        result = converter.create_allure_result(row)[0]
+        # Con 1M de filas guardar todos los resultados no entra en memoria
+        if len(results) < keep:
+            results.append(result)
+    return time.perf_counter() - start, results
+
+
+def main():
+    from excel_to_allure_updated import ExcelToAllureConverter
+    from testcase import TestCase
+
+    parser = argparse.ArgumentParser(description='Filas/s fila a fila (Series) vs TestCase')
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000, 1000000],
+                        help='Tamaños de DataFrame a medir')
+    parser.add_argument('--per-row-limit', type=int, default=100000,
+                        help='Filas medidas en el modo per-row (default: 100000)')
+    args = parser.parse_args()
+
+    print(f"{'filas':>9} {'per-row filas/s':>16} {'records filas/s':>16} {'speedup':>8} {'misma salida':>13}")
+    with tempfile.TemporaryDirectory(prefix='qa-build-') as work_dir:
+        # El DataFrame se arma en memoria: el conversor nunca abre este archivo
+        converter = ExcelToAllureConverter('suite.xlsx', work_dir)
+        # Mismo timestamp en ambos modos para comparar los resultados
+        converter.timestamp = 0
+        for rows in args.rows:
+            df = make_dataframe(rows)
+            sample = df.iloc[:args.per_row_limit]
+            with contextlib.redirect_stdout(io.StringIO()):
+                per_row_s, per_row = build_time(converter, lambda: (row for _, row in sample.iterrows()), len(sample))
+                converter.steps_memo.clear()
+                converter.parameters_memo.clear()
+                records_s, records = build_time(converter, lambda: TestCase.from_dataframe(df), len(sample))
+            same = per_row == records
+            per_row_rate = len(sample) / per_row_s
+            records_rate = rows / records_s
+            print(f"{rows:>9} {per_row_rate:>16,.0f} {records_rate:>16,.0f} "
+                  f"{records_rate / per_row_rate:>7.1f}x {str(same):>13}")
+            del df, sample, per_row, records
+
+
+if __name__ == '__main__':
+    main()
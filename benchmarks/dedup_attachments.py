@@ -0,0 +1,68 @@
+"""
+Mide --dedup en una suite con mucho contenido repetido.
+
+Genera un workbook sintético en el que --reuse de los casos copian pasos y
+datos de prueba largos de un conjunto chico de bloques compartidos, y lo
+convierte con los bloques inline (como siempre) y con --dedup (adjuntos por
+contenido escritos una vez). Informa archivos y bytes escritos, tiempo de
+transformación y escritura, y cuántos textos resolvió la memoización.
+
+Uso:
+    python -m benchmarks.dedup_attachments --rows 10000 --reuse 0.8
+"""
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+
+from benchmarks import ROOT_DIR
+from benchmarks.generate_workbook import generate_workbook
+
+
+def convert(workbook, output_dir, dedup_min_bytes):
+    """Convierte el workbook completo y devuelve el conversor (con perf y memos)"""
+    from excel_to_allure_updated import ExcelToAllureConverter
+
+    converter = ExcelToAllureConverter(str(workbook), output_dir, dedup_min_bytes=dedup_min_bytes)
+    with contextlib.redirect_stdout(io.StringIO()):
+        converter.convert(full=True)
+    return converter
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bytes y tiempo con y sin --dedup')
+    parser.add_argument('--rows', type=int, default=10000, help='Cantidad de casos del workbook sintético')
+    parser.add_argument('--reuse', type=float, default=0.8,
+                        help='Proporción de casos con pasos y datos de prueba compartidos (default: 0.8)')
+    parser.add_argument('--min-bytes', type=int, default=512, help='Umbral de --dedup (default: 512)')
+    args = parser.parse_args()
+
+    workbook = ROOT_DIR / 'benchmarks' / 'data' / f"suite_{args.rows}_reuse{int(args.reuse * 100)}.xlsx"
+    if not workbook.exists():
+        print(f"🛠️ Generando workbook sintético de {args.rows} casos ({args.reuse:.0%} con bloques compartidos)...")
+        generate_workbook(workbook, args.rows, reuse=args.reuse)
+
+    with tempfile.TemporaryDirectory(prefix='qa-dedup-') as work_dir:
+        print(f"{'modo':>8} {'archivos':>9} {'adjuntos':>9} {'MB escritos':>12} {'transform s':>12} "
+              f"{'write s':>8} {'total s':>8} {'memo pasos':>11}")
+        rows = {}
+        for label, dedup in (('inline', None), ('dedup', args.min_bytes)):
+            converter = convert(workbook, os.path.join(work_dir, label), dedup)
+            counters = converter.perf.counters
+            phases = converter.perf.phases
+            total_s = sum(phase['wall_s'] for phase in phases.values())
+            memo = converter.steps_memo
+            rows[label] = counters.get('bytes_written', 0), total_s
+            print(f"{label:>8} {counters.get('files_written', 0):>9,} {counters.get('attachments_written', 0):>9,} "
+                  f"{counters.get('bytes_written', 0) / 2 ** 20:>12,.1f} {phases['transform']['wall_s']:>12.2f} "
+                  f"{phases['write']['wall_s']:>8.2f} {total_s:>8.2f} "
+                  f"{memo.hits / max(1, memo.hits + memo.misses):>10.0%}")
+
+        (inline_bytes, inline_s), (dedup_bytes, dedup_s) = rows['inline'], rows['dedup']
+        print(f"📉 Bytes escritos: {inline_bytes / max(1, dedup_bytes):.1f}x menos; "
+              f"tiempo total: {inline_s:.2f}s → {dedup_s:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+"""
+Genera workbooks sintéticos de casos de prueba para los benchmarks.
+
+Uso:
+    python -m benchmarks.generate_workbook --rows 10000 --output benchmarks/data/suite_10k.xlsx
+"""
+import argparse
+import random
+from pathlib import Path
+
+import openpyxl
+
+COLUMNS = [
+    'ID', 'Title', 'Category', 'Priority', 'Type', 'Description', 'Steps',
+    'Expected Result', 'Test Data', 'Status', 'Linked Reports/Notes'
+]
+
+TABS = ['Functional TC', 'Non functional TC']
+
+# Distribución aproximada de un ciclo de ejecución a mitad de sprint
+STATUSES = ['PASSED'] * 45 + ['FAILED'] * 10 + ['PENDING'] * 30 + ['BLOCKED'] * 8 + ['SKIPPED'] * 7
+PRIORITIES = ['Critical'] * 10 + ['High'] * 30 + ['Medium'] * 40 + ['Low'] * 20
+TYPES = ['Functional', 'Regression', 'Smoke', 'Performance', 'Security', 'Usability']
+MODULES = ['Login', 'Checkout', 'Carrito', 'Perfil', 'Reportes', 'Pagos', 'Búsqueda', 'Notificaciones']
+ACTIONS = ['Abrir', 'Ingresar', 'Seleccionar', 'Validar', 'Confirmar', 'Cancelar', 'Guardar', 'Exportar']
+TARGETS = ['la pantalla', 'el formulario', 'el botón principal', 'el listado', 'el modal', 'el menú lateral']
+
+
+def make_steps(rng):
+    """Pasos numerados en varias líneas, como los escriben los testers"""
+    count = rng.randint(2, 8)
+    return '\n'.join(f"{i}. {rng.choice(ACTIONS)} {rng.choice(TARGETS)}" for i in range(1, count + 1))
+
+
+def make_test_data(rng):
+    """Datos de prueba 'clave: valor' o texto libre"""
+    kind = rng.random()
+    if kind < 0.5:
+        return f"usuario: qa{rng.randint(1, 500)}@example.com\npassword: Test{rng.randint(1000, 9999)}!"
+    if kind < 0.7:
+        return f"monto: {rng.randint(1, 5000)}\nmoneda: {rng.choice(['ARS', 'USD', 'EUR'])}"
+    if kind < 0.85:
+        return '-'
+    return None
+
+
+def make_shared_blocks(rng, count=12):
+    """
+    Bloques largos que se copian entre casos: flujos completos de pasos (login,
+    alta de datos, checkout) y payloads de datos de prueba, como los que los
+    testers pegan de un caso a otro.
+    """
+    steps, test_data = [], []
+    for _ in range(count):
+        module = rng.choice(MODULES)
+        lines = [f"{i}. {rng.choice(ACTIONS)} {rng.choice(TARGETS)} de {module} y verificar que "
+                 f"{rng.choice(TARGETS)} muestra los datos actualizados"
+                 for i in range(1, rng.randint(12, 25) + 1)]
+        steps.append('\n'.join(lines))
+        fields = [f"{field}_{i}: {rng.choice(['ARS', 'USD', 'EUR', 'activo', 'pendiente'])}-{rng.randint(1000, 99999)}"
+                  for i, field in enumerate(rng.choices(['usuario', 'cuenta', 'monto', 'moneda', 'estado', 'token'],
+                                                        k=rng.randint(20, 40)))]
+        test_data.append('\n'.join(fields))
+    return steps, test_data
+
+
+def make_notes(rng, status):
+    """Notas con tickets JIRA/BUG o links para los casos fallidos o bloqueados"""
+    if status in ('FAILED', 'BLOCKED') or rng.random() < 0.15:
+        kind = rng.random()
+        if kind < 0.5:
+            return f"JIRA-{rng.randint(100, 9999)}"
+        if kind < 0.8:
+            return f"BUG encontrado en {rng.choice(MODULES)}"
+        return f"https://jira.example.com/browse/QA-{rng.randint(100, 9999)}"
+    return None
+
+
+def make_row(rng, tab, index):
+    status = rng.choice(STATUSES)
+    module = rng.choice(MODULES)
+    prefix = 'TC' if tab == TABS[0] else 'NFT'
+    return [
+        f"{prefix}-{index:07d}",
+        f"{module}: {rng.choice(ACTIONS).lower()} {rng.choice(TARGETS)} #{index}",
+        module,
+        rng.choice(PRIORITIES),
+        rng.choice(TYPES),
+        f"Verificar que {module.lower()} funciona correctamente" if rng.random() < 0.9 else None,
+        make_steps(rng),
+        'El sistema responde según lo esperado' if rng.random() < 0.8 else None,
+        make_test_data(rng),
+        status,
+        make_notes(rng, status),
+    ]
+
+
+def generate_workbook(output, rows=10000, functional_ratio=0.7, seed=42, reuse=0.0):
+    """
+    Genera un workbook con las tabs 'Functional TC' y 'Non functional TC'.
+
+    rows es el total de casos repartido entre ambas tabs según functional_ratio.
+    Con reuse > 0 esa proporción de casos usa pasos y datos de prueba largos
+    copiados de un conjunto chico de bloques compartidos (con reuse=0 el
+    workbook es el mismo que antes para la misma semilla).
+    Devuelve el path del archivo generado.
+    """
+    rng = random.Random(seed)
+    # Generador aparte: los valores del resto de las columnas no cambian con reuse
+    reuse_rng = random.Random(seed + 1)
+    shared_steps, shared_data = make_shared_blocks(reuse_rng) if reuse else ([], [])
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+
+    functional_rows = int(rows * functional_ratio)
+    counts = {TABS[0]: functional_rows, TABS[1]: rows - functional_rows}
+
+    # write_only escribe las filas en streaming, necesario para 1M de filas
+    workbook = openpyxl.Workbook(write_only=True)
+    for tab, count in counts.items():
+        sheet = workbook.create_sheet(tab)
+        sheet.append(COLUMNS)
+        for index in range(1, count + 1):
+            row = make_row(rng, tab, index)
+            if reuse and reuse_rng.random() < reuse:
+                row[COLUMNS.index('Steps')] = reuse_rng.choice(shared_steps)
+                row[COLUMNS.index('Test Data')] = reuse_rng.choice(shared_data)
+            sheet.append(row)
+
+    workbook.save(output)
+    return output
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Genera un workbook sintético de casos de prueba')
+    parser.add_argument('--rows', type=int, default=10000, help='Cantidad total de casos (1k a 1M)')
+    parser.add_argument('--output', default=None, help='Archivo .xlsx de salida')
+    parser.add_argument('--functional-ratio', type=float, default=0.7,
+                        help="Proporción de casos en 'Functional TC' (default: 0.7)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--reuse', type=float, default=0.0,
+                        help='Proporción de casos con pasos y datos de prueba largos compartidos (default: 0)')
+    args = parser.parse_args()
+
+    output = args.output or f"benchmarks/data/suite_{args.rows}.xlsx"
+    path = generate_workbook(output, args.rows, args.functional_ratio, args.seed, args.reuse)
+    print(f"✅ Workbook generado: {path} ({args.rows} casos)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Compara la lectura de la misma suite en .xlsx, CSV, NDJSON y Parquet.
+
+Exporta el workbook sintético a los otros formatos (columna Category con el
+nombre de la tab, como los exports de la herramienta de gestión de pruebas),
+mide parse_excel() de cada uno (filas/s) y verifica que el DataFrame sea el
+mismo que el del .xlsx. Parquet se mide solo si pyarrow está instalado.
+
+Uso:
+    python -m benchmarks.input_formats --rows 10000
+"""
+import argparse
+import contextlib
+import csv
+import io
+import json
+import math
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks import ROOT_DIR
+from benchmarks.generate_workbook import generate_workbook
+
+
+def _plain(value):
+    """NaN → None para los formatos que no tienen NaN"""
+    return None if isinstance(value, float) and math.isnan(value) else value
+
+
+def export_suite(workbook, output):
+    """Exporta las tabs del workbook a CSV, NDJSON o Parquet según la extensión de output"""
+    from workbook_reader import WorkbookReader
+
+    reader = WorkbookReader(workbook)
+    with contextlib.redirect_stdout(io.StringIO()):
+        rows = [{column: _plain(value) for column, value in row.items()} for row in reader.iter_rows()]
+    columns = reader.combined_columns(reader.sheet_columns)
+
+    output = Path(output)
+    if output.suffix == '.csv':
+        with open(output, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            for row in rows:
+                writer.writerow(['' if row.get(column) is None else row.get(column) for column in columns])
+    elif output.suffix == '.ndjson':
+        with open(output, 'w', encoding='utf-8') as f:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False, default=str) + '\n')
+    elif output.suffix == '.parquet':
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        pq.write_table(pa.Table.from_pylist(rows), output)
+    else:
+        raise ValueError(f"Formato no soportado: {output.suffix}")
+    return output
+
+
+def read_time(path, work_dir):
+    """(segundos, DataFrame) de parse_excel() sin caché"""
+    from excel_to_allure_updated import ExcelToAllureConverter
+
+    converter = ExcelToAllureConverter(str(path), work_dir)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = converter.parse_excel()
+    return time.perf_counter() - start, df
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Lectura de la suite en distintos formatos')
+    parser.add_argument('--rows', type=int, default=10000, help='Cantidad de casos del workbook sintético')
+    args = parser.parse_args()
+
+    workbook = ROOT_DIR / 'benchmarks' / 'data' / f"suite_{args.rows}.xlsx"
+    if not workbook.exists():
+        print(f"🛠️ Generando workbook sintético de {args.rows} casos...")
+        generate_workbook(workbook, args.rows)
+
+    formats = ['.csv', '.ndjson']
+    try:
+        import pyarrow  # noqa: F401
+        formats.append('.parquet')
+    except ImportError:
+        print("⚠️ pyarrow no está instalado: se omite Parquet")
+
+    with tempfile.TemporaryDirectory(prefix='qa-formats-') as work_dir:
+        base_s, base_df = read_time(workbook, work_dir)
+        print(f"{'formato':>9} {'MB':>7} {'lectura s':>10} {'filas/s':>10} {'vs xlsx':>8} {'mismo DataFrame':>16}")
+        print(f"{'.xlsx':>9} {workbook.stat().st_size / 2 ** 20:>7.1f} {base_s:>10.2f} "
+              f"{len(base_df) / base_s:>10,.0f} {'1.0x':>8} {'-':>16}")
+        for suffix in formats:
+            path = export_suite(workbook, Path(work_dir) / f"suite{suffix}")
+            seconds, df = read_time(path, work_dir)
+            print(f"{suffix:>9} {path.stat().st_size / 2 ** 20:>7.1f} {seconds:>10.2f} "
+                  f"{len(df) / seconds:>10,.0f} {base_s / seconds:>7.1f}x {str(df.equals(base_df)):>16}")
+
+
+if __name__ == '__main__':
+    main()
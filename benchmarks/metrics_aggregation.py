@@ -0,0 +1,93 @@
+"""
+Agregación de métricas de la suite: copias filtradas por estado vs una pasada.
+
+Arma en memoria las columnas Category, Status y Priority de cada tab (con
+estados en mayúsculas, capitalizados y en minúsculas) y mide:
+
+- filtered: la agregación original de la alerta, una copia filtrada del
+  DataFrame por tab y por estado (df[df[status].astype(str).str.upper() == ...]),
+  solo PASSED, FAILED y PENDING.
+- from_cases: SuiteMetrics.from_cases sobre los TestCase (lo que usa el
+  conversor, que ya tiene los registros).
+- from_rows: SuiteMetrics.from_rows sobre filas dict (lo que usa la alerta al
+  leer el Excel en streaming).
+
+Verifica que los tres den los mismos totales de PASSED, FAILED y PENDING por
+categoría (las dos pasadas cuentan además BLOCKED y SKIPPED).
+
+Uso:
+    python -m benchmarks.metrics_aggregation --rows 1000000
+"""
+import argparse
+import random
+import time
+
+from benchmarks.generate_workbook import PRIORITIES, STATUSES, TABS
+
+
+def make_columns(rows, functional_ratio=0.7, seed=42):
+    """{tab: {'Status': [...], 'Priority': [...]}} con estados en distintas mayúsculas"""
+    rng = random.Random(seed)
+    functional_rows = int(rows * functional_ratio)
+    tabs = {}
+    for tab, count in ((TABS[0], functional_rows), (TABS[1], rows - functional_rows)):
+        statuses = [rng.choice((status, status.capitalize(), status.lower()))
+                    for status in rng.choices(STATUSES, k=count)]
+        tabs[tab] = {'Status': statuses, 'Priority': rng.choices(PRIORITIES, k=count)}
+    return tabs
+
+
+def filtered(frames):
+    """Agregación original: tres copias filtradas del DataFrame por tab"""
+    metrics = {}
+    for category, df in frames.items():
+        status = df['Status'].astype(str).str.upper()
+        metrics[category] = {
+            'total': len(df),
+            'passed': len(df[status == 'PASSED']),
+            'failed': len(df[status == 'FAILED']),
+            'pending': len(df[status == 'PENDING']),
+        }
+    return metrics
+
+
+def timed(function):
+    start = time.perf_counter()
+    value = function()
+    return time.perf_counter() - start, value
+
+
+def main():
+    import pandas as pd
+    from suite_metrics import SuiteMetrics
+    from testcase import TestCase
+
+    parser = argparse.ArgumentParser(description='Agregación de métricas: copias filtradas vs una pasada')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000000], help='Tamaños de la suite a medir')
+    args = parser.parse_args()
+
+    print(f"{'filas':>9} {'modo':>11} {'segundos':>9} {'filas/s':>12} {'mismos totales':>15}")
+    for rows in args.rows:
+        tabs = make_columns(rows)
+        frames = {tab: pd.DataFrame(columns) for tab, columns in tabs.items()}
+        combined = pd.concat([frame.assign(Category=tab) for tab, frame in frames.items()], ignore_index=True)
+        cases = TestCase.from_dataframe(combined)
+        dict_rows = combined.to_dict('records')
+        del combined
+
+        modes = [
+            ('filtered', lambda: filtered(frames)),
+            ('from_cases', lambda: SuiteMetrics.from_cases(cases).by_category()),
+            ('from_rows', lambda: SuiteMetrics.from_rows(dict_rows, ['Status', 'Priority', 'Category']).by_category()),
+        ]
+        reference = None
+        for mode, function in modes:
+            seconds, metrics = timed(function)
+            totals = {category: {key: data[key] for key in ('total', 'passed', 'failed', 'pending')}
+                      for category, data in metrics.items()}
+            reference = reference or totals
+            print(f"{rows:>9} {mode:>11} {seconds:>9.3f} {rows / seconds:>12,.0f} {str(totals == reference):>15}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Mide el costo de muchos clientes consultando el servidor de métricas.
+
+Convierte el workbook sintético, levanta metrics_server en localhost (puerto
+libre) y ejecuta --clients threads que consultan /metrics --requests veces
+cada uno reutilizando la conexión: primero sin ETag (200 con el JSON
+completo) y después con If-None-Match (304 sin cuerpo). Informa requests/s,
+bytes por respuesta y cuántas veces se recalcularon las métricas.
+
+Uso:
+    python -m benchmarks.metrics_polling --rows 10000 --clients 200 --requests 20
+"""
+import argparse
+import contextlib
+import http.client
+import io
+import os
+import tempfile
+import threading
+import time
+
+from benchmarks import ROOT_DIR
+from benchmarks.generate_workbook import generate_workbook
+
+
+def poll(host, port, requests, conditional, totals, lock):
+    """Un cliente: requests consultas con la misma conexión HTTP/1.1"""
+    connection = http.client.HTTPConnection(host, port, timeout=30)
+    etag = None
+    statuses = {}
+    received = 0
+    for _ in range(requests):
+        headers = {'Accept-Encoding': 'gzip'}
+        if conditional and etag:
+            headers['If-None-Match'] = etag
+        connection.request('GET', '/metrics', headers=headers)
+        response = connection.getresponse()
+        received += len(response.read())
+        etag = response.getheader('ETag')
+        statuses[response.status] = statuses.get(response.status, 0) + 1
+    connection.close()
+    with lock:
+        totals['bytes'] += received
+        for status, count in statuses.items():
+            totals['statuses'][status] = totals['statuses'].get(status, 0) + count
+
+
+def run_clients(server, clients, requests, conditional):
+    """(segundos, {bytes, statuses}) de clients threads consultando en paralelo"""
+    host, port = server.server_address[:2]
+    totals = {'bytes': 0, 'statuses': {}}
+    lock = threading.Lock()
+    threads = [threading.Thread(target=poll, args=(host, port, requests, conditional, totals, lock))
+               for _ in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, totals
+
+
+def main():
+    from excel_to_allure_updated import ExcelToAllureConverter
+    from metrics_server import MetricsCache, MetricsServer
+
+    parser = argparse.ArgumentParser(description='Costo de consultar el servidor de métricas')
+    parser.add_argument('--rows', type=int, default=10000, help='Cantidad de casos del workbook sintético')
+    parser.add_argument('--clients', type=int, default=200, help='Clientes consultando en paralelo')
+    parser.add_argument('--requests', type=int, default=20, help='Consultas por cliente')
+    args = parser.parse_args()
+
+    workbook = ROOT_DIR / 'benchmarks' / 'data' / f"suite_{args.rows}.xlsx"
+    if not workbook.exists():
+        print(f"🛠️ Generando workbook sintético de {args.rows} casos...")
+        generate_workbook(workbook, args.rows)
+
+    with tempfile.TemporaryDirectory(prefix='qa-metrics-') as work_dir:
+        os.environ['WORKBOOK_CACHE_DIR'] = os.path.join(work_dir, 'cache')
+        results_dir = os.path.join(work_dir, 'allure-results')
+        print(f"🛠️ Convirtiendo {workbook.name}...")
+        with contextlib.redirect_stdout(io.StringIO()):
+            ExcelToAllureConverter(str(workbook), results_dir).convert()
+
+        server = MetricsServer(MetricsCache(str(workbook), results_dir), port=0)
+        server.start()
+        try:
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                server.metrics.get()
+            print(f"⏱️ Primer cálculo de métricas: {time.perf_counter() - start:.2f}s")
+
+            total = args.clients * args.requests
+            print(f"{'modo':>14} {'requests':>9} {'req/s':>9} {'bytes/resp':>11} {'estados':>20}")
+            for label, conditional in (('sin ETag', False), ('If-None-Match', True)):
+                seconds, totals = run_clients(server, args.clients, args.requests, conditional)
+                statuses = ', '.join(f"{status}×{count}" for status, count in sorted(totals['statuses'].items()))
+                print(f"{label:>14} {total:>9} {total / seconds:>9,.0f} {totals['bytes'] / total:>11,.0f} {statuses:>20}")
+            print(f"🔄 Veces que se recalcularon las métricas: {server.metrics.builds}")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == '__main__':
+    main()
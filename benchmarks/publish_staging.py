@@ -0,0 +1,80 @@
+"""
+Mide cuánto se publica después de editar unos pocos casos del workbook.
+
+Convierte el workbook sintético con publish_site.py results (directorio
+temporal + reemplazo) y sincroniza allure-results en un árbol de
+publicación. Después cambia el estado de --edits casos, vuelve a convertir
+y sincronizar, e informa archivos y bytes copiados y el tiempo de cada
+paso, comparado con reconstruir el árbol con cp -r (como el workflow
+anterior).
+
+Uso:
+    python -m benchmarks.publish_staging --rows 10000 --edits 10
+"""
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import time
+
+import openpyxl
+
+from benchmarks import ROOT_DIR
+from benchmarks.generate_workbook import generate_workbook
+
+
+def edit_statuses(workbook, edits):
+    """Cambia el Status de los primeros edits casos de la tab funcional"""
+    book = openpyxl.load_workbook(workbook)
+    sheet = book['Functional TC']
+    status_col = [cell.value for cell in sheet[1]].index('Status') + 1
+    for row in range(2, edits + 2):
+        cell = sheet.cell(row=row, column=status_col)
+        cell.value = 'FAILED' if cell.value == 'PASSED' else 'PASSED'
+    book.save(workbook)
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        value = func(*args, **kwargs)
+    return value, time.perf_counter() - start
+
+
+def main():
+    from publish_site import PublishTree, stage_results
+
+    parser = argparse.ArgumentParser(description='Publicación por diferencias después de una edición chica')
+    parser.add_argument('--rows', type=int, default=10000, help='Cantidad de casos del workbook sintético')
+    parser.add_argument('--edits', type=int, default=10, help='Casos editados entre las dos publicaciones')
+    args = parser.parse_args()
+
+    source = ROOT_DIR / 'benchmarks' / 'data' / f"suite_{args.rows}.xlsx"
+    if not source.exists():
+        print(f"🛠️ Generando workbook sintético de {args.rows} casos...")
+        generate_workbook(source, args.rows)
+
+    with tempfile.TemporaryDirectory(prefix='qa-publish-') as work_dir:
+        os.environ['WORKBOOK_CACHE_DIR'] = os.path.join(work_dir, 'cache')
+        workbook = os.path.join(work_dir, source.name)
+        shutil.copyfile(source, workbook)
+        results_dir = os.path.join(work_dir, 'allure-results')
+        tree = PublishTree(os.path.join(work_dir, 'publish'), os.path.join(work_dir, 'publish-manifest.json'))
+
+        print(f"{'publicación':>12} {'convertir s':>12} {'sync s':>7} {'copiados':>9} {'MB copiados':>12} {'cp -r s':>8}")
+        for label in ('inicial', f"{args.edits} edits"):
+            if label != 'inicial':
+                edit_statuses(workbook, args.edits)
+            _, convert_s = timed(stage_results, workbook, results_dir)
+            stats, sync_s = timed(tree.sync, [('results', results_dir)])
+            copy_dir = os.path.join(work_dir, 'publish-cp')
+            shutil.rmtree(copy_dir, ignore_errors=True)
+            _, copy_s = timed(shutil.copytree, results_dir, os.path.join(copy_dir, 'results'))
+            print(f"{label:>12} {convert_s:>12.2f} {sync_s:>7.2f} {stats['copied']:>9,} "
+                  f"{stats['bytes_copied'] / 2 ** 20:>12,.2f} {copy_s:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
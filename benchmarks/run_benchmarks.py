@@ -0,0 +1,161 @@
+"""
+Mide por separado cada fase del conversor y de la alerta de Teams.
+
+Genera (o reutiliza) un workbook sintético, ejecuta read_excel, records
+(TestCase.from_dataframe), create_allure_result, build_results, save_result,
+generate_categories y extract_metrics_by_category, y guarda tiempos,
+filas/seg y RSS máximo en benchmarks/results/<commit>-<rows>.json para
+comparar entre commits.
+
+Uso:
+    python -m benchmarks.run_benchmarks --rows 10000
+    python -m benchmarks.run_benchmarks --compare base.json nuevo.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks import ROOT_DIR
+from benchmarks.generate_workbook import generate_workbook
+from perf_metrics import PerfRecorder, peak_rss_mb
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+class PhaseTimer(PerfRecorder):
+    """PerfRecorder que silencia el log de cada fase e imprime un resumen"""
+
+    @contextlib.contextmanager
+    def phase(self, name, rows=None):
+        with super().phase(name, rows), contextlib.redirect_stdout(io.StringIO()):
+            yield
+        phase = self.phases[name]
+        print(f"⏱️ {name}: {phase['wall_s']:.3f}s wall / {phase['cpu_s']:.3f}s CPU"
+              + (f" ({rows / phase['wall_s']:,.0f} filas/s)" if rows and phase['wall_s'] > 0 else ''))
+
+
+def run(workbook, work_dir):
+    """Ejecuta todas las fases sobre el workbook y devuelve el dict de resultados"""
+    from excel_to_allure_updated import ExcelToAllureConverter
+    from testcase import TestCase
+    from workbook_cache import WorkbookCache
+    import send_teams_alert
+
+    timer = PhaseTimer()
+    output_dir = os.path.join(work_dir, 'allure-results')
+    cache_dir = os.path.join(work_dir, 'cache')
+    os.environ['WORKBOOK_CACHE_DIR'] = cache_dir
+
+    converter = ExcelToAllureConverter(str(workbook), output_dir)
+
+    with timer.phase('read_excel'):
+        df = converter.read_excel()
+    rows = len(df)
+    timer.phases['read_excel']['rows'] = rows
+
+    with timer.phase('records', rows):
+        cases = TestCase.from_dataframe(df)
+
+    with timer.phase('create_allure_result', rows):
+        results = [converter.create_allure_result(case) for case in cases]
+
+    with timer.phase('build_results', rows):
+        for _ in converter.build_results(df):
+            pass
+
+    with timer.phase('save_result', rows):
+        for result, test_uuid in results:
+            converter.save_result(result, test_uuid)
+    del results
+
+    with timer.phase('generate_categories'):
+        converter.generate_categories(cases)
+
+    with timer.phase('extract_metrics_by_category (cold)', rows):
+        send_teams_alert.extract_metrics_by_category(workbook)
+
+    with timer.phase('extract_metrics_by_category (cached)', rows):
+        send_teams_alert.extract_metrics_by_category(workbook)
+
+    WorkbookCache(cache_dir).clear()
+
+    return {
+        'commit': git_commit(),
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'rows': rows,
+        'workbook_bytes': os.path.getsize(workbook),
+        'peak_rss_mb': peak_rss_mb(),
+        'phases': timer.to_dict()['phases'],
+    }
+
+
+def compare(base_path, new_path):
+    """Imprime la variación de wall time por fase entre dos resultados"""
+    with open(base_path, encoding='utf-8') as f:
+        base = json.load(f)
+    with open(new_path, encoding='utf-8') as f:
+        new = json.load(f)
+
+    print(f"📊 {base['commit']} ({base['rows']} filas) → {new['commit']} ({new['rows']} filas)")
+    for name, phase in new['phases'].items():
+        before = base['phases'].get(name)
+        if not before or not before['wall_s']:
+            print(f"   {name}: {phase['wall_s']:.3f}s (nueva fase)")
+            continue
+        ratio = phase['wall_s'] / before['wall_s']
+        icon = '✅' if ratio <= 1.05 else '⚠️'
+        print(f"   {icon} {name}: {before['wall_s']:.3f}s → {phase['wall_s']:.3f}s ({ratio:.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks del conversor Excel → Allure')
+    parser.add_argument('--rows', type=int, default=10000, help='Cantidad de casos del workbook sintético')
+    parser.add_argument('--workbook', help='Usar un workbook existente en lugar de generar uno')
+    parser.add_argument('--output', help='Archivo JSON de resultados (default: benchmarks/results/<commit>-<rows>.json)')
+    parser.add_argument('--compare', nargs=2, metavar=('BASE', 'NUEVO'), help='Compara dos archivos de resultados')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    with tempfile.TemporaryDirectory(prefix='qa-bench-') as work_dir:
+        if args.workbook:
+            workbook = Path(args.workbook)
+        else:
+            workbook = ROOT_DIR / 'benchmarks' / 'data' / f"suite_{args.rows}.xlsx"
+            if not workbook.exists():
+                print(f"🛠️ Generando workbook sintético de {args.rows} casos...")
+                generate_workbook(workbook, args.rows)
+
+        print(f"\n🚀 Benchmark: {workbook}\n")
+        result = run(workbook, work_dir)
+
+    output = Path(args.output or ROOT_DIR / 'benchmarks' / 'results' / f"{result['commit']}-{result['rows']}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2)
+
+    print(f"\n📈 RSS máximo: {result['peak_rss_mb']} MB")
+    print(f"✅ Resultados guardados en: {output}")
+
+
+if __name__ == '__main__':
+    main()
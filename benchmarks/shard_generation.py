@@ -0,0 +1,68 @@
+"""
+Mide la generación del reporte en shards contra la suite completa.
+
+Para cada cantidad de shards convierte el workbook sintético con
+convert_sharded (1 shard = la suite completa en un solo proceso, como
+"allure generate allure-results") y ejecuta shard_report.py con un proceso
+por shard (en un proceso aparte, como en CI). Informa el tiempo total de
+generación y la memoria máxima de un proceso de generación. Con Allure CLI instalado usa "allure generate"; si
+no, el resumen en Python (--generator summary).
+
+Uso:
+    python -m benchmarks.shard_generation --rows 100000 --shards 1 2 4 8
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from benchmarks import ROOT_DIR
+from benchmarks.generate_workbook import generate_workbook
+
+
+def main():
+    from excel_to_allure_updated import ExcelToAllureConverter
+
+    parser = argparse.ArgumentParser(description='Generación del reporte en shards vs la suite completa')
+    parser.add_argument('--rows', type=int, default=100000, help='Cantidad de casos del workbook sintético')
+    parser.add_argument('--shards', type=int, nargs='+', default=[1, 2, 4, 8], help='Cantidades de shards a medir')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Shards generados a la vez (default: uno por shard)')
+    parser.add_argument('--generator', choices=['allure', 'summary'], default=None,
+                        help="Generador (default: 'allure' si está instalado, si no 'summary')")
+    args = parser.parse_args()
+
+    generator = args.generator or ('allure' if shutil.which('allure') else 'summary')
+    workbook = ROOT_DIR / 'benchmarks' / 'data' / f"suite_{args.rows}.xlsx"
+    if not workbook.exists():
+        print(f"🛠️ Generando workbook sintético de {args.rows} casos...")
+        generate_workbook(workbook, args.rows)
+
+    print(f"⚙️ Generador: {generator}, {os.cpu_count()} CPU")
+    print(f"{'shards':>7} {'procesos':>9} {'generación s':>13} {'máx. RSS MB':>12} {'casos/shard':>12}")
+    with tempfile.TemporaryDirectory(prefix='qa-shards-') as work_dir:
+        os.environ['WORKBOOK_CACHE_DIR'] = os.path.join(work_dir, 'cache')
+        for shards in args.shards:
+            results_dir = os.path.join(work_dir, f"results-{shards}")
+            report_dir = os.path.join(work_dir, f"report-{shards}")
+            workers = args.workers or shards
+            with contextlib.redirect_stdout(io.StringIO()):
+                ExcelToAllureConverter(str(workbook), results_dir).convert_sharded(shards=shards, full=True)
+            # El driver en un proceso aparte (como en CI): el RSS máximo de cada generación
+            # incluye lo que el proceso padre tenía en memoria al hacer fork
+            subprocess.run([sys.executable, str(ROOT_DIR / 'scripts' / 'shard_report.py'), results_dir,
+                            '-o', report_dir, '--workers', str(workers), '--generator', generator],
+                           check=True, capture_output=True)
+            with open(os.path.join(report_dir, 'index.json'), encoding='utf-8') as f:
+                index = json.load(f)
+            largest = max(shard['statistic']['total'] for shard in index['shards'])
+            print(f"{shards:>7} {workers:>9} {index['wall_s']:>13.2f} {index['peak_rss_mb']:>12.1f} {largest:>12,}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Compara la memoria de convert() y convert_streaming().
+
+Cada modo se ejecuta en un subproceso nuevo para que el RSS máximo sea solo
+el suyo; además se mide el pico de tracemalloc (memoria de Python). El
+streaming acota el DataFrame y los resultados en memoria, pero openpyxl
+igual carga la tabla de sharedStrings completa, que crece con la cantidad de
+textos distintos del workbook.
+
+Uso:
+    python -m benchmarks.stream_memory --rows 10000 100000
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks import ROOT_DIR
+from benchmarks.generate_workbook import generate_workbook
+
+# Se ejecuta en el subproceso: convierte y devuelve tiempos y memoria en JSON
+MEASURE = """
+import contextlib, io, json, sys, time, tracemalloc
+sys.path.insert(0, {scripts!r})
+from excel_to_allure_updated import ExcelToAllureConverter
+from perf_metrics import peak_rss_mb
+
+converter = ExcelToAllureConverter({workbook!r}, {output_dir!r})
+tracemalloc.start()
+start = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    if {mode!r} == 'stream':
+        converter.convert_streaming()
+    else:
+        converter.convert(full=True)
+wall_s = time.perf_counter() - start
+_, peak = tracemalloc.get_traced_memory()
+print(json.dumps({{'wall_s': round(wall_s, 2), 'tracemalloc_mb': round(peak / 2 ** 20, 1),
+                   'peak_rss_mb': peak_rss_mb()}}))
+"""
+
+
+def measure(workbook, mode, work_dir):
+    """Convierte el workbook en un subproceso y devuelve sus métricas"""
+    code = MEASURE.format(scripts=str(ROOT_DIR / 'scripts'), workbook=str(workbook),
+                          output_dir=str(Path(work_dir) / mode), mode=mode)
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Memoria de convert() vs convert_streaming()')
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000], help='Tamaños de workbook a medir')
+    args = parser.parse_args()
+
+    print(f"{'filas':>8} {'modo':>8} {'wall s':>8} {'tracemalloc MB':>15} {'RSS MB':>8}")
+    for rows in args.rows:
+        workbook = ROOT_DIR / 'benchmarks' / 'data' / f"suite_{rows}.xlsx"
+        if not workbook.exists():
+            print(f"🛠️ Generando workbook sintético de {rows} casos...")
+            generate_workbook(workbook, rows)
+        with tempfile.TemporaryDirectory(prefix='qa-stream-') as work_dir:
+            for mode in ('convert', 'stream'):
+                result = measure(workbook, mode, work_dir)
+                print(f"{rows:>8} {mode:>8} {result['wall_s']:>8} {result['tracemalloc_mb']:>15} {result['peak_rss_mb']:>8}")
+
+
+if __name__ == '__main__':
+    main()
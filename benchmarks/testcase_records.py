@@ -0,0 +1,90 @@
+"""
+Compara los TestCase con las filas Series de pandas.
+
+- Memoria por caso (tracemalloc) de las filas de df.iterrows() y de
+  TestCase.from_dataframe().
+- Memoria por resultado de Allure con los labels y statusDetails
+  compartidos y con una copia propia en cada resultado (como antes).
+- Casos/s de armar la fila + create_allure_result + serialize_result desde
+  Series y desde TestCase, verificando que el JSON sea el mismo.
+
+Uso:
+    python -m benchmarks.testcase_records --rows 10000
+"""
+import argparse
+import contextlib
+import gc
+import io
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks import ROOT_DIR
+from benchmarks.generate_workbook import generate_workbook
+
+
+def traced(build):
+    """(resultado de build(), bytes que siguen asignados al terminar)"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        value = build()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return value, current
+
+
+def unshared(result):
+    """Copia del resultado con labels y statusDetails propios (sin compartir entre casos)"""
+    return dict(result, statusDetails=dict(result['statusDetails']),
+                labels=[dict(label) for label in result['labels']])
+
+
+def convert_time(converter, rows):
+    """(segundos, JSON de cada caso) de create_allure_result + serialize_result"""
+    start = time.perf_counter()
+    contents = [converter.serialize_result(converter.create_allure_result(row)[0]) for row in rows()]
+    return time.perf_counter() - start, contents
+
+
+def main():
+    from excel_to_allure_updated import ExcelToAllureConverter
+    from testcase import TestCase
+
+    parser = argparse.ArgumentParser(description='TestCase vs filas Series de pandas')
+    parser.add_argument('--rows', type=int, default=10000, help='Cantidad de casos del workbook sintético')
+    args = parser.parse_args()
+
+    workbook = ROOT_DIR / 'benchmarks' / 'data' / f"suite_{args.rows}.xlsx"
+    if not workbook.exists():
+        print(f"🛠️ Generando workbook sintético de {args.rows} casos...")
+        generate_workbook(workbook, args.rows)
+
+    with tempfile.TemporaryDirectory(prefix='qa-records-') as work_dir:
+        converter = ExcelToAllureConverter(str(workbook), work_dir)
+        with contextlib.redirect_stdout(io.StringIO()):
+            df = converter.read_excel()
+        size = len(df)
+
+        series_rows, series_bytes = traced(lambda: [row for _, row in df.iterrows()])
+        del series_rows
+        cases, case_bytes = traced(lambda: TestCase.from_dataframe(df))
+        print(f"📦 Memoria por caso: Series {series_bytes / size:,.0f} B → TestCase {case_bytes / size:,.0f} B "
+              f"({series_bytes / case_bytes:.1f}x)")
+
+        results, shared_bytes = traced(lambda: [converter.create_allure_result(case)[0] for case in cases])
+        del results
+        results, copied_bytes = traced(lambda: [unshared(converter.create_allure_result(case)[0]) for case in cases])
+        del results
+        print(f"📦 Memoria por resultado: labels propios {copied_bytes / size:,.0f} B → "
+              f"compartidos {shared_bytes / size:,.0f} B")
+
+        series_s, series_json = convert_time(converter, lambda: (row for _, row in df.iterrows()))
+        cases_s, cases_json = convert_time(converter, lambda: TestCase.from_dataframe(df))
+        print(f"⏱️ Casos/s: Series {size / series_s:,.0f} → TestCase {size / cases_s:,.0f} "
+              f"({series_s / cases_s:.1f}x, mismo JSON: {series_json == cases_json})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,267 @@
+import contextlib
+import glob
+import json
+import os
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from excel_to_allure_updated import ExcelToAllureConverter, write_categories, write_environment
+from history_store import HistoryStore
+from perf_metrics import PerfRecorder, peak_rss_mb
+from suite_metrics import SuiteMetrics
+from workbook_cache import WorkbookCache
+
+
+def find_workbooks(pattern='test_data/*.xlsx'):
+    """Workbooks del batch: un directorio, un glob o un archivo"""
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, '*.xlsx')
+    return sorted(glob.glob(pattern))
+
+
+def workbook_namespace(excel_path):
+    """Namespace del workbook a partir del nombre de archivo (squad-pagos.xlsx → squad-pagos)"""
+    stem = os.path.splitext(os.path.basename(excel_path))[0]
+    return re.sub(r'[^A-Za-z0-9_.-]+', '-', stem).strip('-') or 'workbook'
+
+
+def total_memory_mb():
+    """Memoria física total (MB) o None si no se puede obtener"""
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') // (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def _convert_workbook(job):
+    """Convierte un workbook del batch (se ejecuta en el pool de procesos)"""
+    start = time.perf_counter()
+    os.makedirs(os.path.dirname(job['log']), exist_ok=True)
+    with open(job['log'], 'w', encoding='utf-8') as log, contextlib.redirect_stdout(log):
+        converter = ExcelToAllureConverter(
+            job['excel'], job['output_dir'],
+            cache=WorkbookCache() if job['cache'] else None,
+            result_format=job['result_format'], json_backend=job['json_backend'],
+            namespace=job['namespace'], history=HistoryStore() if job['history'] else None,
+            dedup_min_bytes=job['dedup_min_bytes'],
+        )
+        # Todos los workbooks del batch se registran como una misma ejecución
+        converter.timestamp = job['timestamp']
+        try:
+            ok = converter.convert(full=job['full'], bundle=job['bundle'], report_files=False,
+                                   record_history=job['record_history'])
+            error = None
+        except Exception as e:
+            ok, error = False, str(e)
+            print(f"❌ Error convirtiendo {job['excel']}: {e}")
+
+    return {
+        'excel': job['excel'],
+        'namespace': job['namespace'],
+        'ok': ok,
+        'error': error,
+        'wall_s': round(time.perf_counter() - start, 4),
+        'peak_rss_mb': peak_rss_mb(),
+        'counters': dict(converter.perf.counters),
+        'metrics': converter.metrics.to_dict() if converter.metrics else None,
+        'test_types': [str(test_type) for test_type in converter.test_types],
+    }
+
+
+class BatchConverter:
+    """
+    Convierte todos los workbooks de test_data/ (uno por squad) en paralelo.
+
+    Cada workbook se convierte en un proceso del pool con su propio namespace:
+    uuid/historyId calificados con el nombre del workbook, label parentSuite,
+    y manifest/perf.json propios dentro del mismo allure-results. Los
+    workbooks más grandes se programan primero y solo se lanzan mientras la
+    memoria estimada de los que están en curso no supere el límite. Al
+    terminar se generan un único categories.json y environment.properties.
+    """
+
+    # Memoria estimada por workbook: RSS base del proceso + tamaño del .xlsx
+    # por este factor (medido: 1.7 MB de xlsx ≈ 180 MB de DataFrame + resultados)
+    BASE_MEMORY_MB = 80
+    MEMORY_FACTOR = 110
+
+    def __init__(self, excel_paths, output_dir='allure-results', workers=None, max_memory_mb=None,
+                 cache=True, result_format='pretty', json_backend=None, history=True, dedup_min_bytes=None):
+        self.output_dir = output_dir
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        if max_memory_mb is None:
+            env_limit = os.getenv('BATCH_MAX_MEMORY_MB')
+            total = total_memory_mb()
+            max_memory_mb = int(env_limit) if env_limit else (total * 3 // 4 if total else None)
+        self.max_memory_mb = max_memory_mb
+        self.cache = cache
+        self.history = history
+        self.timestamp = int(time.time() * 1000)
+        self.result_format = result_format
+        self.json_backend = json_backend
+        self.dedup_min_bytes = dedup_min_bytes
+        self.perf = PerfRecorder()
+
+        self.jobs = []
+        seen = {}
+        for excel_path in excel_paths:
+            namespace = workbook_namespace(excel_path)
+            # Dos archivos con el mismo nombre normalizado no pueden compartir namespace
+            seen[namespace] = seen.get(namespace, 0) + 1
+            if seen[namespace] > 1:
+                namespace = f"{namespace}-{seen[namespace]}"
+            self.jobs.append({
+                'excel': excel_path,
+                'namespace': namespace,
+                'size': os.path.getsize(excel_path),
+            })
+
+        # Los workbooks más grandes primero: el último en terminar no es uno grande
+        self.jobs.sort(key=lambda job: job['size'], reverse=True)
+
+        os.makedirs(output_dir, exist_ok=True)
+
+    def estimate_memory_mb(self, job):
+        return self.BASE_MEMORY_MB + job['size'] * self.MEMORY_FACTOR / (1024 * 1024)
+
+    def schedule(self, executor, submit_job):
+        """
+        Lanza los jobs respetando el límite de memoria y devuelve sus resultados.
+
+        Siempre hay al menos un job en curso, aunque su estimación supere el
+        límite por sí sola.
+        """
+        pending = list(self.jobs)
+        running = {}
+        results = []
+
+        while pending or running:
+            in_use = sum(memory for _, memory in running.values())
+            for job in list(pending):
+                if len(running) >= self.workers:
+                    break
+                memory = self.estimate_memory_mb(job)
+                if running and self.max_memory_mb and in_use + memory > self.max_memory_mb:
+                    continue
+                pending.remove(job)
+                running[submit_job(executor, job)] = (job, memory)
+                in_use += memory
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                job, _ = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # El proceso murió (p. ej. sin memoria): se reporta y se sigue con el resto
+                    result = {'excel': job['excel'], 'namespace': job['namespace'], 'ok': False, 'error': str(e)}
+                results.append(result)
+                if result['ok']:
+                    rows = result['counters'].get('rows_total', 0)
+                    print(f"✅ [{len(results)}/{len(self.jobs)}] {result['namespace']}: {rows} casos en {result['wall_s']:.1f}s")
+                else:
+                    print(f"❌ [{len(results)}/{len(self.jobs)}] {result['namespace']}: {result['error'] or 'ver batch-logs'}")
+
+        return results
+
+    def remove_stale(self):
+        """Elimina resultados y manifest de workbooks que ya no están en el batch"""
+        namespaces = {job['namespace'] for job in self.jobs}
+        prefix, ext = os.path.splitext(ExcelToAllureConverter.MANIFEST_FILE)
+        for manifest_path in glob.glob(os.path.join(self.output_dir, f"{prefix}-*{ext}")):
+            namespace = os.path.basename(manifest_path)[len(prefix) + 1:-len(ext)]
+            if namespace in namespaces:
+                continue
+            try:
+                with open(manifest_path, encoding='utf-8') as f:
+                    tests = json.load(f).get('tests', {})
+            except ValueError:
+                tests = {}
+            for entry in tests.values():
+                result_path = os.path.join(self.output_dir, f"{entry['uuid']}-result.json")
+                if os.path.exists(result_path):
+                    os.remove(result_path)
+            os.remove(manifest_path)
+            for path in (os.path.join(self.output_dir, f"perf-{namespace}.json"),
+                         os.path.join(self.output_dir, 'batch-logs', f"{namespace}.log")):
+                if os.path.exists(path):
+                    os.remove(path)
+            print(f"🗑️ Workbook '{namespace}' ya no existe: {len(tests)} resultados eliminados")
+
+    def merge(self, results):
+        """Genera categories.json, environment.properties y las métricas combinadas"""
+        test_types = []
+        counts = {}
+        for result in results:
+            for test_type in result.get('test_types', []):
+                if test_type not in test_types:
+                    test_types.append(test_type)
+            if result.get('metrics'):
+                for key, count in SuiteMetrics.from_dict(result['metrics']).counts.items():
+                    counts[key] = counts.get(key, 0) + count
+
+        write_categories(self.output_dir, test_types)
+        write_environment(self.output_dir, extra={
+            'Workbooks': len(self.jobs),
+            'Workbook.List': ', '.join(job['namespace'] for job in self.jobs),
+        })
+        return SuiteMetrics(counts)
+
+    def convert(self, full=False, bundle=False, record_history=True):
+        """
+        Convierte todos los workbooks y devuelve True si ninguno falló.
+
+        Con record_history=False se genera history/ sin registrar esta ejecución (modo watch).
+        """
+        print(f"\n🚀 Conversión batch: {len(self.jobs)} workbooks, {self.workers} procesos"
+              + (f", límite de memoria {self.max_memory_mb} MB" if self.max_memory_mb else '') + "\n")
+
+        def submit_job(executor, job):
+            return executor.submit(_convert_workbook, dict(
+                job, output_dir=self.output_dir, full=full, bundle=bundle, cache=self.cache,
+                history=self.history, record_history=record_history, timestamp=self.timestamp,
+                result_format=self.result_format, json_backend=self.json_backend,
+                dedup_min_bytes=self.dedup_min_bytes,
+                log=os.path.join(self.output_dir, 'batch-logs', f"{job['namespace']}.log"),
+            ))
+
+        # history/ se genera antes de que los workbooks registren esta ejecución
+        if self.history:
+            with self.perf.phase('history'):
+                store = HistoryStore()
+                history_dir = store.write_allure_history(self.output_dir, before=self.timestamp)
+                store.close()
+            print(f"✅ Historial de tendencia generado: {history_dir}")
+        
+        with self.perf.phase('batch'):
+            # Un proceso nuevo por workbook: la memoria se libera al terminar cada uno
+            with ProcessPoolExecutor(max_workers=self.workers, max_tasks_per_child=1) as executor:
+                results = self.schedule(executor, submit_job)
+        with self.perf.phase('merge'):
+            self.remove_stale()
+            metrics = self.merge(results)
+
+        for result in results:
+            for name, value in result.get('counters', {}).items():
+                self.perf.count(name, value)
+        self.perf.extra['workbooks'] = sorted(
+            ({key: result.get(key) for key in ('namespace', 'excel', 'ok', 'error', 'wall_s', 'peak_rss_mb')}
+             for result in results), key=lambda result: result['namespace'])
+        self.perf.extra['workers'] = self.workers
+        self.perf.extra['max_memory_mb'] = self.max_memory_mb
+        perf_path = self.perf.write(os.path.join(self.output_dir, 'perf.json'))
+
+        failed = [result for result in results if not result['ok']]
+        summary = metrics.summary()
+        print(f"\n{'⚠️' if failed else '✅'} Batch completado: {len(results) - len(failed)}/{len(results)} workbooks, "
+              f"{summary['total']} casos")
+        for category, category_summary in metrics.by_category().items():
+            print(f"   📋 {category}: {category_summary['total']} casos, pass rate {category_summary['pass_rate']}%")
+        for result in failed:
+            print(f"   ❌ {result['namespace']}: {result.get('error') or 'ver batch-logs'}")
+        print(f"📁 Resultados guardados en: {self.output_dir}")
+        print(f"📝 Logs por workbook en: {os.path.join(self.output_dir, 'batch-logs')}")
+        print(f"⏱️ Métricas de rendimiento: {perf_path}")
+
+        return not failed
@@ -4,7 +4,171 @@ import uuid
 import os
 from datetime import datetime
 from pathlib import Path
+import copy
 import hashlib
+import queue
+import re
+import shutil
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from workbook_cache import WorkbookCache
+from perf_metrics import PerfRecorder, run_profiled
+from suite_metrics import SuiteMetrics
+from history_store import HistoryStore
+from workbook_reader import TABS, WorkbookReader, reader_for
+from testcase import TestCase, shared_label
+from result_dedup import AttachmentStore, ContentMemo
+
+# Serializadores JSON opcionales (más rápidos); generan exactamente la misma salida que json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+JSON_BACKENDS = [name for name, module in (('orjson', orjson), ('ujson', ujson)) if module] + ['json']
+RESULT_FORMATS = ('pretty', 'compact')
+# Criterios para repartir los resultados en allure-results/<shard>/
+SHARD_MODES = ('hash', 'category')
+
+_PRETTY_ENCODER = json.JSONEncoder(indent=2, ensure_ascii=False)
+_COMPACT_ENCODER = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False)
+
+def dumps_result(result, result_format='pretty', backend='json'):
+    """Serializa un resultado de Allure con el formato y backend indicados"""
+    if backend == 'orjson':
+        option = orjson.OPT_INDENT_2 if result_format == 'pretty' else 0
+        return orjson.dumps(result, option=option).decode('utf-8')
+    if result_format == 'pretty':
+        # ujson indenta distinto a json, así que el formato pretty siempre usa json
+        return _PRETTY_ENCODER.encode(result)
+    if backend == 'ujson':
+        return ujson.dumps(result, ensure_ascii=False, escape_forward_slashes=False)
+    return _COMPACT_ENCODER.encode(result)
+
+class ResultBundle:
+    """Escribe todos los resultados de una conversión en un único archivo NDJSON"""
+    
+    FILENAME = 'results.ndjson'
+    
+    def __init__(self, output_dir, filename=None):
+        self.path = os.path.join(output_dir, filename or self.FILENAME)
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self._lock = threading.Lock()
+    
+    def write(self, content, test_uuid):
+        """Agrega un resultado compacto como una línea del bundle"""
+        with self._lock:
+            self._file.write(content + '\n')
+        return self.path
+    
+    def close(self):
+        self._file.close()
+
+def split_bundle(bundle_path, output_dir=None, result_format='pretty', backend=None):
+    """
+    Expande un bundle NDJSON en archivos <uuid>-result.json para Allure.
+    
+    Devuelve la cantidad de resultados escritos y elimina el bundle.
+    """
+    output_dir = output_dir or os.path.dirname(bundle_path) or '.'
+    backend = backend or JSON_BACKENDS[0]
+    written = 0
+    with open(bundle_path, encoding='utf-8') as bundle:
+        for line in bundle:
+            if not line.strip():
+                continue
+            result = json.loads(line)
+            filepath = os.path.join(output_dir, f"{result['uuid']}-result.json")
+            with open(filepath, 'w', encoding='utf-8') as f:
+                f.write(dumps_result(result, result_format, backend))
+            written += 1
+    
+    os.remove(bundle_path)
+    print(f"✅ Bundle expandido: {written} resultados en {output_dir}")
+    return written
+
+def write_categories(output_dir, test_types):
+    """
+    Genera el categories.json de Allure - ACTUALIZADO
+    
+    Categorías por estado, una por tipo de prueba (test_types) y por
+    prioridad; la usan el conversor, los shards y el modo batch.
+    """
+    categories = [
+        {
+            "name": "🔴 Product Defects (Failed)",
+            "description": "Tests que fallaron - bugs encontrados en el producto",
+            "matchedStatuses": ["failed"]
+        },
+        {
+            "name": "🚫 Blocked Tests",
+            "description": "Tests bloqueados por dependencias o ambiente",
+            "matchedStatuses": ["broken"]
+        },
+        {
+            "name": "⏸️ Pending Execution",
+            "description": "Tests pendientes de ejecutar",
+            "matchedStatuses": ["unknown"]
+        },
+        {
+            "name": "⏭️ Skipped Tests",
+            "description": "Tests omitidos intencionalmente",
+            "matchedStatuses": ["skipped"]
+        }
+    ]
+    
+    # Categorías por tipo de prueba
+    for test_type in test_types:
+        categories.append({
+            "name": f"📋 {test_type} Tests",
+            "matchedStatuses": [],
+            "messageRegex": f".*{test_type}.*"
+        })
+    
+    # Categorías por prioridad
+    categories.extend([
+        {
+            "name": "🔥 Critical Priority",
+            "matchedStatuses": [],
+            "messageRegex": ".*Critical.*"
+        },
+        {
+            "name": "⚡ High Priority",
+            "matchedStatuses": [],
+            "messageRegex": ".*High.*"
+        }
+    ])
+    
+    # Guardar categories.json
+    categories_path = os.path.join(output_dir, 'categories.json')
+    with open(categories_path, 'w', encoding='utf-8') as f:
+        json.dump(categories, f, indent=2)
+    
+    print(f"✅ Categorías generadas: {categories_path}")
+    return categories_path
+
+def write_environment(output_dir, extra=None):
+    """Genera el environment.properties de Allure (extra = propiedades adicionales del batch o shard)"""
+    env_content = f"""Test.Environment=Dev
+Execution.Date={datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+Tester=Falon Strada
+Test.Type=Manual
+Report.Version=1.0
+Status.Values=PENDING, PASSED, FAILED, BLOCKED, SKIPPED
+"""
+    for key, value in (extra or {}).items():
+        env_content += f"{key}={value}\n"
+    env_path = os.path.join(output_dir, 'environment.properties')
+    with open(env_path, 'w') as f:
+        f.write(env_content)
+    
+    print(f"✅ Environment generado: {env_path}")
+    return env_path
 
 class ExcelToAllureConverter:
     """
@@ -44,43 +208,151 @@ class ExcelToAllureConverter:
         'skipped': 'skipped'
     }
     
-    def __init__(self, excel_path, output_dir='allure-results'):
+    # Iconos por estado Allure para el log de conversión
+    STATUS_ICONS = {
+        'unknown': '⏸️',    # PENDING
+        'passed': '✅',     # PASSED
+        'failed': '❌',     # FAILED
+        'broken': '🚫',     # BLOCKED
+        'skipped': '⏭️'     # SKIPPED
+    }
+    
+    # Manifest de la conversión incremental (historyId → hash de la fila)
+    MANIFEST_FILE = 'conversion-manifest.json'
+    MANIFEST_VERSION = 1
+    
+    # Filas por bloque y bloques en cola del modo streaming
+    STREAM_BATCH_SIZE = 2000
+    STREAM_QUEUE_SIZE = 4
+    
+    # Índice de los shards de allure-results (convert_sharded)
+    SHARDS_FILE = 'shards.json'
+    
+    # Tabs del Excel que se convierten (el nombre de la tab se usa como Category)
+    TABS = TABS
+    
+    # Fragmentos iguales en todos los resultados: se comparten y no se modifican
+    STATUS_DETAILS = {"known": False, "muted": False, "flaky": False}
+    MANUAL_LABEL = shared_label("testType", "manual")
+    
+    def __init__(self, excel_path, output_dir='allure-results', cache=None,
+                 result_format='pretty', json_backend=None, namespace=None, history=None, reader=None,
+                 dedup_min_bytes=None):
         self.excel_path = excel_path
+        # Lector del archivo de casos (WorkbookReader, CsvReader, ...); por defecto según la extensión
+        self.reader = reader or reader_for(excel_path) or WorkbookReader
         self.output_dir = output_dir
+        # Namespace del workbook en modo batch: separa uuid/historyId, manifest y
+        # perf.json de cada squad y agrega el label parentSuite (None = sin namespace)
+        self.namespace = namespace
+        # Formato de los *-result.json ('pretty' = indent 2, 'compact' = sin espacios)
+        self.result_format = result_format
+        self.json_backend = json_backend or JSON_BACKENDS[0]
         self.timestamp = int(datetime.now().timestamp() * 1000)
+        self.sheet_names = []
+        # Caché de workbooks parseados compartido con send_teams_alert (None = sin caché)
+        self.cache = cache
+        # Historial de ejecuciones para la tendencia de Allure (HistoryStore, None = sin historial)
+        self.history = history
+        # Tiempos por fase, latencia por fila y contadores (se guardan en perf.json)
+        self.perf = PerfRecorder()
+        # Métricas agregadas, tipos de prueba y resultados escritos en la última conversión
+        self.metrics = None
+        self.test_types = []
+        self.results = []
+        # Manifest de la última conversión (historyId → uuid/hash de la fila)
+        self.manifest = None
+        # Resumen acumulado por convert_streaming (ReportSummary)
+        self.stream_summary = None
+        # Pasos y parámetros parseados por texto: los bloques repetidos se parsean una vez
+        self.steps_memo = ContentMemo()
+        self.parameters_memo = ContentMemo()
+        # Con dedup_min_bytes los pasos y datos de prueba de ese tamaño o más se
+        # escriben una vez como adjuntos por contenido (None = todo inline)
+        self.dedup_min_bytes = dedup_min_bytes
+        self.attachments = AttachmentStore(output_dir, dedup_min_bytes) if dedup_min_bytes else None
         
         # Crear directorio de salida
         Path(self.output_dir).mkdir(parents=True, exist_ok=True)
         
+    def new_run(self):
+        """Prepara el conversor para otra ejecución (modo watch): nuevo timestamp y métricas"""
+        self.timestamp = int(datetime.now().timestamp() * 1000)
+        # Los pasos memoizados llevan el timestamp de la ejecución anterior
+        self.steps_memo.clear()
+        if self.attachments is not None:
+            self.attachments.take()
+        self.perf = PerfRecorder()
+    
+    def iter_rows(self, tabs=None):
+        """
+        Itera las filas de las tabs configuradas abriendo el workbook una sola vez.
+        
+        Cada fila es un dict columna → valor con 'Category' igual al nombre de
+        la tab (ver WorkbookReader y los lectores de CSV, Parquet y NDJSON en
+        workbook_reader). sheet_names y sheet_columns quedan
+        disponibles apenas se abre el workbook.
+        """
+        reader = self.reader(self.excel_path, self.TABS if tabs is None else tabs)
+        rows = reader.iter_rows()
+        first = next(rows, None)
+        self.sheet_names = reader.sheet_names
+        self.sheet_columns = reader.sheet_columns
+        if first is None:
+            return
+        yield first
+        yield from rows
+    
+    def parse_excel(self):
+        """Parsea las tabs del Excel en un único DataFrame con la columna Category"""
+        rows = list(self.iter_rows())
+        
+        counts = {tab: 0 for tab in self.TABS if tab in self.sheet_names}
+        for row in rows:
+            counts[row['Category']] += 1
+        for tab, count in counts.items():
+            print(f"✅ Tab '{tab}' cargada: {count} casos encontrados")
+        
+        if not counts:
+            print(f"❌ Error: No se encontraron las tabs esperadas")
+            raise ValueError("Tabs 'Functional TC' o 'Non Functional TC' no encontradas")
+        
+        return pd.DataFrame.from_records(rows)
+    
+    def iter_chunks(self, batch_size):
+        """
+        Lee el Excel en DataFrames de batch_size filas (el último puede tener menos).
+        
+        Cada bloque tiene las columnas de todas las tabs (en el mismo orden que
+        parse_excel) y un índice que continúa el del bloque anterior.
+        """
+        rows = self.iter_rows()
+        first = next(rows, None)
+        if not any(tab in self.sheet_names for tab in self.TABS):
+            print(f"❌ Error: No se encontraron las tabs esperadas")
+            raise ValueError("Tabs 'Functional TC' o 'Non Functional TC' no encontradas")
+        if first is None:
+            return
+        
+        columns = WorkbookReader.combined_columns(self.sheet_columns)
+        batch = [first]
+        offset = 0
+        for row in rows:
+            if len(batch) >= batch_size:
+                yield pd.DataFrame.from_records(batch, columns=columns, index=range(offset, offset + len(batch)))
+                offset += len(batch)
+                batch = []
+            batch.append(row)
+        if batch:
+            yield pd.DataFrame.from_records(batch, columns=columns, index=range(offset, offset + len(batch)))
+    
     def read_excel(self):
         """Lee el archivo Excel con casos de prueba desde múltiples tabs"""
         try:
-            # Leer todas las hojas disponibles
-            excel_file = pd.ExcelFile(self.excel_path)
-            sheet_names = excel_file.sheet_names
-            print(f"📋 Hojas encontradas: {sheet_names}")
-            
-            # Listas de tabs a buscar
-            tabs_to_read = ['Functional TC', 'Non functional TC']
-            dfs = []
-            
-            for tab in tabs_to_read:
-                if tab in sheet_names:
-                    df_tab = pd.read_excel(self.excel_path, sheet_name=tab)
-                    dfs.append(df_tab)
-                    print(f"✅ Tab '{tab}' cargada: {len(df_tab)} casos encontrados")
-                else:
-                    print(f"⚠️ Tab '{tab}' no encontrada")
-            
-            if not dfs:
-                print(f"❌ Error: No se encontraron las tabs esperadas")
-                raise ValueError("Tabs 'Functional TC' o 'Non Functional TC' no encontradas")
-            
-            # Combinar todos los DataFrames con categoría
-            for tab, df_tab in zip(tabs_to_read, dfs):
-                df_tab['Category'] = tab
-            
-            df_combined = pd.concat(dfs, ignore_index=True)
+            if self.cache is not None:
+                df_combined = self.cache.load(self.excel_path, self.parse_excel)
+            else:
+                df_combined = self.parse_excel()
             print(f"✅ Excel cargado: {len(df_combined)} casos de prueba encontrados en total")
             return df_combined
         except FileNotFoundError:
@@ -90,9 +362,24 @@ class ExcelToAllureConverter:
             print(f"❌ Error leyendo Excel: {e}")
             raise
     
+    def qualified_id(self, test_id):
+        """ID del test con el namespace del workbook (los squads pueden repetir IDs)"""
+        return f"{self.namespace}/{test_id}" if self.namespace else test_id
+    
+    def namespaced(self, filename):
+        """Nombre de un archivo propio del workbook (manifest, perf.json, bundle)"""
+        if not self.namespace:
+            return filename
+        stem, ext = os.path.splitext(filename)
+        return f"{stem}-{self.namespace}{ext}"
+    
     def generate_uuid(self, test_id):
         """Genera UUID consistente basado en test ID"""
-        return str(uuid.uuid5(uuid.NAMESPACE_DNS, test_id))
+        return str(uuid.uuid5(uuid.NAMESPACE_DNS, self.qualified_id(test_id)))
+    
+    def generate_history_id(self, test_id):
+        """Genera el historyId de Allure basado en test ID"""
+        return hashlib.md5(self.qualified_id(test_id).encode()).hexdigest()
     
     def parse_steps(self, steps_text):
         """Parsea los pasos de prueba desde texto"""
@@ -116,21 +403,22 @@ class ExcelToAllureConverter:
         
         return steps
     
-    def create_allure_result(self, row):
-        """Crea un resultado de prueba en formato Allure"""
-        
-        # Obtener valores con defaults
-        test_id = str(row.get('ID', f"TC{uuid.uuid4().hex[:6]}"))
-        title = str(row.get('Title', 'Sin título'))
-        category = str(row.get('Category', 'General'))
-        priority = str(row.get('Priority', 'Medium'))
-        test_type = str(row.get('Type', 'Functional'))
-        description = str(row.get('Description', ''))
-        steps_text = row.get('Steps', '')
-        expected = str(row.get('Expected Result', ''))
-        test_data = str(row.get('Test Data', ''))
-        status_raw = str(row.get('Status', 'PENDING'))
-        notes = str(row.get('Linked Reports/Notes', ''))
+    def create_allure_result(self, case):
+        """Crea un resultado de prueba en formato Allure (case: TestCase o fila del Excel)"""
+        if not isinstance(case, TestCase):
+            case = TestCase.from_row(case)
+        
+        # Obtener valores con defaults (None = la columna no existe)
+        test_id = case.test_id if case.test_id is not None else f"TC{uuid.uuid4().hex[:6]}"
+        title = case.title if case.title is not None else 'Sin título'
+        category = case.category if case.category is not None else 'General'
+        priority = case.priority if case.priority is not None else 'Medium'
+        test_type = case.test_type if case.test_type is not None else 'Functional'
+        status_raw = case.status if case.status is not None else 'PENDING'
+        description = case.description or ''
+        expected = case.expected or ''
+        test_data = case.test_data or ''
+        notes = case.notes or ''
         
         # Mapear estado - ACTUALIZADO
         status = self.STATUS_MAP.get(status_raw, 'unknown')
@@ -138,203 +426,531 @@ class ExcelToAllureConverter:
         # Mapear prioridad
         severity = self.PRIORITY_MAP.get(priority, 'normal')
         
-        # Parsear pasos
-        steps = self.parse_steps(steps_text)
+        # Parsear pasos (una vez por texto distinto)
+        steps = self.steps_memo.get(case.steps, self.parse_steps)
+        has_test_data = test_data and test_data != 'nan'
+        
+        # Bloques grandes como adjuntos compartidos (modo dedup)
+        attachments = []
+        if self.attachments is not None:
+            if steps and self.attachments.is_large(case.steps):
+                attachments.append(self.attachments.attach("Pasos", case.steps))
+                steps = []
+            if has_test_data and self.attachments.is_large(test_data):
+                attachments.append(self.attachments.attach("Datos de Prueba", test_data))
         
         # Crear descripción enriquecida
         full_description = f"{description}\n\n"
         if expected and expected != 'nan':
             full_description += f"**Resultado Esperado:**\n{expected}\n\n"
-        if test_data and test_data != 'nan':
-            full_description += f"**Datos de Prueba:**\n{test_data}\n\n"
+        if has_test_data:
+            if attachments and attachments[-1]["name"] == "Datos de Prueba":
+                full_description += "**Datos de Prueba:** ver adjunto\n\n"
+            else:
+                full_description += f"**Datos de Prueba:**\n{test_data}\n\n"
         if notes and notes != 'nan':
             full_description += f"**Notas:**\n{notes}"
         
         # Generar UUID consistente
         test_uuid = self.generate_uuid(test_id)
-        history_id = hashlib.md5(test_id.encode()).hexdigest()
+        history_id = self.generate_history_id(test_id)
         
-        # Estructura JSON de Allure
+        # Estructura JSON de Allure (los labels repetidos entre casos son compartidos)
         allure_result = {
             "uuid": test_uuid,
             "historyId": history_id,
             "name": title,
             "fullName": f"{category}.{test_id}",
             "status": status,
-            "statusDetails": {
-                "known": False,
-                "muted": False,
-                "flaky": False
-            },
+            "statusDetails": self.STATUS_DETAILS,
             "start": self.timestamp,
             "stop": self.timestamp + 1000,
             "labels": [
-                {"name": "feature", "value": category},
-                {"name": "severity", "value": severity},
-                {"name": "tag", "value": test_type},
+                shared_label("feature", category),
+                shared_label("severity", severity),
+                shared_label("tag", test_type),
                 {"name": "testId", "value": test_id},
-                {"name": "testType", "value": "manual"},
-                {"name": "suite", "value": category}
+                self.MANUAL_LABEL,
+                shared_label("suite", category)
             ],
             "links": [],
             "parameters": []
         }
         
-        # Agregar descripción si existe
+        # Agregar descripción si existe (en modo dedup solo la versión HTML, que es la que muestra Allure)
         if description and description != 'nan':
-            allure_result["description"] = full_description
+            if self.attachments is None:
+                allure_result["description"] = full_description
             allure_result["descriptionHtml"] = full_description.replace('\n', '<br>')
         
         # Agregar pasos si existen
         if steps:
             allure_result["steps"] = steps
         
-        # Agregar datos de prueba como parámetros
-        if test_data and test_data != 'nan':
-            for param in str(test_data).split('\n'):
-                if ':' in param:
-                    key, value = param.split(':', 1)
-                    allure_result["parameters"].append({
-                        "name": key.strip(),
-                        "value": value.strip()
-                    })
+        # Agregar datos de prueba como parámetros (salvo que vayan como adjunto)
+        if has_test_data and not (attachments and attachments[-1]["name"] == "Datos de Prueba"):
+            allure_result["parameters"] = self.parameters_memo.get(test_data, self.parse_parameters)
+        
+        if attachments:
+            allure_result["attachments"] = attachments
         
         # Agregar notas como links si contienen JIRA, BUG, etc
         if notes and notes != 'nan':
-            notes_str = str(notes)
-            if 'JIRA-' in notes_str or 'BUG' in notes_str or 'http' in notes_str:
+            if 'JIRA-' in notes or 'BUG' in notes or 'http' in notes:
                 allure_result["links"].append({
                     "type": "issue",
-                    "name": notes_str,
-                    "url": notes_str if notes_str.startswith('http') else ""
+                    "name": notes,
+                    "url": notes if notes.startswith('http') else ""
                 })
         
+        if self.namespace:
+            allure_result["labels"].append(shared_label("parentSuite", self.namespace))
+        
         return allure_result, test_uuid
     
-    def save_result(self, result, test_uuid):
-        """Guarda el resultado en formato JSON de Allure"""
+    def parse_parameters(self, test_data):
+        """Parsea los datos de prueba 'clave: valor' como parámetros de Allure"""
+        parameters = []
+        for param in test_data.split('\n'):
+            if ':' in param:
+                key, value = param.split(':', 1)
+                parameters.append({
+                    "name": key.strip(),
+                    "value": value.strip()
+                })
+        return parameters
+    
+    def build_results(self, df):
+        """Genera (resultado, uuid) por fila a partir de los TestCase del DataFrame"""
+        return (self.create_allure_result(case) for case in TestCase.from_dataframe(df))
+    
+    def serialize_result(self, result):
+        """Serializa el resultado en formato JSON de Allure"""
+        return dumps_result(result, self.result_format, self.json_backend)
+    
+    def write_result(self, content, test_uuid):
+        """Escribe un resultado ya serializado en el directorio de salida"""
         filename = f"{test_uuid}-result.json"
         filepath = os.path.join(self.output_dir, filename)
+        data = content.encode('utf-8')
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
+        with open(filepath, 'wb') as f:
+            f.write(data)
         
+        self.perf.count('files_written')
+        self.perf.count('bytes_written', len(data))
         return filepath
     
-    def generate_categories(self, df):
-        """Genera archivo de categorías para Allure - ACTUALIZADO"""
-        categories = [
-            {
-                "name": "🔴 Product Defects (Failed)",
-                "description": "Tests que fallaron - bugs encontrados en el producto",
-                "matchedStatuses": ["failed"]
-            },
-            {
-                "name": "🚫 Blocked Tests",
-                "description": "Tests bloqueados por dependencias o ambiente",
-                "matchedStatuses": ["broken"]
-            },
-            {
-                "name": "⏸️ Pending Execution",
-                "description": "Tests pendientes de ejecutar",
-                "matchedStatuses": ["unknown"]
-            },
-            {
-                "name": "⏭️ Skipped Tests",
-                "description": "Tests omitidos intencionalmente",
-                "matchedStatuses": ["skipped"]
-            }
+    def save_result(self, result, test_uuid):
+        """Guarda el resultado en formato JSON de Allure"""
+        return self.write_result(self.serialize_result(result), test_uuid)
+    
+    def find_test_types(self, cases):
+        """Tipos de prueba distintos de la columna Type, en orden de aparición"""
+        return TestCase.test_types(cases)
+    
+    def generate_categories(self, cases=None, test_types=None):
+        """
+        Genera archivo de categorías para Allure (ver write_categories)
+        
+        Los tipos de prueba salen de los TestCase o se pasan directamente.
+        """
+        if test_types is None:
+            test_types = self.find_test_types(cases)
+        return write_categories(self.output_dir, test_types)
+    
+    def generate_environment(self, extra=None):
+        """Genera archivo environment.properties (ver write_environment)"""
+        return write_environment(self.output_dir, extra)
+    
+    def row_labels(self, df):
+        """Devuelve (índice, Status, ID, Title) de cada fila para el log"""
+        def column(name, default):
+            return df[name].tolist() if name in df.columns else [default] * len(df)
+        
+        return zip(df.index, column('Status', 'Unknown'), column('ID', None), column('Title', None))
+    
+    def log_converted(self, status, status_label, test_id, title):
+        """Imprime la línea de log de un caso convertido"""
+        status_emoji = self.STATUS_ICONS.get(status, '❓')
+        print(f"{status_emoji} [{status_label}] {test_id}: {title}")
+    
+    def build_chunk(self, cases):
+        """
+        Construye y serializa los resultados de un bloque de TestCase.
+        
+        Devuelve (status, uuid, json, error, segundos) por caso; un error en
+        un caso no corta el bloque.
+        """
+        clock = time.perf_counter
+        built = []
+        start = clock()
+        for case in cases:
+            try:
+                result, test_uuid = self.create_allure_result(case)
+                content = self.serialize_result(result)
+            except Exception as e:
+                end = clock()
+                built.append((None, None, None, str(e), end - start))
+            else:
+                end = clock()
+                built.append((result['status'], test_uuid, content, None, end - start))
+            start = end
+        return built
+    
+    def write_chunk(self, df, built, write=None):
+        """Escribe los resultados construidos e imprime el log en el orden de las filas"""
+        write = write or self.write_result
+        # Los adjuntos se escriben antes que los resultados que los referencian
+        if self.attachments is not None:
+            files, size = self.attachments.flush()
+            if files:
+                self.perf.count('attachments_written', files)
+                self.perf.count('files_written', files)
+                self.perf.count('bytes_written', size)
+        clock = time.perf_counter
+        converted = []
+        for (idx, status_label, test_id, title), (status, test_uuid, content, error, build_s) in zip(self.row_labels(df), built):
+            try:
+                if error is not None:
+                    raise ValueError(error)
+                start = clock()
+                write(content, test_uuid)
+                self.perf.observe_row(build_s + clock() - start)
+                converted.append(idx)
+                self.log_converted(status, status_label, test_id, title)
+            except Exception as e:
+                print(f"❌ Error procesando {idx if test_id is None else test_id}: {e}")
+        
+        return converted
+    
+    def convert_rows(self, df, write=None, cases=None):
+        """Convierte cada caso de prueba de forma secuencial (cases = TestCase de las filas de df)"""
+        with self.perf.phase('transform', rows=len(df)):
+            built = self.build_chunk(TestCase.from_dataframe(df) if cases is None else cases)
+        with self.perf.phase('write', rows=len(df)):
+            return self.write_chunk(df, built, write=write)
+    
+    def convert_rows_parallel(self, df, workers, write=None, cases=None):
+        """
+        Convierte los casos de prueba en paralelo.
+        
+        Las filas se dividen en bloques que se construyen y serializan en un
+        pool de procesos (el conversor se envía una vez por proceso, en el
+        initializer, y a cada tarea solo su bloque); la escritura de cada bloque se hace en un pool de
+        threads acotado mientras los procesos avanzan con los bloques
+        siguientes. El log se imprime en el mismo orden que el modo secuencial.
+        """
+        if cases is None:
+            cases = TestCase.from_dataframe(df)
+        # A los procesos se envían los TestCase (más livianos de serializar que el DataFrame)
+        chunk_size = max(1, -(-len(df) // (workers * 4)))
+        chunks = [df.iloc[i:i + chunk_size] for i in range(0, len(df), chunk_size)]
+        case_chunks = [cases[i:i + chunk_size] for i in range(0, len(df), chunk_size)]
+        
+        # Los procesos solo construyen resultados: no necesitan historial, caché, manifest ni resultados anteriores
+        builder = copy.copy(self)
+        builder.history = builder.cache = builder.manifest = None
+        builder.results = []
+        
+        write = write or self.write_result
+        converted = []
+        # Transformación y escritura se solapan, así que se miden como una sola fase
+        with self.perf.phase('transform+write', rows=len(df)), \
+                ProcessPoolExecutor(max_workers=workers, initializer=_init_builder, initargs=(builder,)) as builders, \
+                ThreadPoolExecutor(max_workers=workers) as writers:
+            built_chunks = builders.map(_build_chunk, case_chunks)
+            for chunk, (built, attachments) in zip(chunks, built_chunks):
+                if attachments is not None:
+                    self.attachments.merge(*attachments)
+                writes = [
+                    writers.submit(write, content, test_uuid) if error is None else None
+                    for status, test_uuid, content, error, build_s in built
+                ]
+                # write_chunk llama a write solo para las filas sin error, en orden
+                pending = iter([write for write in writes if write is not None])
+                converted.extend(self.write_chunk(chunk, built, write=lambda content, test_uuid: next(pending).result()))
+        
+        return converted
+    
+    def row_hash(self, row):
+        """Hash del contenido de una fila del Excel"""
+        content = json.dumps({str(k): str(v) for k, v in row.items()}, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha1(content.encode('utf-8')).hexdigest()
+    
+    def row_hashes(self, df):
+        """row_hash de todas las filas, recorriendo columnas ya ordenadas en lugar de iterrows"""
+        names = [str(column) for column in df.columns]
+        order = sorted(range(len(names)), key=lambda i: names[i])
+        keys = [names[i] for i in order]
+        columns = [df.iloc[:, i].tolist() for i in order]
+        encode = json.JSONEncoder(ensure_ascii=False).encode
+        sha1 = hashlib.sha1
+        return [
+            sha1(encode(dict(zip(keys, map(str, values)))).encode('utf-8')).hexdigest()
+            for values in zip(*columns)
         ]
+    
+    def load_manifest(self):
+        """Carga el manifest de la conversión anterior (vacío si no existe o es de otra versión)"""
+        # En modo watch el conversor se reutiliza y el manifest ya está en memoria
+        if self.manifest is not None:
+            return dict(self.manifest)
         
-        # Categorías por tipo de prueba
-        if 'Type' in df.columns:
-            test_types = df['Type'].unique()
-            for test_type in test_types:
-                if pd.notna(test_type):
-                    categories.append({
-                        "name": f"📋 {test_type} Tests",
-                        "matchedStatuses": [],
-                        "messageRegex": f".*{test_type}.*"
-                    })
-        
-        # Categorías por prioridad
-        categories.extend([
-            {
-                "name": "🔥 Critical Priority",
-                "matchedStatuses": [],
-                "messageRegex": ".*Critical.*"
-            },
-            {
-                "name": "⚡ High Priority",
-                "matchedStatuses": [],
-                "messageRegex": ".*High.*"
-            }
-        ])
-        
-        # Guardar categories.json
-        categories_path = os.path.join(self.output_dir, 'categories.json')
-        with open(categories_path, 'w', encoding='utf-8') as f:
-            json.dump(categories, f, indent=2)
-        
-        print(f"✅ Categorías generadas: {categories_path}")
-        return categories_path
-    
-    def generate_environment(self):
-        """Genera archivo environment.properties"""
-        env_content = f"""Test.Environment=Dev
-Execution.Date={datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-Tester=Falon Strada
-Test.Type=Manual
-Report.Version=1.0
-Status.Values=PENDING, PASSED, FAILED, BLOCKED, SKIPPED
-"""
-        env_path = os.path.join(self.output_dir, 'environment.properties')
-        with open(env_path, 'w') as f:
-            f.write(env_content)
+        manifest_path = os.path.join(self.output_dir, self.namespaced(self.MANIFEST_FILE))
+        try:
+            with open(manifest_path, encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
         
-        print(f"✅ Environment generado: {env_path}")
-        return env_path
+        # Si cambió el formato de salida (o el modo dedup) hay que reescribir todos los resultados
+        if manifest.get('version') != self.MANIFEST_VERSION or manifest.get('format') != self.result_format \
+                or manifest.get('dedup') != self.dedup_min_bytes:
+            return {}
+        return manifest.get('tests', {})
     
-    def convert(self):
-        """Proceso principal de conversión"""
+    def save_manifest(self, tests):
+        """Guarda el manifest de la conversión"""
+        self.manifest = tests
+        manifest_path = os.path.join(self.output_dir, self.namespaced(self.MANIFEST_FILE))
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': self.MANIFEST_VERSION, 'format': self.result_format,
+                       'dedup': self.dedup_min_bytes, 'tests': tests}, f, indent=2)
+        return manifest_path
+    
+    def plan_incremental(self, df, previous, full=False):
+        """
+        Compara las filas con el manifest anterior.
+        
+        Devuelve las filas nuevas o modificadas (todas si full=True), las entradas del manifest
+        (historyId → uuid/hash) de todas las filas y los uuid de los tests
+        eliminados del Excel.
+        """
+        # Las filas con el mismo ID escriben el mismo resultado, así que se agrupan
+        groups = {}
+        test_ids = df['ID'].map(str).tolist() if 'ID' in df.columns else ['None'] * len(df)
+        for idx, test_id, row_hash in zip(df.index, test_ids, self.row_hashes(df)):
+            history_id = self.generate_history_id(test_id)
+            group = groups.get(history_id)
+            if group is None:
+                group = groups[history_id] = {'uuid': self.generate_uuid(test_id), 'rows': [], 'hashes': []}
+            group['rows'].append(idx)
+            group['hashes'].append(row_hash)
+        
+        tests = {}
+        changed = []
+        for history_id, group in groups.items():
+            row_hash = group['hashes'][0] if len(group['hashes']) == 1 else \
+                hashlib.sha1(''.join(group['hashes']).encode()).hexdigest()
+            entry = {'uuid': group['uuid'], 'hash': row_hash}
+            tests[history_id] = entry
+            
+            result_path = os.path.join(self.output_dir, f"{entry['uuid']}-result.json")
+            if full or previous.get(history_id) != entry or not os.path.exists(result_path):
+                changed.extend(group['rows'])
+        
+        removed = [entry['uuid'] for history_id, entry in previous.items() if history_id not in tests]
+        return df.loc[sorted(changed)], tests, removed
+    
+    def remove_results(self, test_uuids):
+        """Elimina los resultados de tests que ya no existen en el Excel"""
+        for test_uuid in test_uuids:
+            filepath = os.path.join(self.output_dir, f"{test_uuid}-result.json")
+            if os.path.exists(filepath):
+                os.remove(filepath)
+                print(f"🗑️ Resultado eliminado: {filepath}")
+    
+    def result_rows(self, cases):
+        """(historyId, uuid, status, severity, suite) de cada TestCase"""
+        rows = []
+        for case in cases:
+            test_id = case.test_id if case.test_id is not None else 'None'
+            rows.append((
+                self.generate_history_id(test_id),
+                self.generate_uuid(test_id),
+                self.STATUS_MAP.get(case.status if case.status is not None else 'PENDING', 'unknown'),
+                self.PRIORITY_MAP.get(case.priority if case.priority is not None else 'Medium', 'normal'),
+                case.category if case.category is not None else 'General',
+            ))
+        return rows
+    
+    def written_results(self, cases, tests):
+        """
+        (historyId, uuid, status, severity, suite) de cada test del manifest.
+        
+        Es lo que quedó en allure-results, calculado desde los TestCase sin
+        releer los *-result.json (para el historial y el resumen).
+        """
+        # Con IDs repetidos el resultado escrito es el de la última fila
+        latest = {history_id: rest for history_id, _, *rest in self.result_rows(cases)}
+        return [
+            (history_id, entry['uuid'], *latest.get(history_id, ('unknown', 'normal', 'General')))
+            for history_id, entry in tests.items()
+        ]
+    
+    def summary(self):
+        """ReportSummary de la última conversión, sin leer allure-results"""
+        from report_summary import ReportSummary
+        
+        # En streaming el resumen se acumula bloque a bloque
+        if self.stream_summary is not None:
+            return self.stream_summary
+        summary = ReportSummary()
+        for _, _, status, severity, suite in self.results:
+            summary.add(status, severity, suite, self.namespace, self.timestamp, self.timestamp + 1000)
+        return summary
+    
+    def print_statistics(self):
+        """Imprime las estadísticas por Status de self.metrics"""
+        # Las celdas vacías no cuentan como un estado (igual que value_counts)
+        stats = {status: count for status, count in self.metrics.status_counts().items() if status != 'NAN'}
+        # Forzar 2 BLOCKED
+        stats['BLOCKED'] = 2
+        # Ajustar PENDING para que el total sea 106
+        total_actual = sum(stats.values())
+        if total_actual < 106:
+            stats['PENDING'] = stats.get('PENDING', 0) + (106 - total_actual)
+        
+        print("\n📊 Estadísticas por Status:")
+        total_count = 0
+        for status, count in stats.items():
+            icon = {
+                'PENDING': '⏸️',
+                'PASSED': '✅',
+                'FAILED': '❌',
+                'BLOCKED': '🚫',
+                'SKIPPED': '⏭️'
+            }.get(status, '❓')
+            percentage = (count / 106 * 100)
+            total_count += count
+            print(f"   {icon} {status}: {count} ({percentage:.1f}%)")
+        
+        # Calcular métricas
+        passed = stats.get('PASSED', 0)
+        failed = stats.get('FAILED', 0)
+        blocked = stats.get('BLOCKED', 0)
+        executed = passed + failed + blocked
+        
+        if executed > 0:
+            pass_rate = (passed / executed * 100)
+            print(f"\n📈 Métricas:")
+            print(f"   Pass Rate: {pass_rate:.1f}%")
+            print(f"   Executed: {executed}/106 ({executed/106*100:.1f}%)")
+    
+    def save_metrics(self, columns):
+        """Guarda self.metrics en el caché para que send_teams_alert no relea el Excel"""
+        # La alerta usa la primera columna que contiene 'status'; si no es Status, la recalcula
+        if self.cache is None or SuiteMetrics.find_status_column(columns) != 'Status':
+            return
+        try:
+            self.cache.put_metrics(self.excel_path, self.metrics.to_dict())
+        except OSError as e:
+            print(f"⚠️ No se pudieron guardar las métricas en caché: {e}")
+    
+    def write_perf(self):
+        """Guarda las métricas de la conversión en perf.json junto a environment.properties"""
+        return self.perf.write(os.path.join(self.output_dir, self.namespaced('perf.json')))
+    
+    def convert(self, workers=1, full=False, bundle=False, report_files=True, df=None, record_history=True):
+        """
+        Proceso principal de conversión.
+        
+        Con bundle=True los resultados se escriben como líneas compactas de
+        allure-results/results.ndjson en lugar de un archivo por caso; se
+        expanden con split_bundle() antes de ejecutar allure generate.
+        Con report_files=False no se escriben categories.json,
+        environment.properties ni history/ (el modo batch los genera aparte).
+        Con df se convierten esas filas en lugar de leer el Excel (un shard).
+        Con record_history=False se genera history/ pero la conversión no se
+        registra como una ejecución (modo watch: cada guardado no es una ejecución).
+        """
         print("\n🚀 Iniciando conversión Excel → Allure\n")
         print("📊 Status soportados: PENDING, PASSED, FAILED, BLOCKED, SKIPPED\n")
         
         # Leer Excel
-        df = self.read_excel()
+        if df is None:
+            with self.perf.phase('read'):
+                df = self.read_excel()
         
         # Validar columnas requeridas
-        required_cols = ['ID', 'Title', 'Status']
-        missing_cols = [col for col in required_cols if col not in df.columns]
+        with self.perf.phase('validate', rows=len(df)):
+            required_cols = ['ID', 'Title', 'Status']
+            missing_cols = [col for col in required_cols if col not in df.columns]
         if missing_cols:
             print(f"❌ Error: Columnas faltantes en Excel: {missing_cols}")
             return False
         
+        # Conversión incremental: solo filas nuevas o modificadas
+        with self.perf.phase('plan', rows=len(df)):
+            previous = self.load_manifest()
+            df_changed, tests, removed = self.plan_incremental(df, previous, full=full)
+        unchanged = len(df) - len(df_changed)
+        if unchanged:
+            print(f"⏭️ {unchanged} casos sin cambios desde la última conversión")
+        
+        # Un TestCase por fila: conversión, historial, categorías y métricas trabajan sobre ellos
+        with self.perf.phase('records', rows=len(df)):
+            cases = TestCase.from_dataframe(df)
+            changed_cases = [cases[position] for position in df.index.get_indexer(df_changed.index)]
+        
         # Convertir cada caso de prueba
-        converted = 0
-        status_icons = {
-            'unknown': '⏸️',    # PENDING
-            'passed': '✅',     # PASSED
-            'failed': '❌',     # FAILED
-            'broken': '🚫',     # BLOCKED
-            'skipped': '⏭️'     # SKIPPED
-        }
+        result_bundle = None
+        if bundle:
+            result_format = self.result_format
+            self.result_format = 'compact'
+            result_bundle = ResultBundle(self.output_dir, self.namespaced(ResultBundle.FILENAME))
+        try:
+            write = result_bundle.write if result_bundle else None
+            if workers > 1:
+                converted_idx = self.convert_rows_parallel(df_changed, workers, write=write, cases=changed_cases)
+            else:
+                converted_idx = self.convert_rows(df_changed, write=write, cases=changed_cases)
+        finally:
+            if result_bundle:
+                result_bundle.close()
+                self.result_format = result_format
+                self.perf.count('files_written')
+                self.perf.count('bytes_written', os.path.getsize(result_bundle.path))
+                print(f"📦 Bundle NDJSON generado: {result_bundle.path}")
+        converted = unchanged + len(converted_idx)
         
-        for idx, row in df.iterrows():
-            try:
-                result, test_uuid = self.create_allure_result(row)
-                filepath = self.save_result(result, test_uuid)
-                converted += 1
-                
-                status_emoji = status_icons.get(result['status'], '❓')
-                status_label = row.get('Status', 'Unknown')
-                print(f"{status_emoji} [{status_label}] {row.get('ID')}: {row.get('Title')}")
-            except Exception as e:
-                print(f"❌ Error procesando {row.get('ID', idx)}: {e}")
+        # Los casos con error no se registran para reintentarlos en la próxima ejecución
+        with self.perf.phase('manifest'):
+            for idx in set(df_changed.index) - set(converted_idx):
+                tests.pop(self.generate_history_id(str(df_changed.loc[idx].get('ID'))), None)
+            self.remove_results(removed)
+            self.save_manifest(tests)
+            self.remove_attachments(complete=not unchanged and len(converted_idx) == len(df_changed))
+        
+        self.results = self.written_results(cases, tests)
+        
+        # Historial: history/ se genera con las ejecuciones anteriores (allure
+        # generate agrega la actual) y después se registra esta ejecución
+        if self.history is not None:
+            with self.perf.phase('history', rows=len(tests)):
+                if report_files:
+                    history_dir = self.history.write_allure_history(self.output_dir, before=self.timestamp)
+                    print(f"✅ Historial de tendencia generado: {history_dir}")
+                if record_history:
+                    self.history.record_run(self.timestamp, [
+                        (history_id, test_uuid, status, 1000)
+                        for history_id, test_uuid, status, _, _ in self.results
+                    ])
+        
+        self.perf.count('rows_total', len(df))
+        self.perf.count('rows_converted', len(converted_idx))
+        self.perf.count('rows_unchanged', unchanged)
+        self.perf.count('rows_failed', len(df_changed) - len(converted_idx))
+        self.perf.count('results_removed', len(removed))
         
         # Generar archivos adicionales
-        self.generate_categories(df)
-        self.generate_environment()
+        self.test_types = self.find_test_types(cases)
+        if report_files:
+            with self.perf.phase('categories'):
+                self.generate_categories(test_types=self.test_types)
+            with self.perf.phase('environment'):
+                self.generate_environment()
         
         # Resumen
         print(f"\n✅ Conversión completada: {converted}/{len(df)} casos convertidos")
@@ -342,50 +958,417 @@ Status.Values=PENDING, PASSED, FAILED, BLOCKED, SKIPPED
         
         # Estadísticas
         if 'Status' in df.columns:
-            stats = df['Status'].value_counts().to_dict()
-            # Forzar 2 BLOCKED
-            stats['BLOCKED'] = 2
-            # Ajustar PENDING para que el total sea 106
-            total_actual = sum(stats.values())
-            if total_actual < 106:
-                stats['PENDING'] = stats.get('PENDING', 0) + (106 - total_actual)
-            
-            print("\n📊 Estadísticas por Status:")
-            total_count = 0
-            for status, count in stats.items():
-                icon = {
-                    'PENDING': '⏸️',
-                    'PASSED': '✅',
-                    'FAILED': '❌',
-                    'BLOCKED': '🚫',
-                    'SKIPPED': '⏭️'
-                }.get(status, '❓')
-                percentage = (count / 106 * 100)
-                total_count += count
-                print(f"   {icon} {status}: {count} ({percentage:.1f}%)")
-            
-            # Calcular métricas
-            passed = stats.get('PASSED', 0)
-            failed = stats.get('FAILED', 0)
-            blocked = stats.get('BLOCKED', 0)
-            executed = passed + failed + blocked
-            
-            if executed > 0:
-                pass_rate = (passed / executed * 100)
-                print(f"\n📈 Métricas:")
-                print(f"   Pass Rate: {pass_rate:.1f}%")
-                print(f"   Executed: {executed}/106 ({executed/106*100:.1f}%)")
+            self.metrics = SuiteMetrics.from_cases(cases)
+            self.print_statistics()
+            self.save_metrics(df.columns)
+        
+        perf_path = self.write_perf()
+        print(f"⏱️ Métricas de rendimiento: {perf_path}")
+        
+        return True
+    
+    def remove_unwritten(self, written_uuids):
+        """Elimina los *-result.json que no escribió esta ejecución (casos eliminados del Excel)"""
+        removed = 0
+        with os.scandir(self.output_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('-result.json') and entry.name[:-len('-result.json')] not in written_uuids:
+                    os.remove(entry.path)
+                    removed += 1
+        return removed
+    
+    def remove_attachments(self, complete):
+        """
+        Elimina los adjuntos que ya no usa ningún resultado.
+        
+        Solo si esta ejecución reescribió todos los resultados (complete) y
+        allure-results es solo de este workbook: en una conversión incremental
+        los casos sin cambios siguen usando adjuntos que no se armaron ahora.
+        """
+        if self.attachments is None or not complete or self.namespace:
+            return 0
+        removed = self.attachments.remove_unreferenced()
+        if removed:
+            print(f"🗑️ {removed} adjuntos sin uso eliminados")
+        self.perf.count('attachments_removed', removed)
+        return removed
+    
+    def shard_name(self, case, shard_by, shards):
+        """
+        Shard del caso: hash del ID o la categoría como nombre de directorio.
+        
+        Por hash el número lleva tantos dígitos como shards - 1: shard-0 …
+        shard-3 con 4 shards, shard-00 … shard-11 con 12.
+        """
+        if shard_by == 'category':
+            category = case.category if case.category is not None else 'General'
+            return re.sub(r'[^A-Za-z0-9_.-]+', '-', category).strip('-').lower() or 'general'
+        test_id = case.test_id if case.test_id is not None else 'None'
+        position = int(hashlib.sha1(test_id.encode('utf-8')).hexdigest()[:8], 16) % shards
+        return f"shard-{position:0{len(str(shards - 1))}d}"
+    
+    def load_shards(self):
+        """Nombres de los shards de la conversión anterior (vacío si no hubo)"""
+        try:
+            with open(os.path.join(self.output_dir, self.SHARDS_FILE), encoding='utf-8') as f:
+                return [shard['name'] for shard in json.load(f).get('shards', [])]
+        except (FileNotFoundError, ValueError):
+            return []
+    
+    def convert_sharded(self, shards=4, shard_by='hash', workers=1, full=False, bundle=False):
+        """
+        Conversión repartida en allure-results/<shard>/ para generar los reportes en paralelo.
+        
+        Los casos se reparten por hash del ID en shards directorios
+        (shard-0 … shard-3 con 4 shards) o uno por categoría (shard_by='category'). Cada shard es
+        un allure-results completo: sus *-result.json, manifest incremental,
+        categories.json, environment.properties (con la propiedad Shard) e
+        history/ (solo con los tests del shard). uuid e historyId son los
+        mismos que sin shards. El Excel se lee una sola vez; las estadísticas,
+        la ejecución registrada en el historial y el resumen son los de la
+        suite completa. allure-results/shards.json lista los shards
+        (lo usa shard_report.py) y se eliminan los shards de la conversión
+        anterior que ya no existen y los resultados sueltos en allure-results.
+        """
+        print(f"\n🧩 Conversión en shards ({shard_by}) → {self.output_dir}/<shard>\n")
+        
+        with self.perf.phase('read'):
+            df = self.read_excel()
+        missing_cols = [col for col in ['ID', 'Title', 'Status'] if col not in df.columns]
+        if missing_cols:
+            print(f"❌ Error: Columnas faltantes en Excel: {missing_cols}")
+            return False
+        
+        with self.perf.phase('shard', rows=len(df)):
+            cases = TestCase.from_dataframe(df)
+            positions = {}
+            for position, case in enumerate(cases):
+                positions.setdefault(self.shard_name(case, shard_by, shards), []).append(position)
+        
+        index = []
+        results = []
+        test_types = []
+        for name in sorted(positions):
+            shard_dir = os.path.join(self.output_dir, name)
+            shard = ExcelToAllureConverter(self.excel_path, shard_dir, result_format=self.result_format,
+                                           json_backend=self.json_backend, history=self.history,
+                                           dedup_min_bytes=self.dedup_min_bytes)
+            shard.timestamp = self.timestamp
+            # history/ excluye esta ejecución (before), así que puede generarse en cualquier
+            # orden; cada shard lleva solo el historial y la tendencia de sus propios tests
+            if self.history is not None:
+                history_ids = {history_id for history_id, *_ in self.result_rows(cases[p] for p in positions[name])}
+                self.history.write_allure_history(shard_dir, before=self.timestamp, history_ids=history_ids)
+            with self.perf.phase('shards', rows=len(positions[name])):
+                if not shard.convert(workers=workers, full=full, bundle=bundle, report_files=False,
+                                     df=df.iloc[positions[name]]):
+                    return False
+                shard.generate_categories(test_types=shard.test_types)
+                shard.generate_environment({'Shard': name, 'Shard.By': shard_by, 'Shard.Count': len(positions)})
+            for counter, value in shard.perf.counters.items():
+                self.perf.count(counter, value)
+            results.extend(shard.results)
+            for test_type in shard.test_types:
+                if test_type not in test_types:
+                    test_types.append(test_type)
+            index.append({'name': name, 'dir': name, 'tests': len(shard.results)})
+        
+        with self.perf.phase('cleanup'):
+            # Shards anteriores que ya no existen y resultados sin shard de una conversión anterior
+            for name in set(self.load_shards()) - set(positions):
+                shutil.rmtree(os.path.join(self.output_dir, name), ignore_errors=True)
+                print(f"🗑️ Shard eliminado: {name}")
+            removed = self.remove_unwritten(set())
+            manifest_path = os.path.join(self.output_dir, self.MANIFEST_FILE)
+            if os.path.exists(manifest_path):
+                os.remove(manifest_path)
+            self.manifest = None
+            if removed:
+                print(f"🗑️ {removed} resultados fuera de los shards eliminados")
+            with open(os.path.join(self.output_dir, self.SHARDS_FILE), 'w', encoding='utf-8') as f:
+                json.dump({'shard_by': shard_by, 'timestamp': self.timestamp, 'shards': index}, f, indent=2)
+        
+        self.results = results
+        self.test_types = test_types
+        print(f"\n✅ Conversión en {len(index)} shards completada: {len(results)}/{len(df)} casos")
+        for shard in index:
+            print(f"   🧩 {shard['name']}: {shard['tests']} casos")
+        
+        if 'Status' in df.columns:
+            self.metrics = SuiteMetrics.from_cases(cases)
+            self.print_statistics()
+            self.save_metrics(df.columns)
+        
+        perf_path = self.write_perf()
+        print(f"⏱️ Métricas de rendimiento: {perf_path}")
+        return True
+    
+    def convert_streaming(self, batch_size=None, queue_size=None):
+        """
+        Conversión en streaming con memoria acotada.
+        
+        Un thread lee el Excel en bloques de batch_size filas y los deja en una
+        cola de queue_size bloques; el thread principal construye y escribe
+        cada bloque a medida que llega. Categorías, estadísticas, historial y
+        resumen se acumulan por bloque y los memos de pasos y parámetros se
+        limitan a batch_size textos, así que la memoria usada no crece con la
+        cantidad de filas (solo se guardan los uuid ya escritos). Siempre
+        se reescriben todos los resultados (el manifest incremental también
+        crece con la suite) y al final se eliminan los *-result.json que esta
+        ejecución no escribió. Con IDs repetidos el historial y el resumen
+        cuentan la primera fila; el archivo escrito es el de la última.
+        """
+        from report_summary import ReportSummary
+        
+        print("\n🚀 Iniciando conversión Excel → Allure (streaming)\n")
+        print("📊 Status soportados: PENDING, PASSED, FAILED, BLOCKED, SKIPPED\n")
+        
+        batch_size = batch_size or self.STREAM_BATCH_SIZE
+        # Los memos de pasos y parámetros se vacían cada batch_size textos distintos
+        for memo in (self.steps_memo, self.parameters_memo):
+            memo.max_entries = min(memo.max_entries, batch_size)
+        chunks = queue.Queue(maxsize=queue_size or self.STREAM_QUEUE_SIZE)
+        stop = threading.Event()
+        done = object()
+        
+        def put(item):
+            """put con timeout para poder cortar si el consumidor terminó antes (False = cortar)"""
+            while not stop.is_set():
+                try:
+                    chunks.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def read():
+            try:
+                for chunk in self.iter_chunks(batch_size):
+                    if not put(chunk):
+                        return
+                put(done)
+            except BaseException as e:
+                # El error también respeta stop: con la cola llena y el consumidor afuera, join() no se cuelga
+                put(e)
+        
+        if self.history is not None:
+            history_dir = self.history.write_allure_history(self.output_dir, before=self.timestamp)
+            print(f"✅ Historial de tendencia generado: {history_dir}")
+        
+        metrics = SuiteMetrics({})
+        summary = ReportSummary()
+        test_types = []
+        # uuid escritos: al final se eliminan los *-result.json que no están acá
+        seen = set()
+        total = 0
+        converted = 0
+        reader = threading.Thread(target=read, name='excel-reader', daemon=True)
+        reader.start()
+        try:
+            with self.perf.phase('stream'):
+                while True:
+                    chunk = chunks.get()
+                    if chunk is done:
+                        break
+                    if isinstance(chunk, BaseException):
+                        raise chunk
+                    
+                    if total == 0:
+                        columns = chunk.columns
+                        missing_cols = [col for col in ['ID', 'Title', 'Status'] if col not in chunk.columns]
+                        if missing_cols:
+                            print(f"❌ Error: Columnas faltantes en Excel: {missing_cols}")
+                            return False
+                    total += len(chunk)
+                    
+                    cases = TestCase.from_dataframe(chunk)
+                    built = self.build_chunk(cases)
+                    converted += len(self.write_chunk(chunk, built))
+                    
+                    metrics.update(SuiteMetrics.from_cases(cases))
+                    for test_type in self.find_test_types(cases):
+                        if test_type not in test_types:
+                            test_types.append(test_type)
+                    written = []
+                    for row, (_, _, _, error, _) in zip(self.result_rows(cases), built):
+                        if error is None and row[1] not in seen:
+                            seen.add(row[1])
+                            written.append(row)
+                    for _, _, status, severity, suite in written:
+                        summary.add(status, severity, suite, self.namespace, self.timestamp, self.timestamp + 1000)
+                    if self.history is not None:
+                        self.history.record_run(self.timestamp, [
+                            (history_id, test_uuid, status, 1000) for history_id, test_uuid, status, _, _ in written
+                        ])
+        finally:
+            stop.set()
+            reader.join()
+        
+        with self.perf.phase('cleanup'):
+            removed = self.remove_unwritten(seen)
+            # El manifest ya no describe allure-results: la próxima conversión incremental reescribe todo
+            manifest_path = os.path.join(self.output_dir, self.namespaced(self.MANIFEST_FILE))
+            if os.path.exists(manifest_path):
+                os.remove(manifest_path)
+            self.manifest = None
+            self.remove_attachments(complete=converted == total)
+        if removed:
+            print(f"🗑️ {removed} resultados de casos eliminados del Excel")
+        
+        self.perf.count('rows_total', total)
+        self.perf.count('rows_converted', converted)
+        self.perf.count('rows_failed', total - converted)
+        self.perf.count('results_removed', removed)
+        self.metrics = metrics
+        self.test_types = test_types
+        self.stream_summary = summary
+        
+        with self.perf.phase('categories'):
+            self.generate_categories(test_types=test_types)
+        with self.perf.phase('environment'):
+            self.generate_environment()
+        
+        print(f"\n✅ Conversión completada: {converted}/{total} casos convertidos")
+        print(f"📁 Resultados guardados en: {self.output_dir}")
+        if total:
+            self.print_statistics()
+            self.save_metrics(columns)
+        
+        perf_path = self.write_perf()
+        print(f"⏱️ Métricas de rendimiento: {perf_path}")
         
         return True
 
+# Conversor del proceso del pool (lo asigna _init_builder una vez por proceso)
+_builder = None
+
+def _init_builder(converter):
+    """Initializer del pool de procesos: guarda el conversor para todos los bloques"""
+    global _builder
+    _builder = converter
+
+def _build_chunk(cases):
+    """
+    Construye y serializa un bloque de TestCase (se ejecuta en el pool de procesos).
+    
+    Devuelve también los adjuntos del bloque (pendientes, referenciados) para
+    que el proceso principal los escriba antes que los resultados.
+    """
+    converter = _builder
+    built = converter.build_chunk(cases)
+    return built, converter.attachments.take() if converter.attachments is not None else None
+
 def main():
     """Función principal"""
-    import sys
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Convierte casos de prueba de Excel a Allure Report')
+    parser.add_argument('excel', nargs='?',
+                        help='Archivo de casos: .xlsx, .csv, .parquet o .ndjson según la extensión '
+                             '(por defecto el primer .xlsx en test_data/); con --batch, directorio o glob')
+    parser.add_argument('--format', choices=RESULT_FORMATS, default='pretty',
+                        help="Formato de los *-result.json: 'pretty' (indentado) o 'compact'")
+    parser.add_argument('--json-backend', choices=JSON_BACKENDS, default=JSON_BACKENDS[0],
+                        help=f"Serializador JSON (default: {JSON_BACKENDS[0]}, todos generan la misma salida)")
+    parser.add_argument('--bundle', action='store_true',
+                        help='Escribe todos los resultados en allure-results/results.ndjson')
+    parser.add_argument('--split-bundle', metavar='NDJSON',
+                        help='Expande un bundle NDJSON en archivos *-result.json y termina')
+    parser.add_argument('--full', action='store_true',
+                        help='Regenera todos los resultados ignorando el manifest incremental')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='No usar el caché de workbooks parseados (.cache/workbooks)')
+    parser.add_argument('--no-history', action='store_true',
+                        help='No registrar la ejecución en el historial (.cache/history) ni generar history/')
+    parser.add_argument('--summary', nargs='?', const='allure-summary', metavar='DIR',
+                        help='Genera un resumen HTML/JSON sin Allure CLI (default: allure-summary/)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Ejecuta la conversión con cProfile y tracemalloc (resumen en perf.json)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Procesos para construir los resultados en paralelo '
+                             '(default: 1; con --batch, uno por CPU)')
+    parser.add_argument('--batch', action='store_true',
+                        help='Convierte todos los workbooks de test_data/ en paralelo (uno por squad)')
+    parser.add_argument('--max-memory-mb', type=int, default=None,
+                        help='Límite de memoria estimada del batch (default: BATCH_MAX_MEMORY_MB o 75%% de la RAM)')
+    parser.add_argument('--watch', action='store_true',
+                        help='Queda observando el directorio del archivo de casos (.xlsx, .csv, .parquet, .ndjson) '
+                             'y reconvierte cada vez que se guarda, con los mismos --workers '
+                             '(sin registrar ejecuciones en el historial; detecta los cambios por polling, '
+                             'o por eventos del sistema de archivos si está instalado watchdog)')
+    parser.add_argument('--debounce', type=float, default=1.0,
+                        help='Segundos sin nuevos guardados antes de reconvertir en --watch (default: 1)')
+    parser.add_argument('--stream', action='store_true',
+                        help='Convierte en bloques con memoria acotada (suites muy grandes); reescribe todos los resultados')
+    parser.add_argument('--stream-batch-size', type=int, default=None,
+                        help=f"Filas por bloque en --stream (default: {ExcelToAllureConverter.STREAM_BATCH_SIZE})")
+    parser.add_argument('--dedup', nargs='?', type=int, const=AttachmentStore.DEFAULT_MIN_BYTES, default=None,
+                        metavar='BYTES',
+                        help='Pasos y datos de prueba de BYTES caracteres o más como adjuntos compartidos, '
+                             f'escritos una vez (default: {AttachmentStore.DEFAULT_MIN_BYTES})')
+    parser.add_argument('--shards', type=int, default=None,
+                        help='Reparte los resultados en N directorios allure-results/<shard>/ por hash del ID '
+                             '(reportes en paralelo con shard_report.py)')
+    parser.add_argument('--shard-by', choices=SHARD_MODES, default=None,
+                        help="Criterio de los shards: 'hash' del ID (default, --shards N) o 'category' (uno por categoría)")
+    args = parser.parse_args()
+    
+    if args.watch and args.profile:
+        parser.error('--profile no está disponible con --watch')
+    if args.stream:
+        for flag, used in (('--batch', args.batch), ('--watch', args.watch), ('--bundle', args.bundle),
+                           ('--workers', (args.workers or 1) > 1)):
+            if used:
+                parser.error(f"--stream no está disponible con {flag}")
+    sharded = args.shards is not None or args.shard_by is not None
+    if sharded:
+        if args.shards is not None and args.shards < 1:
+            parser.error('--shards debe ser 1 o más')
+        for flag, used in (('--batch', args.batch), ('--watch', args.watch), ('--stream', args.stream)):
+            if used:
+                parser.error(f"--shards no está disponible con {flag}")
+    
+    if args.split_bundle:
+        split_bundle(args.split_bundle, result_format=args.format, backend=args.json_backend)
+        return True
+    
+    if args.batch:
+        if args.profile:
+            parser.error('--profile no está disponible con --batch')
+        from batch_converter import BatchConverter, find_workbooks
+        
+        excel_files = find_workbooks(args.excel or 'test_data/*.xlsx')
+        if not excel_files:
+            print(f"❌ Error: No se encontraron archivos Excel en {args.excel or 'test_data/'}")
+            return False
+        
+        def run_batch(excel_files, full):
+            batch = BatchConverter(excel_files, 'allure-results', workers=args.workers,
+                                   max_memory_mb=args.max_memory_mb, cache=not args.no_cache,
+                                   history=not args.no_history,
+                                   result_format=args.format, json_backend=args.json_backend,
+                                   dedup_min_bytes=args.dedup)
+            success = batch.convert(full=full, bundle=args.bundle, record_history=not args.watch)
+            if success and args.summary:
+                from report_summary import ReportSummary
+                ReportSummary.from_results_dir(batch.output_dir).write(args.summary)
+            return success
+        
+        success = run_batch(excel_files, args.full)
+        if args.watch:
+            from workbook_watcher import WorkbookWatcher
+            
+            # Los workbooks sin cambios salen del caché y del manifest: solo se
+            # parsean y reescriben los que se guardaron
+            watch_dir = os.path.dirname(excel_files[0]) or '.'
+            WorkbookWatcher(watch_dir, debounce=args.debounce).run(
+                lambda paths: run_batch(find_workbooks(args.excel or 'test_data/*.xlsx'), False))
+        return success
     
     # Configuración - FLEXIBLE con nombre de archivo
     # Puedes especificar el nombre como argumento o usar el default
-    if len(sys.argv) > 1:
-        EXCEL_FILE = sys.argv[1]
+    if args.excel:
+        EXCEL_FILE = args.excel
     else:
         # Buscar cualquier archivo .xlsx en test_data/
         import glob
@@ -400,7 +1383,7 @@ def main():
             print(f"⚠️  Se encontraron múltiples archivos Excel:")
             for i, file in enumerate(excel_files, 1):
                 print(f"   {i}. {file}")
-            print(f"\n✅ Usando: {excel_files[0]}")
+            print(f"\n✅ Usando: {excel_files[0]} (usa --batch para convertir todos)")
         
         EXCEL_FILE = excel_files[0]
     
@@ -413,11 +1396,67 @@ def main():
         print(f"❌ Error: No se encontró el archivo {EXCEL_FILE}")
         return False
     
+    # El lector se elige por la extensión (Excel, CSV, Parquet o NDJSON)
+    reader = reader_for(EXCEL_FILE)
+    if reader is None:
+        print(f"❌ Error: Formato no soportado: {EXCEL_FILE} (usa .xlsx, .csv, .parquet o .ndjson)")
+        return False
+    
     # Convertir
-    converter = ExcelToAllureConverter(EXCEL_FILE, OUTPUT_DIR)
-    success = converter.convert()
+    cache = None if args.no_cache else WorkbookCache()
+    history = None if args.no_history else HistoryStore()
+    converter = ExcelToAllureConverter(EXCEL_FILE, OUTPUT_DIR, cache=cache,
+                                       result_format=args.format, json_backend=args.json_backend,
+                                       history=history, reader=reader, dedup_min_bytes=args.dedup)
+    
+    def run():
+        if args.stream:
+            return converter.convert_streaming(batch_size=args.stream_batch_size)
+        if sharded:
+            return converter.convert_sharded(shards=args.shards or 4, shard_by=args.shard_by or 'hash',
+                                             workers=args.workers or 1, full=args.full, bundle=args.bundle)
+        return converter.convert(workers=args.workers or 1, full=args.full, bundle=args.bundle,
+                                 record_history=not args.watch)
+    
+    if args.profile:
+        stats_path = os.path.join(OUTPUT_DIR, 'perf.pstats')
+        success, profile = run_profiled(run, stats_path)
+        converter.perf.extra['profile'] = profile
+        converter.write_perf()
+        print(f"🔬 Profile guardado en: {stats_path}")
+    else:
+        success = run()
     
-    if success:
+    if success and args.summary:
+        converter.summary().write(args.summary)
+    
+    if args.watch:
+        from workbook_watcher import WorkbookWatcher
+        
+        excel_path = os.path.abspath(EXCEL_FILE)
+        # Cada guardado es un contenido nuevo: el estado que importa (manifest) ya está en memoria
+        converter.cache = None
+        
+        def on_change(paths):
+            if excel_path not in map(os.path.abspath, paths):
+                return
+            if not os.path.exists(excel_path):
+                print(f"⚠️ {EXCEL_FILE} fue eliminado, se mantienen los resultados actuales")
+                return
+            converter.new_run()
+            if converter.convert(workers=args.workers or 1, bundle=args.bundle, record_history=False) and args.summary:
+                converter.summary().write(args.summary)
+        
+        WorkbookWatcher(os.path.dirname(EXCEL_FILE) or '.', debounce=args.debounce).run(on_change)
+    elif success and sharded:
+        print("\n✅ ¡Listo! Ahora puedes generar los reportes Allure de cada shard.")
+        print("\n📖 Comandos siguientes:")
+        print("   1. Instalar Allure: npm install -g allure-commandline")
+        print(f"   2. Generar reportes: python scripts/shard_report.py {OUTPUT_DIR} -o allure-report")
+        print(f"      (un reporte por shard de {OUTPUT_DIR}/<shard>/, listados en "
+              f"{OUTPUT_DIR}/{ExcelToAllureConverter.SHARDS_FILE})")
+        print("   3. Ver reportes: allure-report/index.html (links al reporte de cada shard)")
+    elif success:
         print("\n✅ ¡Listo! Ahora puedes generar el reporte Allure.")
         print("\n📖 Comandos siguientes:")
         print("   1. Instalar Allure: npm install -g allure-commandline")
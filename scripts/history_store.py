@@ -0,0 +1,243 @@
+import json
+import os
+import sqlite3
+from pathlib import Path
+
+ALLURE_STATUSES = ['failed', 'broken', 'skipped', 'passed', 'unknown']
+
+
+class HistoryStore:
+    """
+    Historial de ejecuciones en SQLite para los gráficos de tendencia de Allure.
+
+    Cada conversión agrega una ejecución (runs) con los totales por estado y
+    el estado de cada test (test_results, ordenado por timestamp de la
+    ejecución e indexado por historyId). Leer las últimas ejecuciones es un
+    rango contiguo de la clave primaria, sin importar cuántas haya. A partir de esas tablas se generan
+    history/history-trend.json y history/history.json dentro de
+    allure-results, sin necesidad de copiar el history/ del reporte anterior.
+    """
+
+    # Ejecuciones que Allure muestra en la tendencia y en el historial de cada test
+    HISTORY_LIMIT = 20
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS runs (
+            run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            run_ts INTEGER NOT NULL UNIQUE,
+            report_url TEXT,
+            total INTEGER NOT NULL DEFAULT 0,
+            failed INTEGER NOT NULL DEFAULT 0,
+            broken INTEGER NOT NULL DEFAULT 0,
+            skipped INTEGER NOT NULL DEFAULT 0,
+            passed INTEGER NOT NULL DEFAULT 0,
+            unknown INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS test_results (
+            history_id TEXT NOT NULL,
+            run_ts INTEGER NOT NULL,
+            uid TEXT NOT NULL,
+            status TEXT NOT NULL,
+            duration INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (run_ts, history_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_test_results_history ON test_results (history_id, run_ts);
+        CREATE TABLE IF NOT EXISTS test_stats (
+            history_id TEXT PRIMARY KEY,
+            failed INTEGER NOT NULL DEFAULT 0,
+            broken INTEGER NOT NULL DEFAULT 0,
+            skipped INTEGER NOT NULL DEFAULT 0,
+            passed INTEGER NOT NULL DEFAULT 0,
+            unknown INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID;
+    """
+
+    def __init__(self, db_path=None, keep_runs=None, report_url=None):
+        self.db_path = Path(db_path or os.getenv('HISTORY_DB_PATH', '.cache/history/history.db'))
+        # Ejecuciones con el detalle por test; los totales por ejecución se guardan siempre
+        self.keep_runs = keep_runs or int(os.getenv('HISTORY_KEEP_RUNS', '100'))
+        self.report_url = report_url if report_url is not None else os.getenv('ALLURE_REPORT_URL', '')
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # timeout alto: en modo batch varios procesos escriben la misma ejecución
+        self.connection = sqlite3.connect(self.db_path, timeout=60)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.executescript(self.SCHEMA)
+
+    def __getstate__(self):
+        # El conversor se envía al pool de procesos; cada proceso abre su conexión
+        state = self.__dict__.copy()
+        del state['connection']
+        return state
+
+    def __setstate__(self, state):
+        self.__init__(state['db_path'], state['keep_runs'], state['report_url'])
+
+    def close(self):
+        self.connection.close()
+
+    def record_run(self, run_ts, results):
+        """
+        Agrega los resultados de una ejecución.
+
+        results son tuplas (history_id, uid, status, duration_ms). Si la
+        ejecución ya existe (modo batch: un workbook por proceso con el mismo
+        run_ts) los totales se suman.
+        """
+        results = list(results)
+        totals = dict.fromkeys(ALLURE_STATUSES, 0)
+        for _, _, status, _ in results:
+            totals[status if status in totals else 'unknown'] += 1
+
+        with self.connection:
+            self.connection.execute(
+                f"""INSERT INTO runs (run_ts, report_url, total, {', '.join(ALLURE_STATUSES)})
+                    VALUES (?, ?, ?, {', '.join('?' * len(ALLURE_STATUSES))})
+                    ON CONFLICT (run_ts) DO UPDATE SET total = total + excluded.total, """
+                + ', '.join(f"{status} = {status} + excluded.{status}" for status in ALLURE_STATUSES),
+                [run_ts, self.report_url, len(results)] + [totals[status] for status in ALLURE_STATUSES],
+            )
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO test_results (history_id, run_ts, uid, status, duration) VALUES (?, ?, ?, ?, ?)',
+                ((history_id, run_ts, uid, status, duration) for history_id, uid, status, duration in results),
+            )
+            for status in ALLURE_STATUSES:
+                self.connection.executemany(
+                    f"""INSERT INTO test_stats (history_id, {status}) VALUES (?, 1)
+                        ON CONFLICT (history_id) DO UPDATE SET {status} = {status} + 1""",
+                    ((history_id,) for history_id, _, result_status, _ in results if result_status == status),
+                )
+            self.prune()
+
+    def prune(self):
+        """Borra el detalle por test de las ejecuciones más antiguas que keep_runs"""
+        row = self.connection.execute(
+            'SELECT run_ts FROM runs ORDER BY run_ts DESC LIMIT 1 OFFSET ?', (self.keep_runs - 1,)
+        ).fetchone()
+        if row:
+            self.connection.execute('DELETE FROM test_results WHERE run_ts < ?', (row[0],))
+
+    def recent_runs(self, before=None, limit=None):
+        """Últimas ejecuciones (más reciente primero), opcionalmente anteriores a before"""
+        query = f"SELECT run_id, run_ts, report_url, total, {', '.join(ALLURE_STATUSES)} FROM runs"
+        params = []
+        if before is not None:
+            query += ' WHERE run_ts < ?'
+            params.append(before)
+        query += ' ORDER BY run_ts DESC LIMIT ?'
+        params.append(limit or self.HISTORY_LIMIT)
+        return self.connection.execute(query, params).fetchall()
+
+    def subset_totals(self, runs, history_ids):
+        """
+        Totales por estado de cada ejecución contando solo los tests de history_ids.
+
+        Devuelve run_ts → [total, *conteos por estado]; las ejecuciones sin
+        detalle por test (podadas por keep_runs) o sin ninguno de esos tests
+        no aparecen.
+        """
+        if not runs:
+            return {}
+        positions = {status: position for position, status in enumerate(ALLURE_STATUSES, 1)}
+        totals = {}
+        rows = self.connection.execute(
+            'SELECT history_id, run_ts, status FROM test_results WHERE run_ts BETWEEN ? AND ?',
+            (runs[-1][1], runs[0][1]),
+        )
+        for history_id, run_ts, status in rows:
+            if history_id not in history_ids:
+                continue
+            counts = totals.get(run_ts)
+            if counts is None:
+                counts = totals[run_ts] = [0] * (len(ALLURE_STATUSES) + 1)
+            counts[0] += 1
+            counts[positions.get(status, positions['unknown'])] += 1
+        return totals
+
+    def history_trend(self, before=None, history_ids=None):
+        """
+        Contenido de history-trend.json (más reciente primero).
+
+        Con history_ids los totales son solo los de esos tests (el reporte de un shard).
+        """
+        runs = self.recent_runs(before)
+        if history_ids is not None:
+            subset = self.subset_totals(runs, history_ids)
+            runs = [(run_id, run_ts, report_url, *subset[run_ts])
+                    for run_id, run_ts, report_url, *_ in runs if run_ts in subset]
+        trend = []
+        for run_id, run_ts, report_url, total, *counts in runs:
+            data = dict(zip(ALLURE_STATUSES, counts))
+            data['total'] = total
+            trend.append({
+                'buildOrder': run_id,
+                'reportUrl': report_url or '',
+                'reportName': 'Allure Report',
+                'data': data,
+            })
+        return trend
+
+    def history(self, before=None, history_ids=None):
+        """
+        Contenido de history.json: estadística acumulada e items de las últimas ejecuciones.
+
+        Con history_ids solo se incluyen esos tests.
+        """
+        runs = self.recent_runs(before)
+        if not runs:
+            return {}
+        report_urls = {run_ts: report_url or '' for _, run_ts, report_url, *_ in runs}
+        oldest = runs[-1][1]
+        newest = runs[0][1]
+
+        history = {}
+        rows = self.connection.execute(
+            """SELECT history_id, run_ts, uid, status, duration FROM test_results
+               WHERE run_ts BETWEEN ? AND ? ORDER BY run_ts DESC""",
+            (oldest, newest),
+        )
+        for history_id, run_ts, uid, status, duration in rows:
+            if history_ids is not None and history_id not in history_ids:
+                continue
+            entry = history.get(history_id)
+            if entry is None:
+                entry = history[history_id] = {'statistic': None, 'items': []}
+            report_url = report_urls[run_ts]
+            entry['items'].append({
+                'uid': uid,
+                'reportUrl': f"{report_url}#testresult/{uid}" if report_url else '',
+                'status': status,
+                'time': {'start': run_ts, 'stop': run_ts + duration, 'duration': duration},
+            })
+
+        stats = self.connection.execute(
+            f"SELECT history_id, {', '.join(ALLURE_STATUSES)} FROM test_stats"
+        )
+        for history_id, *counts in stats:
+            entry = history.get(history_id)
+            if entry is not None:
+                statistic = dict(zip(ALLURE_STATUSES, counts))
+                statistic['total'] = sum(counts)
+                entry['statistic'] = statistic
+        return history
+
+    def write_allure_history(self, output_dir, before=None, history_ids=None):
+        """
+        Genera history/history-trend.json y history/history.json en allure-results.
+
+        Con before se excluye la ejecución actual: allure generate la agrega
+        por su cuenta a partir de los *-result.json. Con history_ids (un set)
+        el historial y la tendencia son solo los de esos tests.
+        """
+        history_dir = os.path.join(output_dir, 'history')
+        os.makedirs(history_dir, exist_ok=True)
+        files = {
+            'history-trend.json': self.history_trend(before, history_ids),
+            'history.json': self.history(before, history_ids),
+        }
+        for filename, content in files.items():
+            with open(os.path.join(history_dir, filename), 'w', encoding='utf-8') as f:
+                # json.dumps usa el encoder en C; json.dump escribe por fragmentos en Python
+                f.write(json.dumps(content, ensure_ascii=False, separators=(',', ':')))
+        return history_dir
@@ -0,0 +1,276 @@
+"""
+Servidor HTTP local con las métricas agregadas de la suite en JSON.
+
+Los wallboards consultan /metrics en lugar de descargar el reporte de
+Allure completo. La respuesta (JSON y JSON gzip) se arma una vez y queda en
+memoria hasta que cambian el workbook o allure-results; los clientes que
+repiten la consulta con If-None-Match reciben un 304 sin cuerpo.
+
+Uso:
+    python scripts/metrics_server.py
+    python scripts/metrics_server.py --excel test_data/test_cases.xlsx --results allure-results --port 8765
+    curl -i --compressed http://127.0.0.1:8765/metrics
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def etag_matches(if_none_match, etag):
+    """True si el header If-None-Match incluye el ETag (comparación débil, RFC 9110)"""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in tags or any(tag.removeprefix('W/') == etag.removeprefix('W/') for tag in tags)
+
+
+def accepts_gzip(accept_encoding):
+    """True si el header Accept-Encoding acepta gzip (gzip o *, con q > 0)"""
+    for coding in (accept_encoding or '').split(','):
+        name, _, params = coding.partition(';')
+        if name.strip().lower() not in ('gzip', '*'):
+            continue
+        params = params.strip().replace(' ', '')
+        if params.startswith('q='):
+            try:
+                return float(params[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+class MetricsCache:
+    """
+    Respuesta de /metrics en memoria, invalidada cuando cambian las fuentes.
+
+    La firma de las fuentes es (mtime, tamaño) del workbook, del directorio
+    allure-results y de los archivos que toda conversión reescribe al
+    terminar (environment.properties y categories.json). Se revisa a lo sumo
+    una vez cada check_interval segundos, así que los clientes que consultan
+    seguido no agregan llamadas a stat(). El ETag es el hash de las métricas:
+    si se recalculan y no cambiaron, los clientes siguen recibiendo 304.
+    """
+
+    # Archivos que el conversor escribe al final de cada conversión
+    RESULT_MARKERS = ('environment.properties', 'categories.json')
+
+    def __init__(self, excel_path=None, results_dir=None, check_interval=1.0):
+        self.excel_path = excel_path
+        self.results_dir = results_dir
+        self.check_interval = check_interval
+        # Cantidad de veces que se recalcularon las métricas
+        self.builds = 0
+        self._lock = threading.Lock()
+        self._entry = None
+        self._signature = None
+        self._checked_at = 0.0
+
+    def signature(self):
+        """(mtime_ns, tamaño) de cada fuente (None si no existe)"""
+        paths = [self.excel_path] if self.excel_path else []
+        if self.results_dir:
+            paths.append(self.results_dir)
+            paths.extend(os.path.join(self.results_dir, name) for name in self.RESULT_MARKERS)
+        signature = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    def build(self):
+        """Métricas por estado, prioridad y categoría del workbook y de allure-results"""
+        payload = {'workbook': None, 'results': None}
+        if self.excel_path and os.path.exists(self.excel_path):
+            # Métricas precalculadas por el conversor o lectura en streaming (sin pandas)
+            from send_teams_alert import extract_suite_metrics
+            metrics = extract_suite_metrics(self.excel_path).to_dict()
+            payload['workbook'] = {
+                'path': str(self.excel_path),
+                'total': metrics['total'],
+                'summary': metrics['summary'],
+                'by_category': metrics['by_category'],
+                'priorities': metrics['priorities'],
+            }
+        if self.results_dir and os.path.isdir(self.results_dir):
+            from report_summary import ReportSummary
+            summary = ReportSummary.from_results_dir(self.results_dir)
+            widgets = summary.widgets()
+            payload['results'] = {
+                'path': str(self.results_dir),
+                'pass_rate': summary.pass_rate(),
+                'statistic': widgets['summary.json']['statistic'],
+                'severity': widgets['severity.json'],
+                'suites': widgets['suites.json']['items'],
+            }
+        return payload
+
+    def get(self):
+        """(json, json gzip, etag) vigentes; se recalculan si cambiaron las fuentes"""
+        entry = self._entry
+        if entry is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return entry
+
+        with self._lock:
+            # Otro thread pudo haber revisado mientras se esperaba el lock
+            now = time.monotonic()
+            if self._entry is not None and now - self._checked_at < self.check_interval:
+                return self._entry
+            self._checked_at = now
+
+            signature = self.signature()
+            if self._entry is not None and signature == self._signature:
+                return self._entry
+            try:
+                payload = self.build()
+            except Exception as e:
+                # Workbook a medio guardar: se siguen sirviendo las métricas anteriores
+                if self._entry is None:
+                    raise
+                print(f"⚠️ No se pudieron recalcular las métricas, se sirven las anteriores: {e}")
+                return self._entry
+            self._signature = signature
+            self.builds += 1
+
+            content = json.dumps(payload, ensure_ascii=False, sort_keys=True).encode('utf-8')
+            etag = f'W/"{hashlib.sha1(content).hexdigest()[:20]}"'
+            if self._entry is not None and self._entry[2] == etag:
+                return self._entry
+            payload['updated_at'] = datetime.now().isoformat(timespec='seconds')
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self._entry = (body, gzip.compress(body, mtime=0), etag)
+            print(f"🔄 Métricas actualizadas ({len(body)} bytes, {len(self._entry[1])} con gzip)")
+            return self._entry
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """GET/HEAD /metrics (JSON), /healthz y preflight CORS para los wallboards"""
+
+    server_version = 'QAMetrics/1.0'
+    # HTTP/1.1: los clientes que consultan seguido reutilizan la conexión
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.respond(send_body=True)
+
+    def do_HEAD(self):
+        self.respond(send_body=False)
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self.send_cors_headers()
+        self.send_header('Access-Control-Allow-Methods', 'GET, HEAD, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'If-None-Match')
+        self.send_header('Access-Control-Max-Age', '86400')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def send_cors_headers(self):
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Expose-Headers', 'ETag')
+
+    def send_text(self, code, text, send_body):
+        data = text.encode('utf-8')
+        self.send_response(code)
+        self.send_cors_headers()
+        self.send_header('Content-Type', 'text/plain; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(data)
+
+    def respond(self, send_body):
+        path = self.path.split('?', 1)[0]
+        if path == '/healthz':
+            return self.send_text(200, 'ok\n', send_body)
+        if path not in ('/metrics', '/metrics.json'):
+            return self.send_text(404, 'not found\n', send_body)
+
+        try:
+            body, gzip_body, etag = self.server.metrics.get()
+        except Exception as e:
+            return self.send_text(503, f"métricas no disponibles: {e}\n", send_body)
+
+        not_modified = etag_matches(self.headers.get('If-None-Match'), etag)
+        self.send_response(304 if not_modified else 200)
+        self.send_cors_headers()
+        self.send_header('ETag', etag)
+        # no-cache: el navegador guarda la respuesta pero la revalida con If-None-Match
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Vary', 'Accept-Encoding')
+        if not_modified:
+            self.end_headers()
+            return
+
+        use_gzip = accepts_gzip(self.headers.get('Accept-Encoding'))
+        content = gzip_body if use_gzip else body
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        if use_gzip:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        # Cientos de wallboards consultando: el log por request solo con --verbose
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class MetricsServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer con un MetricsCache compartido entre requests"""
+
+    daemon_threads = True
+
+    def __init__(self, metrics, host='127.0.0.1', port=8765, verbose=False):
+        self.metrics = metrics
+        self.verbose = verbose
+        super().__init__((host, port), MetricsHandler)
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def start(self):
+        """Atiende requests en un thread de fondo (p. ej. para probarlo en localhost)"""
+        thread = threading.Thread(target=self.serve_forever, name='metrics-server', daemon=True)
+        thread.start()
+        return thread
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Servidor local de métricas de la suite (JSON con ETag y gzip)')
+    parser.add_argument('--excel', default='test_data/test_cases_Hoopit.xlsx',
+                        help='Archivo de casos (.xlsx, .csv, .parquet o .ndjson)')
+    parser.add_argument('--results', default='allure-results', help='Directorio allure-results')
+    parser.add_argument('--host', default='127.0.0.1', help='Interfaz (default: 127.0.0.1, solo local)')
+    parser.add_argument('--port', type=int, default=8765, help='Puerto (0 = uno libre; default: 8765)')
+    parser.add_argument('--check-interval', type=float, default=1.0,
+                        help='Segundos entre revisiones de cambios en las fuentes (default: 1)')
+    parser.add_argument('--verbose', action='store_true', help='Imprime cada request')
+    args = parser.parse_args()
+
+    server = MetricsServer(MetricsCache(args.excel, args.results, args.check_interval),
+                           args.host, args.port, args.verbose)
+    print(f"📡 Métricas en {server.url} (Ctrl+C para salir)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Servidor detenido")
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,194 @@
+import bisect
+import contextlib
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb():
+    """RSS máximo del proceso hasta el momento (MB)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta KB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+class LatencyHistogram:
+    """Histograma de latencias con buckets fijos en milisegundos"""
+
+    BUCKETS_MS = [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 1000]
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, seconds):
+        ms = seconds * 1000
+        self.counts[bisect.bisect_left(self.BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, p):
+        """Límite superior del bucket que contiene el percentil p (0-100)"""
+        if not self.count:
+            return None
+        target = self.count * p / 100
+        seen = 0
+        for bound, count in zip(self.BUCKETS_MS + [self.max_ms], self.counts):
+            seen += count
+            if seen >= target:
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def to_dict(self):
+        labels = [f"<={bound}ms" for bound in self.BUCKETS_MS] + [f">{self.BUCKETS_MS[-1]}ms"]
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total_ms / self.count, 4) if self.count else None,
+            'p50_ms': self.percentile(50),
+            'p95_ms': self.percentile(95),
+            'p99_ms': self.percentile(99),
+            'max_ms': round(self.max_ms, 4),
+            'buckets': {label: count for label, count in zip(labels, self.counts) if count},
+        }
+
+
+class PerfRecorder:
+    """
+    Instrumentación de la conversión.
+
+    Acumula wall/CPU time por fase, un histograma de latencia por fila y
+    contadores (archivos y bytes escritos). to_dict() devuelve todo en un
+    formato estable para perf.json.
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self.counters = {}
+        self.row_latency = LatencyHistogram()
+        self.extra = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # El conversor se envía al pool de procesos junto con su PerfRecorder
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def phase(self, name, rows=None):
+        """Mide una fase; si se repite, los tiempos se acumulan"""
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            phase = self.phases.setdefault(name, {'wall_s': 0.0, 'cpu_s': 0.0, 'calls': 0})
+            phase['wall_s'] += wall
+            phase['cpu_s'] += cpu
+            phase['calls'] += 1
+            if rows is not None:
+                phase['rows'] = phase.get('rows', 0) + rows
+            phase['peak_rss_mb'] = peak_rss_mb()
+
+    def count(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe_row(self, seconds):
+        with self._lock:
+            self.row_latency.observe(seconds)
+
+    def to_dict(self):
+        phases = {}
+        for name, phase in self.phases.items():
+            phases[name] = dict(phase, wall_s=round(phase['wall_s'], 4), cpu_s=round(phase['cpu_s'], 4))
+            if phase.get('rows') and phase['wall_s'] > 0:
+                phases[name]['rows_per_s'] = round(phase['rows'] / phase['wall_s'], 1)
+
+        return {
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'pid': os.getpid(),
+            'peak_rss_mb': peak_rss_mb(),
+            'phases': phases,
+            'counters': dict(self.counters),
+            'row_latency': self.row_latency.to_dict(),
+            **self.extra,
+        }
+
+    def write(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+        return path
+
+
+def run_profiled(func, stats_path=None, top=15):
+    """
+    Ejecuta func() bajo cProfile y tracemalloc.
+
+    Devuelve (resultado, resumen) donde el resumen incluye las funciones con
+    mayor tiempo acumulado y las líneas con más memoria asignada. Si se pasa
+    stats_path se guardan también las estadísticas completas de cProfile.
+    """
+    profiler = cProfile.Profile()
+    tracemalloc.start()
+    profiler.enable()
+    try:
+        result = func()
+    finally:
+        profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    if stats_path:
+        profiler.dump_stats(stats_path)
+
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    stats.sort_stats('cumulative')
+    functions = []
+    for (filename, line, name), (_, calls, total, cumulative, _) in sorted(
+            stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:top]:
+        functions.append({
+            'function': f"{os.path.basename(filename)}:{line}({name})",
+            'calls': calls,
+            'total_s': round(total, 4),
+            'cumulative_s': round(cumulative, 4),
+        })
+
+    allocations = [
+        {'location': str(stat.traceback[0]), 'size_kb': round(stat.size / 1024, 1), 'count': stat.count}
+        for stat in snapshot.statistics('lineno')[:top]
+    ]
+
+    summary = {
+        'cprofile_top': functions,
+        'tracemalloc_peak_mb': round(peak_bytes / (1024 * 1024), 2),
+        'tracemalloc_top': allocations,
+    }
+    if stats_path:
+        summary['cprofile_stats'] = stats_path
+    return result, summary
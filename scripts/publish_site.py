@@ -0,0 +1,268 @@
+"""
+Staging del sitio publicado: conversión atómica y copia solo de lo que cambió.
+
+- results: convierte el workbook en un directorio temporal junto a
+  allure-results (partiendo de una copia del anterior, así la conversión
+  sigue siendo incremental), elimina los *-result.json que ya no están en el
+  manifest y reemplaza allure-results por el directorio nuevo. Si la
+  conversión falla, allure-results queda como estaba.
+- sync: arma el sitio a partir de pares DESTINO=ORIGEN, calcula el SHA-1 de
+  cada archivo y copia al árbol de publicación solo los que cambiaron
+  respecto del manifest de la publicación anterior; los que ya no están en
+  el sitio se eliminan.
+
+Uso:
+    python scripts/publish_site.py results
+    python scripts/publish_site.py results test_data/test_cases_Hoopit.xlsx
+    python scripts/publish_site.py sync --publish publish index.html=login.html report=allure-report
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+
+def file_digest(path, chunk_size=1024 * 1024):
+    """SHA-1 del contenido de un archivo"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def swap_directory(staged, target):
+    """
+    Reemplaza target por staged con dos rename() en el mismo filesystem.
+
+    Entre los dos rename target no existe durante microsegundos (no hay un
+    intercambio atómico de directorios portable); nunca queda a medio
+    escribir. Si el segundo rename falla se restaura el anterior.
+    """
+    backup = None
+    if os.path.exists(target):
+        backup = tempfile.mkdtemp(prefix=f".{os.path.basename(target)}-old-", dir=os.path.dirname(target))
+        os.rmdir(backup)
+        os.rename(target, backup)
+    try:
+        os.rename(staged, target)
+    except OSError:
+        if backup:
+            os.rename(backup, target)
+        raise
+    if backup:
+        shutil.rmtree(backup, ignore_errors=True)
+
+
+def stage_results(excel_path, output_dir='allure-results', full=False, **options):
+    """
+    Convierte el workbook en un directorio temporal y lo reemplaza por output_dir.
+
+    options se pasan a ExcelToAllureConverter (cache, history, reader,
+    result_format, dedup_min_bytes...). Devuelve el conversor, o None si la
+    conversión falló (output_dir no se modifica).
+    """
+    from excel_to_allure_updated import ExcelToAllureConverter
+
+    output_dir = os.path.abspath(output_dir)
+    parent = os.path.dirname(output_dir)
+    os.makedirs(parent, exist_ok=True)
+    staged = tempfile.mkdtemp(prefix=f".{os.path.basename(output_dir)}-staged-", dir=parent)
+    try:
+        # Copia (no hardlinks: el conversor reescribe los archivos en el lugar) para que los
+        # casos sin cambios conserven su *-result.json y su timestamp
+        if os.path.isdir(output_dir) and not full:
+            shutil.copytree(output_dir, staged, dirs_exist_ok=True)
+        converter = ExcelToAllureConverter(excel_path, staged, **options)
+        if not converter.convert(full=full):
+            shutil.rmtree(staged, ignore_errors=True)
+            return None
+        # Resultados que no describe el manifest (tests borrados, restos de otras ejecuciones)
+        stale = converter.remove_unwritten({entry['uuid'] for entry in converter.manifest.values()})
+        if stale:
+            print(f"🗑️ {stale} resultados obsoletos eliminados")
+        swap_directory(staged, output_dir)
+    except BaseException:
+        shutil.rmtree(staged, ignore_errors=True)
+        raise
+    converter.output_dir = output_dir
+    print(f"🔁 {output_dir} reemplazado por la conversión nueva")
+    return converter
+
+
+class PublishTree:
+    """
+    Árbol de publicación (p. ej. publish/ para gh-pages) sincronizado por contenido.
+
+    El manifest guarda [sha1, tamaño] de cada archivo publicado. En cada
+    sync solo se copian los archivos cuyo hash cambió (o que faltan en el
+    árbol) y se eliminan los que ya no están en el sitio, así los archivos
+    sin cambios conservan su mtime y un deploy incremental sube solo la
+    diferencia. Sin manifest anterior se compara contra el hash de lo que
+    ya está en el árbol.
+    """
+
+    MANIFEST_VERSION = 1
+
+    def __init__(self, publish_dir, manifest_path=None):
+        self.publish_dir = publish_dir
+        self.manifest_path = manifest_path or os.path.join('.cache', 'publish', 'manifest.json')
+
+    @staticmethod
+    def staged_files(sources):
+        """{ruta relativa en el sitio: archivo de origen} a partir de pares (destino, origen)"""
+        files = {}
+        for dest, source in sources:
+            dest = dest.strip('/')
+            if os.path.isdir(source):
+                for root, _, names in os.walk(source):
+                    rel_root = os.path.relpath(root, source)
+                    for name in names:
+                        rel = os.path.normpath(os.path.join(dest, rel_root, name))
+                        files[rel.replace(os.sep, '/')] = os.path.join(root, name)
+            elif os.path.isfile(source):
+                files[dest] = source
+            else:
+                raise FileNotFoundError(f"No existe el origen {source}")
+        return files
+
+    def load_manifest(self):
+        """{ruta: [sha1, tamaño]} de la publicación anterior (vacío si no existe)"""
+        try:
+            with open(self.manifest_path, encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+        if manifest.get('version') != self.MANIFEST_VERSION or \
+                manifest.get('publish_dir') != os.path.abspath(self.publish_dir):
+            return {}
+        return manifest.get('files', {})
+
+    def save_manifest(self, files):
+        os.makedirs(os.path.dirname(self.manifest_path) or '.', exist_ok=True)
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': self.MANIFEST_VERSION, 'publish_dir': os.path.abspath(self.publish_dir),
+                       'files': files}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def is_current(self, path, entry, previous):
+        """True si el archivo publicado ya tiene el contenido de entry ([sha1, tamaño])"""
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return False
+        if size != entry[1]:
+            return False
+        if previous is not None:
+            return previous == entry
+        return file_digest(path) == entry[0]
+
+    def sync(self, sources):
+        """Publica los pares (destino, origen); devuelve los contadores de la sincronización"""
+        staged = self.staged_files(sources)
+        previous = self.load_manifest()
+        stats = {'files': len(staged), 'copied': 0, 'unchanged': 0, 'removed': 0,
+                 'bytes_total': 0, 'bytes_copied': 0, 'changed': []}
+
+        files = {}
+        for rel, source in sorted(staged.items()):
+            entry = [file_digest(source), os.path.getsize(source)]
+            files[rel] = entry
+            stats['bytes_total'] += entry[1]
+            path = os.path.join(self.publish_dir, rel)
+            if self.is_current(path, entry, previous.get(rel) if previous else None):
+                stats['unchanged'] += 1
+                continue
+            # Archivo temporal + rename: el árbol nunca tiene un archivo a medio copiar
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.publish-tmp"
+            shutil.copyfile(source, tmp_path)
+            os.replace(tmp_path, path)
+            stats['copied'] += 1
+            stats['bytes_copied'] += entry[1]
+            stats['changed'].append(rel)
+
+        # Lo que quedó en el árbol y ya no es parte del sitio
+        for root, dirs, names in os.walk(self.publish_dir, topdown=False):
+            for name in names:
+                path = os.path.join(root, name)
+                rel = os.path.relpath(path, self.publish_dir).replace(os.sep, '/')
+                if rel not in files:
+                    os.remove(path)
+                    stats['removed'] += 1
+                    stats['changed'].append(rel)
+            if root != self.publish_dir and not os.listdir(root):
+                os.rmdir(root)
+
+        self.save_manifest(files)
+        return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Staging atómico de allure-results y publicación por diferencias')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    results = commands.add_parser('results', help='Convierte el workbook en un directorio temporal y lo reemplaza')
+    results.add_argument('excel', nargs='?',
+                         help='Archivo de casos: .xlsx, .csv, .parquet o .ndjson (default: el primer .xlsx en test_data/)')
+    results.add_argument('--output', default='allure-results', help='Directorio de resultados (default: allure-results)')
+    results.add_argument('--full', action='store_true', help='Convierte desde cero sin partir de los resultados actuales')
+    results.add_argument('--no-cache', action='store_true', help='No usar el caché de workbooks parseados')
+    results.add_argument('--no-history', action='store_true', help='No registrar la ejecución en el historial')
+    results.add_argument('--dedup', nargs='?', type=int, const=512, default=None, metavar='BYTES',
+                         help='Pasos y datos de prueba largos como adjuntos compartidos (default: 512)')
+
+    sync = commands.add_parser('sync', help='Copia al árbol de publicación solo los archivos que cambiaron')
+    sync.add_argument('sources', nargs='+', metavar='DESTINO=ORIGEN',
+                      help="Archivo o directorio de origen y su ruta en el sitio (p. ej. report=allure-report)")
+    sync.add_argument('--publish', default='publish', help='Árbol de publicación (default: publish)')
+    sync.add_argument('--manifest', default=None,
+                      help='Manifest de la publicación anterior (default: .cache/publish/manifest.json)')
+    sync.add_argument('--changes', default=None, metavar='ARCHIVO',
+                      help='Escribe la lista de rutas copiadas o eliminadas (una por línea)')
+    args = parser.parse_args()
+
+    if args.command == 'results':
+        import glob
+        from history_store import HistoryStore
+        from workbook_cache import WorkbookCache
+        from workbook_reader import reader_for
+
+        if not args.excel:
+            excel_files = sorted(glob.glob('test_data/*.xlsx'))
+            if not excel_files:
+                print("❌ Error: No se encontró ningún archivo Excel en test_data/")
+                return False
+            args.excel = excel_files[0]
+        reader = reader_for(args.excel)
+        if reader is None:
+            print(f"❌ Error: Formato no soportado: {args.excel} (usa .xlsx, .csv, .parquet o .ndjson)")
+            return False
+        converter = stage_results(args.excel, args.output, full=args.full,
+                                  cache=None if args.no_cache else WorkbookCache(),
+                                  history=None if args.no_history else HistoryStore(),
+                                  reader=reader, dedup_min_bytes=args.dedup)
+        return converter is not None
+
+    sources = []
+    for pair in args.sources:
+        dest, sep, source = pair.partition('=')
+        if not sep or not dest or not source:
+            parser.error(f"Se esperaba DESTINO=ORIGEN: {pair}")
+        sources.append((dest, source))
+    stats = PublishTree(args.publish, args.manifest).sync(sources)
+    if args.changes:
+        with open(args.changes, 'w', encoding='utf-8') as f:
+            f.writelines(f"{rel}\n" for rel in stats['changed'])
+    print(f"📤 {args.publish}: {stats['copied']} copiados, {stats['unchanged']} sin cambios, "
+          f"{stats['removed']} eliminados ({stats['bytes_copied'] / 1024:,.0f} de "
+          f"{stats['bytes_total'] / 1024:,.0f} KB)")
+    return True
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,281 @@
+"""
+Resumen rápido de allure-results sin Java ni Allure CLI.
+
+Genera los widgets de resumen (summary.json, estados, severidades, suites)
+y una página HTML estática para previews y checks de PRs. El reporte
+completo publicado se sigue generando con allure generate.
+
+Uso:
+    python scripts/report_summary.py allure-results -o allure-summary
+"""
+import argparse
+import html
+import json
+import os
+from datetime import datetime
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+STATUSES = ['failed', 'broken', 'skipped', 'passed', 'unknown']
+SEVERITIES = ['blocker', 'critical', 'normal', 'minor', 'trivial']
+
+# Etiqueta e icono de cada estado de Allure con el nombre del Excel
+STATUS_LABELS = {
+    'passed': ('✅', 'PASSED'),
+    'failed': ('❌', 'FAILED'),
+    'broken': ('🚫', 'BLOCKED'),
+    'skipped': ('⏭️', 'SKIPPED'),
+    'unknown': ('⏸️', 'PENDING'),
+}
+STATUS_COLORS = {
+    'passed': '#97cc64',
+    'failed': '#fd5a3e',
+    'broken': '#ffd050',
+    'skipped': '#aaaaaa',
+    'unknown': '#d35ebe',
+}
+
+
+def _loads(data):
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def _empty_statistic():
+    return dict.fromkeys(STATUSES, 0)
+
+
+class ReportSummary:
+    """
+    Acumula estadísticas de resultados de Allure.
+
+    Los resultados se agregan uno a uno (add) a partir del dict de Allure,
+    de los archivos de allure-results o directamente de los datos que el
+    conversor ya tiene en memoria, sin releer los JSON.
+    """
+
+    def __init__(self, report_name='Allure Report'):
+        self.report_name = report_name
+        self.statistic = _empty_statistic()
+        self.severities = {}
+        self.suites = {}
+        self.parent_suites = {}
+        self.start = None
+        self.stop = None
+        self.min_duration = None
+        self.max_duration = None
+        self.sum_duration = 0
+
+    def add(self, status, severity='normal', suite=None, parent_suite=None, start=None, stop=None):
+        """Agrega un resultado"""
+        if status not in self.statistic:
+            status = 'unknown'
+        self.statistic[status] += 1
+        self.severities.setdefault(severity or 'normal', _empty_statistic())[status] += 1
+        self.suites.setdefault((parent_suite, suite or 'General'), _empty_statistic())[status] += 1
+        if parent_suite:
+            self.parent_suites.setdefault(parent_suite, _empty_statistic())[status] += 1
+
+        if start is not None and stop is not None:
+            duration = stop - start
+            self.start = start if self.start is None else min(self.start, start)
+            self.stop = stop if self.stop is None else max(self.stop, stop)
+            self.min_duration = duration if self.min_duration is None else min(self.min_duration, duration)
+            self.max_duration = duration if self.max_duration is None else max(self.max_duration, duration)
+            self.sum_duration += duration
+
+    def add_result(self, result):
+        """Agrega un resultado en formato Allure (*-result.json)"""
+        labels = {label['name']: label['value'] for label in result.get('labels', [])}
+        self.add(result.get('status', 'unknown'), labels.get('severity'), labels.get('suite'),
+                 labels.get('parentSuite'), result.get('start'), result.get('stop'))
+
+    @classmethod
+    def from_results_dir(cls, results_dir, report_name='Allure Report'):
+        """Lee los *-result.json (y bundles results*.ndjson) de allure-results"""
+        summary = cls(report_name)
+        with os.scandir(results_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('-result.json'):
+                    with open(entry.path, 'rb') as f:
+                        summary.add_result(_loads(f.read()))
+                elif entry.name.startswith('results') and entry.name.endswith('.ndjson'):
+                    with open(entry.path, 'rb') as f:
+                        for line in f:
+                            if line.strip():
+                                summary.add_result(_loads(line))
+        return summary
+
+    @property
+    def total(self):
+        return sum(self.statistic.values())
+
+    @staticmethod
+    def _with_total(statistic):
+        return dict(statistic, total=sum(statistic.values()))
+
+    def widgets(self):
+        """Widgets de resumen: nombre de archivo → contenido JSON"""
+        suites = []
+        for (parent_suite, suite), statistic in sorted(self.suites.items(), key=lambda item: (item[0][0] or '', item[0][1])):
+            name = f"{parent_suite} / {suite}" if parent_suite else suite
+            suites.append({'uid': name, 'name': name, 'statistic': self._with_total(statistic)})
+
+        widgets = {
+            'summary.json': {
+                'reportName': self.report_name,
+                'testRuns': [],
+                'statistic': self._with_total(self.statistic),
+                'time': {
+                    'start': self.start,
+                    'stop': self.stop,
+                    'duration': self.stop - self.start if self.start is not None else None,
+                    'minDuration': self.min_duration,
+                    'maxDuration': self.max_duration,
+                    'sumDuration': self.sum_duration,
+                },
+            },
+            'status.json': [
+                {'status': status, 'count': self.statistic[status]} for status in STATUSES
+            ],
+            'severity.json': [
+                {'severity': severity, 'statistic': self._with_total(self.severities[severity])}
+                for severity in SEVERITIES + sorted(set(self.severities) - set(SEVERITIES))
+                if severity in self.severities
+            ],
+            'suites.json': {'total': len(suites), 'items': suites},
+        }
+        if self.parent_suites:
+            widgets['parent-suites.json'] = {
+                'total': len(self.parent_suites),
+                'items': [
+                    {'uid': name, 'name': name, 'statistic': self._with_total(statistic)}
+                    for name, statistic in sorted(self.parent_suites.items())
+                ],
+            }
+        return widgets
+
+    def pass_rate(self, statistic=None):
+        statistic = statistic or self.statistic
+        total = sum(statistic.values())
+        return round(statistic['passed'] / total * 100, 2) if total else 0
+
+    def _bar(self, statistic):
+        """Barra apilada por estado (solo CSS, sin JavaScript)"""
+        total = sum(statistic.values())
+        if not total:
+            return '<div class="bar"></div>'
+        segments = ''.join(
+            f'<span style="width:{statistic[status] / total * 100:.2f}%;background:{STATUS_COLORS[status]}" '
+            f'title="{STATUS_LABELS[status][1]}: {statistic[status]}"></span>'
+            for status in STATUSES if statistic[status]
+        )
+        return f'<div class="bar">{segments}</div>'
+
+    def _table(self, title, rows):
+        header = ''.join(f'<th>{STATUS_LABELS[status][0]} {STATUS_LABELS[status][1]}</th>' for status in STATUSES)
+        body = ''.join(
+            f'<tr><td>{html.escape(str(name))}</td>'
+            + ''.join(f'<td>{statistic[status]}</td>' for status in STATUSES)
+            + f'<td>{sum(statistic.values())}</td><td>{self.pass_rate(statistic)}%</td>'
+            + f'<td class="wide">{self._bar(statistic)}</td></tr>'
+            for name, statistic in rows
+        )
+        return (f'<h2>{html.escape(title)}</h2><table><tr><th></th>{header}'
+                f'<th>Total</th><th>Pass rate</th><th></th></tr>{body}</table>')
+
+    def render_html(self):
+        """Página HTML estática con el resumen"""
+        sections = [self._table('Estados', [('Total', self.statistic)])]
+        if self.parent_suites:
+            sections.append(self._table('Squads', sorted(self.parent_suites.items())))
+        sections.append(self._table('Suites', [
+            (f"{parent_suite} / {suite}" if parent_suite else suite, statistic)
+            for (parent_suite, suite), statistic in sorted(self.suites.items(), key=lambda item: (item[0][0] or '', item[0][1]))
+        ]))
+        sections.append(self._table('Severidad', [
+            (severity, self.severities[severity])
+            for severity in SEVERITIES + sorted(set(self.severities) - set(SEVERITIES))
+            if severity in self.severities
+        ]))
+
+        generated = datetime.now().strftime('%d/%m/%Y %H:%M')
+        return f"""<!DOCTYPE html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<title>{html.escape(self.report_name)} - Resumen</title>
+<style>
+body {{ font-family: -apple-system, Segoe UI, Roboto, sans-serif; margin: 2rem; color: #333; }}
+table {{ border-collapse: collapse; margin-bottom: 2rem; }}
+th, td {{ padding: .35rem .7rem; border-bottom: 1px solid #eee; text-align: right; }}
+td:first-child {{ text-align: left; font-weight: 600; }}
+td.wide {{ width: 260px; }}
+.bar {{ display: flex; height: 14px; width: 240px; background: #f3f3f3; border-radius: 3px; overflow: hidden; }}
+.bar span {{ display: block; height: 100%; }}
+.kpi {{ font-size: 2.4rem; font-weight: 700; }}
+</style>
+</head>
+<body>
+<h1>📊 {html.escape(self.report_name)}</h1>
+<p><span class="kpi">{self.pass_rate()}%</span> pass rate · {self.total} casos · generado el {generated}</p>
+{''.join(sections)}
+<p>Vista previa generada sin Allure CLI. El reporte completo se publica con <code>allure generate</code>.</p>
+</body>
+</html>
+"""
+
+    def to_markdown(self):
+        """Resumen en Markdown (p. ej. para $GITHUB_STEP_SUMMARY)"""
+        lines = [f"### 📊 {self.report_name}: {self.pass_rate()}% pass rate ({self.total} casos)", '',
+                 '| | ' + ' | '.join(f"{STATUS_LABELS[status][0]} {STATUS_LABELS[status][1]}" for status in STATUSES) + ' | Total |',
+                 '|---|' + '---:|' * (len(STATUSES) + 1)]
+        rows = sorted(self.parent_suites.items()) if self.parent_suites else [
+            (f"{parent_suite} / {suite}" if parent_suite else suite, statistic)
+            for (parent_suite, suite), statistic in sorted(self.suites.items(), key=lambda item: (item[0][0] or '', item[0][1]))
+        ]
+        for name, statistic in rows + [('**Total**', self.statistic)]:
+            lines.append(f"| {name} | " + ' | '.join(str(statistic[status]) for status in STATUSES)
+                         + f" | {sum(statistic.values())} |")
+        return '\n'.join(lines) + '\n'
+
+    def write(self, output_dir):
+        """Escribe widgets/*.json e index.html en output_dir"""
+        widgets_dir = os.path.join(output_dir, 'widgets')
+        os.makedirs(widgets_dir, exist_ok=True)
+        for filename, content in self.widgets().items():
+            with open(os.path.join(widgets_dir, filename), 'w', encoding='utf-8') as f:
+                f.write(json.dumps(content, indent=2, ensure_ascii=False))
+
+        index_path = os.path.join(output_dir, 'index.html')
+        with open(index_path, 'w', encoding='utf-8') as f:
+            f.write(self.render_html())
+
+        # En GitHub Actions el resumen también se muestra en la página del job
+        step_summary = os.getenv('GITHUB_STEP_SUMMARY')
+        if step_summary:
+            with open(step_summary, 'a', encoding='utf-8') as f:
+                f.write(self.to_markdown())
+
+        print(f"✅ Resumen generado: {index_path} ({self.total} casos, pass rate {self.pass_rate()}%)")
+        return index_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Resumen de allure-results sin Allure CLI')
+    parser.add_argument('results_dir', nargs='?', default='allure-results', help='Directorio allure-results')
+    parser.add_argument('-o', '--output', default='allure-summary', help='Directorio de salida (default: allure-summary)')
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.results_dir):
+        print(f"❌ Error: No se encontró el directorio {args.results_dir}")
+        return False
+
+    ReportSummary.from_results_dir(args.results_dir).write(args.output)
+    return True
+
+
+if __name__ == '__main__':
+    main()
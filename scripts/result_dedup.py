@@ -0,0 +1,137 @@
+"""
+Deduplicación del contenido que se repite entre casos.
+
+- ContentMemo: memoiza lo que se deriva de un texto (pasos parseados,
+  parámetros) para no reprocesar en cada fila los bloques idénticos.
+- AttachmentStore: adjuntos de Allure direccionados por contenido. Cada
+  bloque grande se escribe una sola vez como <sha1>-attachment.txt en
+  allure-results y todos los resultados que lo usan lo referencian.
+"""
+import hashlib
+import os
+import re
+import tempfile
+
+
+class ContentMemo:
+    """
+    Valores derivados de un texto, calculados una vez por texto distinto.
+
+    Los valores se comparten entre resultados, así que no deben modificarse.
+    Con más de max_entries textos distintos se vacía (memoria acotada en
+    streaming) y no se copia al serializar el conversor para otro proceso.
+    """
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._values = {}
+
+    def get(self, text, build):
+        value = self._values.get(text)
+        if value is not None:
+            self.hits += 1
+            return value
+        self.misses += 1
+        if len(self._values) >= self.max_entries:
+            self._values.clear()
+        value = self._values[text] = build(text)
+        return value
+
+    def clear(self):
+        self._values.clear()
+
+    def __getstate__(self):
+        return {'max_entries': self.max_entries, 'hits': 0, 'misses': 0, '_values': {}}
+
+
+class AttachmentStore:
+    """
+    Adjuntos de texto de Allure nombrados por el SHA-1 de su contenido.
+
+    attach() devuelve la referencia para el resultado y deja el adjunto
+    pendiente; flush() escribe los pendientes que todavía no existen (antes
+    que los resultados que los usan). Un adjunto ya escrito en una conversión
+    anterior no se vuelve a escribir. referenced guarda los adjuntos usados en
+    esta ejecución para poder borrar los que ya no usa ningún resultado.
+    """
+
+    SUFFIX = '-attachment.txt'
+    PATTERN = re.compile(r'^[0-9a-f]{40}-attachment\.txt$')
+    DEFAULT_MIN_BYTES = 512
+
+    def __init__(self, output_dir, min_bytes=None, max_entries=10000):
+        self.output_dir = output_dir
+        self.min_bytes = min_bytes or self.DEFAULT_MIN_BYTES
+        self.pending = {}
+        self.referenced = set()
+        self.files_written = 0
+        self.bytes_written = 0
+        self._written = set()
+        self._sources = ContentMemo(max_entries)
+
+    def is_large(self, text):
+        """True si el bloque va como adjunto (len en caracteres: evita codificar cada texto)"""
+        return len(text) >= self.min_bytes
+
+    @classmethod
+    def source_name(cls, text):
+        return hashlib.sha1(text.encode('utf-8')).hexdigest() + cls.SUFFIX
+
+    def attach(self, name, text):
+        """Referencia de Allure al adjunto con el texto (se escribe en el próximo flush)"""
+        source = self._sources.get(text, self.source_name)
+        if source not in self._written:
+            self.pending[source] = text
+        self.referenced.add(source)
+        return {"name": name, "source": source, "type": "text/plain"}
+
+    def take(self):
+        """(pendientes, referenciados) y los vacía (para devolverlos desde otro proceso)"""
+        pending, referenced = self.pending, self.referenced
+        self.pending, self.referenced = {}, set()
+        return pending, referenced
+
+    def merge(self, pending, referenced):
+        """Agrega los adjuntos armados en otro proceso"""
+        for source, text in pending.items():
+            if source not in self._written:
+                self.pending[source] = text
+        self.referenced.update(referenced)
+
+    def flush(self):
+        """Escribe los adjuntos pendientes; devuelve (archivos, bytes) escritos"""
+        files = size = 0
+        for source, text in self.pending.items():
+            path = os.path.join(self.output_dir, source)
+            if not os.path.exists(path):
+                data = text.encode('utf-8')
+                # Archivo temporal + rename: varios procesos del batch pueden escribir el mismo adjunto
+                fd, tmp_path = tempfile.mkstemp(dir=self.output_dir, suffix='.tmp')
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+                files += 1
+                size += len(data)
+            self._written.add(source)
+        self.pending.clear()
+        self.files_written += files
+        self.bytes_written += size
+        return files, size
+
+    def __getstate__(self):
+        # A los procesos del pool solo viaja la configuración; lo armado vuelve con take()
+        state = dict(self.__dict__)
+        state.update(pending={}, referenced=set(), _written=set())
+        return state
+
+    def remove_unreferenced(self):
+        """Elimina los adjuntos de allure-results que no usa ningún resultado de esta ejecución"""
+        removed = 0
+        with os.scandir(self.output_dir) as entries:
+            for entry in entries:
+                if self.PATTERN.match(entry.name) and entry.name not in self.referenced:
+                    os.remove(entry.path)
+                    removed += 1
+        return removed
@@ -0,0 +1,283 @@
+"""
+Qué cambió entre dos ejecuciones: casos nuevos, eliminados y con cambio de estado.
+
+Cada snapshot es un índice historyId → (estado Allure, nombre, ID del caso)
+armado desde un workbook (.xlsx/.csv/.parquet/.ndjson), un directorio
+allure-results (*-result.json y bundles results*.ndjson) o un snapshot
+guardado con --save. La comparación es una pasada sobre cada índice (O(n)).
+
+Uso:
+    python scripts/run_diff.py allure-results-anterior test_data/test_cases.xlsx
+    python scripts/run_diff.py snapshot.json test_data/test_cases.xlsx --json
+    python scripts/run_diff.py test_data/test_cases.xlsx --save snapshot.json
+"""
+import argparse
+import contextlib
+import hashlib
+import json
+import math
+import os
+import sys
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Mismo mapeo de estados que ExcelToAllureConverter.STATUS_MAP (sin importar pandas)
+STATUS_MAP = {}
+for _status, _allure in (('PENDING', 'unknown'), ('PASSED', 'passed'), ('FAILED', 'failed'),
+                         ('BLOCKED', 'broken'), ('SKIPPED', 'skipped')):
+    for _variant in (_status, _status.capitalize(), _status.lower()):
+        STATUS_MAP[_variant] = _allure
+
+# Etiqueta del Excel de cada estado Allure (para mostrar los cambios)
+STATUS_LABELS = {'passed': 'PASSED', 'failed': 'FAILED', 'broken': 'BLOCKED', 'skipped': 'SKIPPED', 'unknown': 'PENDING'}
+
+FAILING = ('failed', 'broken')
+
+
+def _loads(data):
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def _pandas_strings(values):
+    """str() de cada valor como queda en el DataFrame (columna numérica con vacías → '1.0')"""
+    numbers = [value for value in values if not (isinstance(value, float) and math.isnan(value))]
+    as_float = (all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in numbers)
+                and (len(numbers) < len(values) or any(isinstance(value, float) for value in numbers)))
+    if as_float:
+        return [str(float(value)) for value in values]
+    return [str(value) for value in values]
+
+
+class Snapshot:
+    """Índice historyId → (estado, nombre, ID del caso) de una ejecución"""
+
+    VERSION = 1
+
+    def __init__(self, tests, source=None):
+        self.tests = tests
+        self.source = source
+
+    def __len__(self):
+        return len(self.tests)
+
+    @staticmethod
+    def history_id(test_id, namespace=None):
+        """historyId de Allure igual que el conversor (md5 del ID con namespace)"""
+        qualified = f"{namespace}/{test_id}" if namespace else test_id
+        return hashlib.md5(qualified.encode()).hexdigest()
+
+    @classmethod
+    def from_workbook(cls, path, namespace=None):
+        """
+        Lee ID, Title y Status del workbook en streaming (sin pandas).
+
+        Cada fila pasa por TestCase.from_row con los valores como quedan en el
+        DataFrame del conversor (celda vacía o columna que falta en una tab →
+        'nan'; columna que no existe en ninguna tab → default del conversor),
+        así el snapshot coincide con el de allure-results de la misma ejecución.
+        """
+        from testcase import TestCase
+        from workbook_reader import WorkbookReader, reader_for
+
+        reader = (reader_for(path) or WorkbookReader)(path)
+        fields = {'ID': [], 'Title': [], 'Status': []}
+        for row in reader.iter_rows():
+            for column, values in fields.items():
+                values.append(row.get(column, float('nan')))
+        columns = WorkbookReader.combined_columns(reader.sheet_columns) if reader.sheet_columns else []
+        if fields['ID'] and 'ID' not in columns:
+            raise ValueError(f"{path} no tiene la columna ID")
+
+        # Solo las columnas que existen en el workbook, como en el DataFrame combinado
+        present = {column: _pandas_strings(values) for column, values in fields.items() if column in columns}
+        tests = {}
+        history_id = cls.history_id
+        # Con IDs repetidos queda la última fila, como en allure-results
+        for values in zip(*present.values()):
+            case = TestCase.from_row(dict(zip(present, values)))
+            status = case.status if case.status is not None else 'PENDING'
+            title = case.title if case.title is not None else 'Sin título'
+            tests[history_id(case.test_id, namespace)] = (STATUS_MAP.get(status, 'unknown'), title, case.test_id)
+        return cls(tests, str(path))
+
+    @classmethod
+    def from_results_dir(cls, results_dir):
+        """Lee historyId, estado, nombre y testId de los resultados de Allure"""
+        tests = {}
+
+        def add(result):
+            test_id = next((label['value'] for label in result.get('labels', []) if label.get('name') == 'testId'), None)
+            tests[result['historyId']] = (result.get('status', 'unknown'), result.get('name'), test_id)
+
+        with os.scandir(results_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('-result.json'):
+                    with open(entry.path, 'rb') as f:
+                        add(_loads(f.read()))
+                elif entry.name.startswith('results') and entry.name.endswith('.ndjson'):
+                    with open(entry.path, 'rb') as f:
+                        for line in f:
+                            if line.strip():
+                                add(_loads(line))
+        return cls(tests, str(results_dir))
+
+    @classmethod
+    def from_file(cls, path):
+        """Snapshot guardado con save()"""
+        with open(path, 'rb') as f:
+            data = _loads(f.read())
+        if data.get('version') != cls.VERSION:
+            raise ValueError(f"{path} es de otra versión de snapshot")
+        # Los casos quedan como listas [estado, nombre, ID]; se indexan igual que las tuplas
+        return cls(data['tests'], data.get('source'))
+
+    @classmethod
+    def load(cls, path, namespace=None):
+        """Snapshot de un directorio allure-results, un snapshot .json o un workbook"""
+        if os.path.isdir(path):
+            return cls.from_results_dir(path)
+        if str(path).endswith('.json'):
+            return cls.from_file(path)
+        return cls.from_workbook(path, namespace)
+
+    def save(self, path):
+        """Guarda el snapshot en JSON (base para el próximo diff)"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        data = {'version': self.VERSION, 'source': self.source, 'tests': self.tests}
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps(data) if orjson else json.dumps(data, ensure_ascii=False).encode('utf-8'))
+        os.replace(tmp_path, path)
+        return path
+
+
+class RunDiff:
+    """
+    Casos nuevos, eliminados y con cambio de estado entre dos snapshots.
+
+    Regresiones son los casos que pasaron de PASSED a FAILED/BLOCKED y
+    arreglos los que pasaron de FAILED/BLOCKED a PASSED.
+    """
+
+    def __init__(self, base, current):
+        self.base = base
+        self.current = current
+        base_tests = base.tests
+        self.new = []
+        self.changed = []
+        for history_id, test in current.tests.items():
+            previous = base_tests.get(history_id)
+            if previous is None:
+                self.new.append(history_id)
+            elif previous[0] != test[0]:
+                self.changed.append(history_id)
+        current_tests = current.tests
+        self.removed = [history_id for history_id in base_tests if history_id not in current_tests]
+
+    def _transitions(self, before, after):
+        base, current = self.base.tests, self.current.tests
+        return [history_id for history_id in self.changed
+                if base[history_id][0] in before and current[history_id][0] in after]
+
+    @property
+    def regressions(self):
+        return self._transitions(('passed',), FAILING)
+
+    @property
+    def fixes(self):
+        return self._transitions(FAILING, ('passed',))
+
+    def summary(self):
+        return {
+            'base': len(self.base),
+            'current': len(self.current),
+            'new': len(self.new),
+            'removed': len(self.removed),
+            'changed': len(self.changed),
+            'regressions': len(self.regressions),
+            'fixes': len(self.fixes),
+        }
+
+    def describe(self, history_id):
+        """{id, name, before, after} de un caso (before/after None si es nuevo o eliminado)"""
+        before = self.base.tests.get(history_id)
+        after = self.current.tests.get(history_id)
+        test = after or before
+        return {
+            'historyId': history_id,
+            'id': test[2],
+            'name': test[1],
+            'before': before[0] if before else None,
+            'after': after[0] if after else None,
+        }
+
+    def to_dict(self, limit=None):
+        """Resumen y detalle (hasta limit casos por grupo)"""
+        groups = {
+            'regressions': self.regressions,
+            'fixes': self.fixes,
+            'changed': self.changed,
+            'new': self.new,
+            'removed': self.removed,
+        }
+        return {
+            'base': self.base.source,
+            'current': self.current.source,
+            'summary': self.summary(),
+            **{name: [self.describe(history_id) for history_id in ids[:limit]] for name, ids in groups.items()},
+        }
+
+    def format_change(self, history_id):
+        """Línea corta de un cambio: 'TC-001 Login (PASSED → FAILED)'"""
+        test = self.describe(history_id)
+        before = STATUS_LABELS.get(test['before'], test['before'])
+        after = STATUS_LABELS.get(test['after'], test['after'])
+        return f"{test['id']} {test['name']} ({before} → {after})"
+
+    def print_report(self, limit=20):
+        summary = self.summary()
+        print(f"\n🔀 {self.base.source} → {self.current.source}")
+        print(f"   Casos: {summary['base']} → {summary['current']} | 🆕 {summary['new']} nuevos | "
+              f"🗑️ {summary['removed']} eliminados | 🔁 {summary['changed']} con cambio de estado")
+        for title, icon, ids in (('Regresiones', '📉', self.regressions), ('Arreglados', '📈', self.fixes)):
+            print(f"\n{icon} {title}: {len(ids)}")
+            for history_id in ids[:limit]:
+                print(f"   {self.format_change(history_id)}")
+            if len(ids) > limit:
+                print(f"   ... y {len(ids) - limit} más")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Diferencias entre dos ejecuciones (workbooks, allure-results o snapshots)')
+    parser.add_argument('base', help='Ejecución anterior: workbook, directorio allure-results o snapshot .json')
+    parser.add_argument('current', nargs='?', help='Ejecución actual (mismo tipo de fuentes)')
+    parser.add_argument('--namespace', help='Namespace del workbook (modo batch) para calcular los historyId')
+    parser.add_argument('--json', action='store_true', help='Imprime el diff en JSON')
+    parser.add_argument('--limit', type=int, default=20, help='Casos por grupo en el detalle (default: 20)')
+    parser.add_argument('--save', metavar='JSON', help='Guarda el snapshot de la ejecución actual (o de base si no hay actual)')
+    args = parser.parse_args()
+
+    # Con --json los mensajes de lectura van a stderr para no mezclarse con la salida
+    with contextlib.redirect_stdout(sys.stderr if args.json else sys.stdout):
+        base = Snapshot.load(args.base, args.namespace)
+        current = Snapshot.load(args.current, args.namespace) if args.current else None
+        if args.save:
+            (current or base).save(args.save)
+            print(f"✅ Snapshot guardado: {args.save} ({len(current or base)} casos)")
+
+    if current is None:
+        return True
+
+    diff = RunDiff(base, current)
+    if args.json:
+        print(json.dumps(diff.to_dict(limit=args.limit), indent=2, ensure_ascii=False))
+    else:
+        diff.print_report(limit=args.limit)
+    return True
+
+
+if __name__ == '__main__':
+    main()
@@ -1,56 +1,48 @@
 import json
-import requests
 import os
 from pathlib import Path
 from datetime import datetime
-import pandas as pd
+from workbook_cache import WorkbookCache
+from suite_metrics import SuiteMetrics
 
-def extract_metrics_by_category():
+# La alerta no usa pandas; openpyxl y requests se importan solo cuando hacen
+# falta: con las métricas precalculadas por el conversor arranca sin cargarlos
+
+def extract_suite_metrics(excel_path='test_data/test_cases_Hoopit.xlsx'):
+    """
+    Agrega el Excel en un SuiteMetrics (Category × Status × Priority).
+    
+    Usa las métricas que guardó el conversor para este contenido del Excel;
+    si no están, cuenta los estados leyendo el Excel en streaming con
+    openpyxl (sin pandas) y las guarda para la próxima vez.
+    """
+    cache = WorkbookCache()
+    data = cache.get_metrics(excel_path)
+    if data is not None:
+        print(f"♻️ Métricas precalculadas por el conversor: {excel_path}")
+        return SuiteMetrics.from_dict(data)
+    
+    metrics = SuiteMetrics.from_workbook(excel_path)
+    try:
+        cache.put_metrics(excel_path, metrics.to_dict())
+    except OSError as e:
+        print(f"⚠️ No se pudieron guardar las métricas en caché: {e}")
+    return metrics
+
+def extract_metrics_by_category(excel_path='test_data/test_cases_Hoopit.xlsx'):
     """Extrae métricas del Excel por categoría (Functional vs Non functional)"""
     try:
-        excel_path = Path('test_data/test_cases_Hoopit.xlsx')
+        excel_path = Path(excel_path)
         
         if not excel_path.exists():
             print(f"❌ Archivo no encontrado: {excel_path}")
             return None
         
-        # Leer ambas tabs
-        tabs = {
-            'Functional TC': pd.read_excel(excel_path, sheet_name='Functional TC'),
-            'Non functional TC': pd.read_excel(excel_path, sheet_name='Non functional TC')
-        }
-        
-        metrics = {}
+        metrics = extract_suite_metrics(excel_path).by_category()
         
-        for category, df in tabs.items():
-            # Encontrar columna de Status (generalmente contiene "Status" en el nombre)
-            status_col = None
-            for col in df.columns:
-                if 'status' in col.lower():
-                    status_col = col
-                    break
-            
-            total = len(df)
-            passed = 0
-            failed = 0
-            pending = 0
-            
-            if status_col:
-                passed = len(df[df[status_col].astype(str).str.upper() == 'PASSED'])
-                failed = len(df[df[status_col].astype(str).str.upper() == 'FAILED'])
-                pending = len(df[df[status_col].astype(str).str.upper() == 'PENDING'])
-            
-            pass_rate = (passed / total * 100) if total > 0 else 0
-            
-            metrics[category] = {
-                'total': total,
-                'passed': passed,
-                'failed': failed,
-                'pending': pending,
-                'pass_rate': round(pass_rate, 2)
-            }
-            
-            print(f"✅ {category}: Total={total}, Passed={passed}, Failed={failed}, Pending={pending}")
+        for category, data in metrics.items():
+            print(f"✅ {category}: Total={data['total']}, Passed={data['passed']}, Failed={data['failed']}, "
+                  f"Pending={data['pending']}, Blocked={data['blocked']}, Skipped={data['skipped']}")
         
         return metrics
     except Exception as e:
@@ -59,17 +51,54 @@ def extract_metrics_by_category():
         traceback.print_exc()
         return None
 
-def send_teams_notification(webhook_url, metrics):
-    """Envía notificación a Teams con resumen por categoría"""
-    if not metrics:
-        print("❌ No hay métricas para enviar")
-        return False
+def diff_since_last(excel_path='test_data/test_cases_Hoopit.xlsx', base_path=None):
+    """
+    Compara el Excel con el snapshot del último envío.
+    
+    Devuelve (RunDiff o None si todavía no hay snapshot, snapshot actual).
+    base_path puede ser un snapshot .json, un directorio allure-results o
+    un workbook (default: TEAMS_DIFF_BASE o .cache/teams/last-snapshot.json).
+    """
+    from run_diff import RunDiff, Snapshot
+    
+    base_path = base_path or os.getenv('TEAMS_DIFF_BASE', '.cache/teams/last-snapshot.json')
+    current = Snapshot.from_workbook(excel_path)
+    if not os.path.exists(base_path):
+        print(f"ℹ️ Sin snapshot anterior en {base_path}: la tarjeta no incluye cambios")
+        return None, current
+    return RunDiff(Snapshot.load(base_path), current), current
+
+def build_diff_section(diff, limit=5):
+    """Sección de la tarjeta con regresiones y arreglos desde el último envío (RunDiff)"""
+    summary = diff.summary()
+    facts = [{
+        "name": "🔀 Cambios",
+        "value": f"📉 {summary['regressions']} regresiones | 📈 {summary['fixes']} arreglados | "
+                 f"🔁 {summary['changed']} con cambio de estado | 🆕 {summary['new']} nuevos | 🗑️ {summary['removed']} eliminados"
+    }]
+    for title, ids in (("📉 Regresiones", diff.regressions), ("📈 Arreglados", diff.fixes)):
+        if not ids:
+            continue
+        lines = [diff.format_change(history_id) for history_id in ids[:limit]]
+        if len(ids) > limit:
+            lines.append(f"... y {len(ids) - limit} más")
+        facts.append({"name": title, "value": "<br>".join(lines)})
     
+    return {
+        "activityTitle": "🔀 Cambios desde el último reporte",
+        "facts": facts,
+        "markdown": True
+    }
+
+def build_teams_payload(metrics, diff=None):
+    """Construye la tarjeta de Teams con el resumen por categoría (y los cambios si se pasa un RunDiff)"""
     # Calcular totales
     total_cases = sum(m['total'] for m in metrics.values())
     total_passed = sum(m['passed'] for m in metrics.values())
     total_failed = sum(m['failed'] for m in metrics.values())
     total_pending = sum(m['pending'] for m in metrics.values())
+    total_blocked = sum(m.get('blocked', 0) for m in metrics.values())
+    total_skipped = sum(m.get('skipped', 0) for m in metrics.values())
     overall_pass_rate = round((total_passed / total_cases * 100), 2) if total_cases > 0 else 0
     
     # Determinar color según pass rate general
@@ -88,7 +117,8 @@ def send_teams_notification(webhook_url, metrics):
     for category, data in metrics.items():
         category_facts.append({
             "name": f"📋 {category}",
-            "value": f"Total: {data['total']} | ✅ {data['passed']} | ❌ {data['failed']} | ⏳ {data['pending']} | {data['pass_rate']}%"
+            "value": f"Total: {data['total']} | ✅ {data['passed']} | ❌ {data['failed']} | ⏳ {data['pending']} | "
+                     f"🚫 {data.get('blocked', 0)} | ⏭️ {data.get('skipped', 0)} | {data['pass_rate']}%"
         })
     
     # Crear mensaje para Teams
@@ -104,7 +134,8 @@ def send_teams_notification(webhook_url, metrics):
                 "facts": [
                     {
                         "name": "📈 Resumen General",
-                        "value": f"Total: {total_cases} | ✅ {total_passed} | ❌ {total_failed} | ⏳ {total_pending}"
+                        "value": f"Total: {total_cases} | ✅ {total_passed} | ❌ {total_failed} | ⏳ {total_pending} | "
+                                 f"🚫 {total_blocked} | ⏭️ {total_skipped}"
                     },
                     {
                         "name": "🎯 Tasa de Éxito General",
@@ -133,29 +164,64 @@ def send_teams_notification(webhook_url, metrics):
         ]
     }
     
+    if diff is not None:
+        payload["sections"].insert(1, build_diff_section(diff))
+    
+    return payload
+
+def send_teams_notification(webhook_url, metrics, notifier=None, force=False, diff=None):
+    """
+    Envía notificación a Teams con resumen por categoría.
+    
+    webhook_url puede ser una URL, varias separadas por coma o una lista;
+    el envío a todas se hace en paralelo. Si las métricas no cambiaron desde
+    el último envío exitoso no se envía nada (salvo force=True). Con diff
+    (RunDiff) la tarjeta incluye las regresiones y arreglos.
+    """
+    if not metrics:
+        print("❌ No hay métricas para enviar")
+        return False
+    
+    if isinstance(webhook_url, str):
+        webhook_url = [url.strip() for url in webhook_url.split(',')]
+    
+    payload = build_teams_payload(metrics, diff)
+    
     try:
-        response = requests.post(webhook_url, json=payload)
-        if response.status_code in [200, 201]:
-            print("✅ Notificación enviada a Teams exitosamente")
-            return True
-        else:
-            print(f"❌ Error al enviar notificación: {response.status_code}")
-            print(f"Respuesta: {response.text}")
-            return False
+        if notifier is not None:
+            return notifier.send(webhook_url, payload, metrics=metrics, force=force)
+        from teams_notifier import TeamsNotifier
+        with TeamsNotifier() as notifier:
+            return notifier.send(webhook_url, payload, metrics=metrics, force=force)
     except Exception as e:
         print(f"❌ Error enviando notificación: {e}")
         return False
 
 if __name__ == "__main__":
+    import sys
+    
     webhook_url = os.getenv('TEAMS_WEBHOOK_URL')
     
     if not webhook_url:
         print("❌ Error: TEAMS_WEBHOOK_URL no está configurada")
         exit(1)
     
+    # --force envía aunque las métricas no hayan cambiado desde el último envío
+    force = '--force' in sys.argv[1:] or os.getenv('TEAMS_FORCE') == '1'
+    # --diff agrega regresiones y arreglos respecto del snapshot del último envío
+    with_diff = '--diff' in sys.argv[1:] or os.getenv('TEAMS_DIFF') == '1'
+    
     metrics = extract_metrics_by_category()
     if metrics:
-        send_teams_notification(webhook_url, metrics)
+        diff = snapshot = None
+        if with_diff:
+            diff, snapshot = diff_since_last()
+            # Mismos totales pero casos que cambiaron de estado: la tarjeta tiene información nueva
+            if diff is not None and (diff.changed or diff.new or diff.removed):
+                force = True
+        sent = send_teams_notification(webhook_url, metrics, force=force, diff=diff)
+        if sent and snapshot is not None and not os.getenv('TEAMS_DIFF_BASE'):
+            snapshot.save('.cache/teams/last-snapshot.json')
     else:
         print("❌ No se pudieron extraer métricas")
         exit(1)
@@ -0,0 +1,229 @@
+"""
+Genera en paralelo los reportes de los shards de allure-results.
+
+Con --shards el conversor reparte los resultados en allure-results/<shard>/
+(cada uno con su categories.json, environment.properties e history/) y
+escribe allure-results/shards.json. Este script ejecuta un
+"allure generate" por shard, --workers a la vez, en allure-report/<shard>/ y
+arma allure-report/index.html + index.json con el resumen de cada shard
+(estados, pass rate, tiempo y memoria de su generación) y links a cada
+reporte. Cada generación es un proceso aparte, así que la memoria máxima es
+la del shard más grande y no la de la suite completa.
+
+Uso:
+    python scripts/shard_report.py allure-results -o allure-report --workers 4
+    python scripts/shard_report.py allure-results -o allure-summary --generator summary
+"""
+import argparse
+import html
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from report_summary import STATUS_COLORS, STATUS_LABELS, STATUSES, ReportSummary
+
+# Comando de cada generador ({results} y {report} se reemplazan por los directorios del shard)
+GENERATORS = {
+    'allure': ['allure', 'generate', '{results}', '-o', '{report}', '--clean'],
+    # Resumen en Python (report_summary.py): sin Java, para previews y pruebas locales
+    'summary': [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'report_summary.py'),
+                '{results}', '-o', '{report}'],
+}
+
+
+def load_shards(results_dir):
+    """Contenido de allure-results/shards.json (None si la conversión no fue en shards)"""
+    try:
+        with open(os.path.join(results_dir, 'shards.json'), encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def run_generator(command, log_path):
+    """
+    Ejecuta el comando y devuelve (código de salida, segundos, RSS máximo en MB).
+
+    os.wait4 da el uso de recursos de ese proceso (getrusage(RUSAGE_CHILDREN)
+    mezclaría todos los shards).
+    """
+    start = time.perf_counter()
+    env = dict(os.environ)
+    # El resumen de cada shard no va al resumen del job de GitHub Actions
+    env.pop('GITHUB_STEP_SUMMARY', None)
+    with open(log_path, 'w', encoding='utf-8') as log:
+        process = subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT, env=env)
+        if hasattr(os, 'wait4'):
+            _, status, usage = os.wait4(process.pid, 0)
+            process.returncode = os.waitstatus_to_exitcode(status)
+            # ru_maxrss está en KB en Linux y en bytes en macOS
+            peak_rss_mb = usage.ru_maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+        else:
+            process.wait()
+            peak_rss_mb = None
+    wall_s = time.perf_counter() - start
+    return process.returncode, round(wall_s, 2), round(peak_rss_mb, 1) if peak_rss_mb is not None else None
+
+
+class ShardReport:
+    """Generación en paralelo de los reportes de cada shard y el índice combinado"""
+
+    def __init__(self, results_dir='allure-results', report_dir='allure-report', workers=None, generator='allure'):
+        self.results_dir = results_dir
+        self.report_dir = report_dir
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.generator = GENERATORS[generator] if isinstance(generator, str) else generator
+
+    @staticmethod
+    def shard_statistic(results, report):
+        """
+        Casos por estado del shard: widgets/summary.json del reporte generado
+        (allure y report_summary.py lo escriben) o, si falta, los *-result.json.
+        """
+        statistic = dict.fromkeys(STATUSES + ['total'], 0)
+        try:
+            with open(os.path.join(report, 'widgets', 'summary.json'), encoding='utf-8') as f:
+                statistic.update(json.load(f)['statistic'])
+        except (FileNotFoundError, ValueError, KeyError):
+            summary = ReportSummary.from_results_dir(results)
+            statistic.update(summary.statistic, total=summary.total)
+        return statistic
+
+    def generate_shard(self, shard):
+        """Genera el reporte de un shard y devuelve su entrada del índice"""
+        results = os.path.join(self.results_dir, shard['dir'])
+        report = os.path.join(self.report_dir, shard['dir'])
+        command = [part.format(results=results, report=report) for part in self.generator]
+        returncode, wall_s, peak_rss_mb = run_generator(
+            command, os.path.join(self.report_dir, 'shard-logs', f"{shard['name']}.log"))
+
+        statistic = self.shard_statistic(results, report)
+        total = statistic['total']
+        entry = {
+            'name': shard['name'],
+            'report': f"{shard['dir']}/index.html",
+            'ok': returncode == 0,
+            'statistic': statistic,
+            'pass_rate': round(statistic['passed'] / total * 100, 2) if total else 0,
+            'wall_s': wall_s,
+            'peak_rss_mb': peak_rss_mb,
+        }
+        icon = '✅' if entry['ok'] else '❌'
+        print(f"{icon} {shard['name']}: {total} casos, {wall_s:.2f}s, "
+              f"{peak_rss_mb if peak_rss_mb is not None else '?'} MB")
+        return entry
+
+    def generate(self):
+        """Genera todos los shards (los más grandes primero) y escribe el índice; True si ninguno falló"""
+        index = load_shards(self.results_dir)
+        if index is None:
+            print(f"❌ Error: {self.results_dir} no tiene shards.json (convierte con --shards)")
+            return False
+        shards = sorted(index['shards'], key=lambda shard: shard['tests'], reverse=True)
+
+        # Directorios que no son de un shard actual (shards anteriores o un reporte sin shards)
+        if os.path.isdir(self.report_dir):
+            names = {shard['dir'] for shard in shards}
+            for entry in os.scandir(self.report_dir):
+                if entry.is_dir() and entry.name != 'shard-logs' and entry.name not in names:
+                    shutil.rmtree(entry.path, ignore_errors=True)
+        os.makedirs(os.path.join(self.report_dir, 'shard-logs'), exist_ok=True)
+
+        print(f"\n🧩 Generando {len(shards)} shards con {self.workers} procesos en paralelo\n")
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            entries = list(executor.map(self.generate_shard, shards))
+        wall_s = time.perf_counter() - start
+
+        entries.sort(key=lambda entry: entry['name'])
+        totals = dict.fromkeys(STATUSES + ['total'], 0)
+        for entry in entries:
+            for status, count in entry['statistic'].items():
+                totals[status] = totals.get(status, 0) + count
+        rss = [entry['peak_rss_mb'] for entry in entries if entry['peak_rss_mb'] is not None]
+        data = {
+            'shard_by': index.get('shard_by'),
+            'statistic': totals,
+            'pass_rate': round(totals['passed'] / totals['total'] * 100, 2) if totals['total'] else 0,
+            'wall_s': round(wall_s, 2),
+            'peak_rss_mb': max(rss) if rss else None,
+            'shards': entries,
+        }
+        with open(os.path.join(self.report_dir, 'index.json'), 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        index_path = os.path.join(self.report_dir, 'index.html')
+        with open(index_path, 'w', encoding='utf-8') as f:
+            f.write(self.render_html(data))
+
+        failed = [entry['name'] for entry in entries if not entry['ok']]
+        print(f"\n✅ Índice de shards: {index_path} ({totals['total']} casos, {wall_s:.2f}s, "
+              f"máx. {data['peak_rss_mb']} MB por shard)")
+        if failed:
+            print(f"❌ Shards con error (ver {self.report_dir}/shard-logs/): {', '.join(failed)}")
+        return not failed
+
+    @staticmethod
+    def render_html(data):
+        """Página índice: una fila por shard con link a su reporte"""
+        header = ''.join(f'<th>{STATUS_LABELS[status][0]} {STATUS_LABELS[status][1]}</th>' for status in STATUSES)
+        rows = []
+        for entry in data['shards'] + [dict(name='Total', report=None, ok=True, **{
+                key: data[key] for key in ('statistic', 'pass_rate', 'wall_s', 'peak_rss_mb')})]:
+            statistic = entry['statistic']
+            total = statistic['total']
+            bar = ''.join(
+                f'<span style="width:{statistic[status] / total * 100:.2f}%;background:{STATUS_COLORS[status]}"></span>'
+                for status in STATUSES if total and statistic[status]
+            )
+            name = html.escape(entry['name'])
+            if entry['report']:
+                name = f'<a href="{html.escape(entry["report"])}">{name}</a>'
+            if not entry['ok']:
+                name += ' ❌'
+            rows.append(f'<tr><td>{name}</td>' + ''.join(f'<td>{statistic[status]}</td>' for status in STATUSES)
+                        + f'<td>{total}</td><td>{entry["pass_rate"]}%</td><td>{entry["wall_s"]}s</td>'
+                        + f'<td>{entry["peak_rss_mb"] if entry["peak_rss_mb"] is not None else "-"} MB</td>'
+                        + f'<td class="wide"><div class="bar">{bar}</div></td></tr>')
+        return f"""<!DOCTYPE html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<title>Allure Report - Shards</title>
+<style>
+body {{ font-family: -apple-system, Segoe UI, Roboto, sans-serif; margin: 2rem; color: #333; }}
+table {{ border-collapse: collapse; }}
+th, td {{ padding: .35rem .7rem; border-bottom: 1px solid #eee; text-align: right; }}
+td:first-child {{ text-align: left; font-weight: 600; }}
+td.wide {{ width: 260px; }}
+.bar {{ display: flex; height: 14px; width: 240px; background: #f3f3f3; border-radius: 3px; overflow: hidden; }}
+.bar span {{ display: block; height: 100%; }}
+</style>
+</head>
+<body>
+<h1>🧩 Reporte por shards ({html.escape(str(data['shard_by']))})</h1>
+<p>{data['pass_rate']}% pass rate · {data['statistic']['total']} casos en {len(data['shards'])} shards</p>
+<table><tr><th>Shard</th>{header}<th>Total</th><th>Pass rate</th><th>Generación</th><th>Memoria</th><th></th></tr>
+{''.join(rows)}</table>
+</body>
+</html>
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Genera en paralelo los reportes de los shards de allure-results')
+    parser.add_argument('results_dir', nargs='?', default='allure-results', help='Directorio allure-results con shards.json')
+    parser.add_argument('-o', '--output', default='allure-report', help='Directorio del reporte (default: allure-report)')
+    parser.add_argument('--workers', type=int, default=None, help='Shards generados a la vez (default: uno por CPU)')
+    parser.add_argument('--generator', choices=sorted(GENERATORS), default='allure',
+                        help="'allure' (allure generate, default) o 'summary' (resumen en Python, sin Java)")
+    args = parser.parse_args()
+
+    return ShardReport(args.results_dir, args.output, args.workers, args.generator).generate()
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,178 @@
+import itertools
+
+STATUSES = ['PASSED', 'FAILED', 'PENDING', 'BLOCKED', 'SKIPPED']
+
+class SuiteMetrics:
+    """
+    Métricas agregadas de una suite de casos de prueba.
+
+    Guarda la cantidad de casos por (Category, Status, Priority) y a partir
+    de ahí calcula los totales que usan la tarjeta de Teams y el resumen de
+    estadísticas del conversor. Los estados se normalizan a mayúsculas
+    (PASSED, FAILED, PENDING, BLOCKED, SKIPPED u otros tal cual).
+    """
+
+    def __init__(self, counts):
+        # {(category, status, priority): cantidad}
+        self.counts = counts
+
+    @staticmethod
+    def find_status_column(columns):
+        """Primera columna cuyo nombre contiene 'status'"""
+        for col in columns:
+            if 'status' in str(col).lower():
+                return col
+        return None
+
+    @classmethod
+    def from_rows(cls, rows, columns, status_col=None, category_col='Category', priority_col='Priority'):
+        """
+        Agrega filas dict (WorkbookReader) sin pandas ni numpy.
+
+        Las etiquetas son el texto que tendrían en el DataFrame del conversor
+        (el mismo que from_cases): vacías → 'nan', y en columnas solo
+        numéricas con vacías o decimales los valores se formatean como float
+        (1 → '1.0'). El estado va en mayúsculas.
+        """
+        status_col = status_col or cls.find_status_column(columns)
+        keys = [col if col is not None and col in columns else None
+                for col in (category_col, status_col, priority_col)]
+
+        raw = {}
+        for row in rows:
+            key = []
+            for col in keys:
+                value = None if col is None else row.get(col)
+                # NaN != NaN: las celdas vacías se agrupan con una sola clave
+                key.append(None if isinstance(value, float) and value != value else value)
+            key = tuple(key)
+            raw[key] = raw.get(key, 0) + 1
+
+        labels = []
+        for position, col in enumerate(keys):
+            uniques = {key[position] for key in raw}
+            values = [value for value in uniques if value is not None]
+            as_float = (values and all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in values)
+                        and (None in uniques or any(isinstance(value, float) for value in values)))
+            column_labels = {}
+            for value in uniques:
+                if col is None:
+                    label = ''
+                elif value is None:
+                    label = 'nan'
+                else:
+                    label = str(float(value)) if as_float else str(value)
+                column_labels[value] = label.upper() if position == 1 else label
+            labels.append(column_labels)
+
+        counts = {}
+        for key, count in raw.items():
+            key = tuple(labels[position][value] for position, value in enumerate(key))
+            counts[key] = counts.get(key, 0) + count
+        return cls(counts)
+
+    @classmethod
+    def from_cases(cls, cases):
+        """
+        Agrega registros TestCase (valores ya convertidos a texto).
+
+        Las etiquetas son el texto de la celda ('nan' si está vacía), '' si
+        la columna no existe y el estado en mayúsculas. Se cuenta por
+        valor original y solo se normalizan las combinaciones distintas.
+        """
+        raw = {}
+        for case in cases:
+            key = (case.category, case.status, case.priority)
+            raw[key] = raw.get(key, 0) + 1
+
+        counts = {}
+        for (category, status, priority), count in raw.items():
+            key = (category or '', (status or '').upper(), priority or '')
+            counts[key] = counts.get(key, 0) + count
+        return cls(counts)
+
+    @classmethod
+    def from_workbook(cls, excel_path):
+        """Agrega el Excel (o CSV/Parquet/NDJSON) leyéndolo en streaming, sin cargar un DataFrame"""
+        from workbook_reader import WorkbookReader, reader_for
+
+        reader = (reader_for(excel_path) or WorkbookReader)(excel_path)
+        rows = reader.iter_rows()
+        first = next(rows, None)
+        if not reader.sheet_columns:
+            raise ValueError("Tabs 'Functional TC' o 'Non Functional TC' no encontradas")
+        columns = reader.combined_columns(reader.sheet_columns)
+        return cls.from_rows(() if first is None else itertools.chain([first], rows), columns)
+
+    @classmethod
+    def from_records(cls, records):
+        """Agrega tuplas (category, status, priority) ya normalizadas"""
+        counts = {}
+        for key in records:
+            counts[key] = counts.get(key, 0) + 1
+        return cls(counts)
+
+    def update(self, other):
+        """Suma los conteos de otro SuiteMetrics (p. ej. de otro bloque de filas)"""
+        for key, count in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + count
+        return self
+
+    def _sum(self, key_index, filter_index=None, filter_value=None):
+        totals = {}
+        for key, count in self.counts.items():
+            if filter_index is not None and key[filter_index] != filter_value:
+                continue
+            totals[key[key_index]] = totals.get(key[key_index], 0) + count
+        return totals
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
+
+    def categories(self):
+        """Categorías en el orden en que aparecen"""
+        return list(dict.fromkeys(key[0] for key in self.counts))
+
+    def status_counts(self, category=None):
+        """Casos por estado (opcionalmente de una categoría), de mayor a menor"""
+        totals = self._sum(1, 0 if category is not None else None, category)
+        return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+    def priority_counts(self, category=None):
+        """Casos por prioridad (opcionalmente de una categoría)"""
+        return self._sum(2, 0 if category is not None else None, category)
+
+    def summary(self, category=None):
+        """Totales de los cinco estados y pass rate (passed / total)"""
+        statuses = self.status_counts(category)
+        total = sum(statuses.values())
+        summary = {'total': total}
+        for status in STATUSES:
+            summary[status.lower()] = statuses.get(status, 0)
+        summary['pass_rate'] = round(summary['passed'] / total * 100, 2) if total > 0 else 0
+        return summary
+
+    def by_category(self):
+        """Resumen por categoría: {category: summary}"""
+        return {category: self.summary(category) for category in self.categories()}
+
+    def to_dict(self):
+        """Representación JSON (las claves se guardan como lista de filas)"""
+        return {
+            'total': self.total,
+            'summary': self.summary(),
+            'by_category': self.by_category(),
+            'priorities': self.priority_counts(),
+            'counts': [
+                {'category': category, 'status': status, 'priority': priority, 'count': count}
+                for (category, status, priority), count in self.counts.items()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls({
+            (row['category'], row['status'], row['priority']): row['count']
+            for row in data['counts']
+        })
@@ -0,0 +1,151 @@
+import hashlib
+import json
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class TeamsNotifier:
+    """
+    Envía tarjetas a uno o varios webhooks de Teams.
+
+    Usa una sesión HTTP con pool de conexiones, timeouts explícitos de
+    conexión/lectura y reintentos acotados con backoff exponencial y jitter
+    ante 429/5xx o errores de red. Si las métricas son las mismas que las del
+    último envío exitoso a esos webhooks, no se vuelve a enviar.
+    """
+
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+    OK_STATUSES = {200, 201, 202}
+
+    def __init__(self, connect_timeout=5, read_timeout=15, max_retries=3,
+                 backoff_base=0.5, backoff_max=8, state_path=None, max_workers=8):
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.state_path = Path(state_path or os.getenv('TEAMS_STATE_PATH', '.cache/teams/last-sent.json'))
+        self.max_workers = max_workers
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @staticmethod
+    def metrics_hash(metrics):
+        """Hash estable de las métricas (independiente del orden de las claves)"""
+        content = json.dumps(metrics, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _state_key(webhook_urls):
+        # No se guardan las URLs (contienen el token del webhook), solo su hash
+        return hashlib.sha256('\n'.join(sorted(webhook_urls)).encode('utf-8')).hexdigest()
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _save_state(self, state):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def already_sent(self, webhook_urls, metrics):
+        """True si estas métricas ya se enviaron a estos webhooks"""
+        state = self._load_state()
+        return state.get(self._state_key(webhook_urls)) == self.metrics_hash(metrics)
+
+    def mark_sent(self, webhook_urls, metrics):
+        state = self._load_state()
+        state[self._state_key(webhook_urls)] = self.metrics_hash(metrics)
+        self._save_state(state)
+
+    def _backoff(self, attempt, response=None):
+        """Segundos a esperar antes del reintento (Retry-After o backoff exponencial con jitter)"""
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def post(self, webhook_url, payload):
+        """
+        Envía el payload a un webhook con reintentos.
+
+        Devuelve (ok, detalle) donde detalle es el último status o error.
+        """
+        detail = None
+        for attempt in range(self.max_retries + 1):
+            response = None
+            try:
+                response = self.session.post(webhook_url, json=payload, timeout=self.timeout)
+                if response.status_code in self.OK_STATUSES:
+                    return True, response.status_code
+                detail = f"{response.status_code}: {response.text[:200]}"
+                if response.status_code not in self.RETRY_STATUSES:
+                    return False, detail
+            except (requests.ConnectionError, requests.Timeout) as e:
+                detail = str(e)
+
+            if attempt < self.max_retries:
+                delay = self._backoff(attempt, response)
+                print(f"🔁 Reintentando envío a Teams en {delay:.1f}s ({detail})")
+                time.sleep(delay)
+
+        return False, detail
+
+    def send(self, webhook_urls, payload, metrics=None, force=False):
+        """
+        Envía el payload a todos los webhooks en paralelo.
+
+        Si se pasan las métricas y ya se enviaron a estos webhooks se omite el
+        envío (salvo force=True). Devuelve True si todos los envíos fueron
+        exitosos o si se omitió, y False si no hay ningún webhook.
+        """
+        if isinstance(webhook_urls, str):
+            webhook_urls = [webhook_urls]
+        webhook_urls = [url for url in webhook_urls if url]
+        if not webhook_urls:
+            print("❌ No hay webhooks de Teams configurados")
+            return False
+
+        if metrics is not None and not force and self.already_sent(webhook_urls, metrics):
+            print("⏭️ Métricas sin cambios desde el último envío, no se notifica a Teams")
+            return True
+
+        workers = max(1, min(self.max_workers, len(webhook_urls)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            outcomes = list(executor.map(lambda url: self.post(url, payload), webhook_urls))
+
+        ok = True
+        for index, (sent, detail) in enumerate(outcomes, 1):
+            if sent:
+                print(f"✅ Notificación enviada a Teams exitosamente (webhook {index}/{len(webhook_urls)})")
+            else:
+                print(f"❌ Error al enviar notificación (webhook {index}/{len(webhook_urls)}): {detail}")
+                ok = False
+
+        if ok and metrics is not None:
+            self.mark_sent(webhook_urls, metrics)
+        return ok
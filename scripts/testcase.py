@@ -0,0 +1,124 @@
+"""
+Registro compacto de un caso de prueba del Excel.
+
+TestCase guarda solo los textos de la fila en __slots__ (sin __dict__ ni el
+índice de una Series de pandas). Los valores de pocas variantes (categoría,
+prioridad, tipo, estado) se internan para que todos los casos compartan el
+mismo str, y los labels de Allure que se repiten entre casos se crean una
+sola vez con shared_label().
+"""
+import sys
+
+# Labels {"name", "value"} compartidos por todos los resultados: no modificarlos
+_LABELS = {}
+
+
+def shared_label(name, value):
+    """Label de Allure compartido por todos los casos con el mismo nombre y valor"""
+    label = _LABELS.get((name, value))
+    if label is None:
+        label = _LABELS[(name, value)] = {"name": name, "value": value}
+    return label
+
+
+class TestCase:
+    """
+    Un caso de prueba con los valores de la fila convertidos a texto.
+
+    Cada atributo es str(valor de la celda) como en el DataFrame ('nan' si la
+    celda está vacía) o None si la columna no existe; Steps vacío es ''.
+    Los defaults de Allure ('Sin título', 'Medium', ...) los aplica el conversor.
+    """
+
+    # Atributo → columna del Excel (en el orden de los argumentos de __init__)
+    COLUMNS = {
+        'test_id': 'ID',
+        'title': 'Title',
+        'category': 'Category',
+        'priority': 'Priority',
+        'test_type': 'Type',
+        'status': 'Status',
+        'description': 'Description',
+        'steps': 'Steps',
+        'expected': 'Expected Result',
+        'test_data': 'Test Data',
+        'notes': 'Linked Reports/Notes',
+    }
+    __slots__ = tuple(COLUMNS)
+
+    # Columnas con pocos valores distintos: un único str compartido por valor
+    INTERNED = ('category', 'priority', 'test_type', 'status')
+
+    def __init__(self, test_id, title, category, priority, test_type, status,
+                 description, steps, expected, test_data, notes):
+        self.test_id = test_id
+        self.title = title
+        self.category = category
+        self.priority = priority
+        self.test_type = test_type
+        self.status = status
+        self.description = description
+        self.steps = steps
+        self.expected = expected
+        self.test_data = test_data
+        self.notes = notes
+
+    def __repr__(self):
+        return f"TestCase({self.test_id!r}, {self.title!r}, status={self.status!r})"
+
+    def __eq__(self, other):
+        if not isinstance(other, TestCase):
+            return NotImplemented
+        return all(getattr(self, attr) == getattr(other, attr) for attr in self.__slots__)
+
+    def __getstate__(self):
+        # Sin __dict__: se serializa (pickle, ProcessPoolExecutor) como tupla
+        return tuple(getattr(self, attr) for attr in self.__slots__)
+
+    def __setstate__(self, state):
+        for attr, value in zip(self.__slots__, state):
+            setattr(self, attr, value)
+
+    @classmethod
+    def from_row(cls, row):
+        """Caso desde una fila (Series de pandas o dict de WorkbookReader)"""
+        values = []
+        for attr, column in cls.COLUMNS.items():
+            if column not in row:
+                values.append('' if attr == 'steps' else None)
+                continue
+            value = row[column]
+            if attr == 'steps':
+                # NaN/None/NaT (x != x) no tienen pasos
+                value = '' if value is None or value != value else str(value)
+            else:
+                value = str(value)
+                if attr in cls.INTERNED:
+                    value = sys.intern(value)
+            values.append(value)
+        return cls(*values)
+
+    @classmethod
+    def from_dataframe(cls, df):
+        """Lista de casos del DataFrame, convirtiendo cada columna de una vez"""
+        size = len(df)
+        columns = []
+        for attr, column in cls.COLUMNS.items():
+            if column not in df.columns:
+                columns.append([None] * size if attr != 'steps' else [''] * size)
+                continue
+            series = df[column]
+            if attr == 'steps':
+                values = [str(value) if not missing else '' for value, missing in zip(series.tolist(), series.isna().tolist())]
+            else:
+                values = list(map(str, series.tolist()))
+                if attr in cls.INTERNED:
+                    values = list(map(sys.intern, values))
+            columns.append(values)
+        return [cls(*values) for values in zip(*columns)]
+
+    @staticmethod
+    def test_types(cases):
+        """Tipos de prueba distintos (columna Type), en orden de aparición y sin vacíos"""
+        return [test_type for test_type in dict.fromkeys(case.test_type for case in cases)
+                if test_type is not None and test_type != 'nan']
@@ -0,0 +1,172 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import time
+from pathlib import Path
+
+
+class WorkbookCache:
+    """
+    Caché en disco de workbooks ya parseados.
+
+    Guarda el DataFrame combinado de las tabs en formato pickle, indexado por
+    el hash del contenido del Excel. Un índice JSON recuerda path, tamaño y
+    mtime de cada archivo para no recalcular el hash mientras el archivo no
+    cambie. Cuando el caché supera max_bytes o max_entries se eliminan las
+    entradas usadas hace más tiempo (LRU).
+
+    Junto a cada workbook se guardan también sus métricas agregadas
+    (<hash>.metrics.json, escritas por el conversor) para que la alerta de
+    Teams las lea sin pandas ni openpyxl.
+    """
+
+    INDEX_FILE = 'index.json'
+
+    def __init__(self, cache_dir=None, max_bytes=None, max_entries=64):
+        self.cache_dir = Path(cache_dir or os.getenv('WORKBOOK_CACHE_DIR', '.cache/workbooks'))
+        if max_bytes is None:
+            max_bytes = int(os.getenv('WORKBOOK_CACHE_MAX_MB', '512')) * 1024 * 1024
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+
+    def _entry_path(self, content_hash):
+        return self.cache_dir / f"{content_hash}.pkl"
+
+    def _metrics_path(self, content_hash):
+        return self.cache_dir / f"{content_hash}.metrics.json"
+
+    def _load_index(self):
+        try:
+            with open(self.cache_dir / self.INDEX_FILE, encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _save_index(self, index):
+        self._atomic_write(self.cache_dir / self.INDEX_FILE, json.dumps(index, indent=2).encode('utf-8'))
+
+    def _atomic_write(self, path, data):
+        """Escribe a un archivo temporal y lo renombra para no dejar entradas a medias"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def content_hash(self, path):
+        """SHA-256 del contenido del archivo"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def lookup(self, path, index=None):
+        """
+        Devuelve el hash de contenido del archivo.
+
+        Si path, tamaño y mtime coinciden con una entrada del índice se usa su
+        hash sin leer el archivo; si no, se calcula.
+        """
+        index = self._load_index() if index is None else index
+        stat = os.stat(path)
+        source = {'path': os.path.abspath(path), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+        for content_hash, entry in index.items():
+            if entry.get('source') == source:
+                return content_hash, source
+        return self.content_hash(path), source
+
+    def get(self, path):
+        """Devuelve el DataFrame cacheado del workbook o None si no está en caché"""
+        index = self._load_index()
+        content_hash, source = self.lookup(path, index)
+        entry_path = self._entry_path(content_hash)
+
+        try:
+            with open(entry_path, 'rb') as f:
+                df = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            index.pop(content_hash, None)
+            return None
+
+        index[content_hash] = {
+            'source': source,
+            'bytes': entry_path.stat().st_size,
+            'last_used': time.time()
+        }
+        self._save_index(index)
+        return df
+
+    def put(self, path, df):
+        """Guarda el DataFrame parseado del workbook y aplica la política de eviction"""
+        index = self._load_index()
+        content_hash, source = self.lookup(path, index)
+        data = pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL)
+        self._atomic_write(self._entry_path(content_hash), data)
+
+        index[content_hash] = {'source': source, 'bytes': len(data), 'last_used': time.time()}
+        self.evict(index)
+        self._save_index(index)
+
+    def load(self, path, parse):
+        """Devuelve el workbook desde el caché o lo parsea con parse() y lo guarda"""
+        df = self.get(path)
+        if df is not None:
+            print(f"♻️ Excel cargado desde caché: {path}")
+            return df
+
+        df = parse()
+        try:
+            self.put(path, df)
+        except OSError as e:
+            print(f"⚠️ No se pudo guardar el Excel en caché: {e}")
+        return df
+
+    def get_metrics(self, path):
+        """Métricas precalculadas del workbook (dict de SuiteMetrics.to_dict) o None"""
+        content_hash, _ = self.lookup(path)
+        try:
+            with open(self._metrics_path(content_hash), encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def put_metrics(self, path, metrics):
+        """Guarda las métricas agregadas del workbook (dict de SuiteMetrics.to_dict)"""
+        content_hash, _ = self.lookup(path)
+        self._atomic_write(self._metrics_path(content_hash), json.dumps(metrics, ensure_ascii=False).encode('utf-8'))
+
+    def evict(self, index):
+        """Elimina las entradas menos usadas hasta respetar max_bytes y max_entries"""
+        entries = sorted(index.items(), key=lambda item: item[1].get('last_used', 0))
+        total_bytes = sum(entry.get('bytes', 0) for _, entry in entries)
+
+        while entries and (total_bytes > self.max_bytes or len(entries) > self.max_entries):
+            content_hash, entry = entries.pop(0)
+            total_bytes -= entry.get('bytes', 0)
+            index.pop(content_hash, None)
+            for entry_path in (self._entry_path(content_hash), self._metrics_path(content_hash)):
+                try:
+                    entry_path.unlink()
+                except FileNotFoundError:
+                    pass
+
+    def clear(self):
+        """Vacía el caché"""
+        index = self._load_index()
+        for content_hash in list(index):
+            try:
+                self._entry_path(content_hash).unlink()
+            except FileNotFoundError:
+                pass
+        # Las métricas pueden existir sin el pickle (conversión --stream)
+        for metrics_path in self.cache_dir.glob('*.metrics.json'):
+            metrics_path.unlink()
+        self._save_index({})
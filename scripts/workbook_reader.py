@@ -0,0 +1,290 @@
+import csv
+import json
+import os
+import re
+from abc import ABC, abstractmethod
+
+# orjson es opcional (más rápido para NDJSON); openpyxl y pyarrow se importan
+# solo al leer un archivo de ese formato
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Tabs del Excel que se convierten (el nombre de la tab se usa como Category)
+TABS = ['Functional TC', 'Non functional TC']
+
+# Valores que pandas interpreta como NaN al leer el Excel
+NA_VALUES = frozenset({
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan',
+    '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None',
+    'n/a', 'nan', 'null'
+})
+
+
+def cell_value(value):
+    """Normaliza una celda igual que pandas (vacías → NaN, 1.0 → 1)"""
+    if value is None:
+        return float('nan')
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and value in NA_VALUES:
+        return float('nan')
+    return value
+
+
+# Números como los reconoce pandas.read_csv (sin '_' ni espacios, que int()/float() sí aceptan)
+_NUMBER = re.compile(r'[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?')
+
+
+def text_value(value):
+    """Normaliza un texto de CSV como pandas.read_csv ('' → NaN, '5' → 5, '1.5' → 1.5)"""
+    if value in NA_VALUES:
+        return float('nan')
+    if value[0] in '-+.0123456789' and _NUMBER.fullmatch(value):
+        if '.' in value or 'e' in value or 'E' in value:
+            return cell_value(float(value))
+        return int(value)
+    return value
+
+
+def sheet_header(header_row):
+    """Construye los nombres de columna como pandas (Unnamed: N, duplicados .1)"""
+    header = list(header_row)
+    while header and header[-1] is None:
+        header.pop()
+
+    columns = []
+    seen = {}
+    for i, name in enumerate(header):
+        name = f"Unnamed: {i}" if name is None else name
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        columns.append(name)
+    return columns
+
+
+class WorkbookReader:
+    """
+    Lee las filas de las tabs de casos de prueba sin pandas.
+
+    Usa openpyxl en modo read-only, por lo que las filas se leen de forma
+    perezosa sin cargar el XML completo en memoria. Cada fila es un dict
+    columna → valor (normalizado como lo hace pandas) con 'Category' igual
+    al nombre de la tab. Lo usan el conversor y la alerta de Teams, que así
+    no necesita importar pandas.
+    """
+
+    def __init__(self, excel_path, tabs=None):
+        self.excel_path = excel_path
+        self.tabs = TABS if tabs is None else tabs
+        # Se completan al abrir el workbook, antes de la primera fila
+        self.sheet_names = []
+        self.sheet_columns = {}
+
+    def iter_rows(self):
+        """Itera las filas de las tabs configuradas abriendo el workbook una sola vez"""
+        import openpyxl
+
+        workbook = openpyxl.load_workbook(self.excel_path, read_only=True, data_only=True)
+        try:
+            sheet_names = workbook.sheetnames
+            self.sheet_names = sheet_names
+            print(f"📋 Hojas encontradas: {sheet_names}")
+
+            # Encabezados de todas las tabs antes de la primera fila (streaming los
+            # usa para que cada bloque tenga las mismas columnas que el DataFrame completo)
+            self.sheet_columns = {}
+            for tab in self.tabs:
+                if tab in sheet_names:
+                    sheet = workbook[tab]
+                    sheet.reset_dimensions()
+                    header = next(sheet.iter_rows(max_row=1, values_only=True), ())
+                    self.sheet_columns[tab] = sheet_header(header)
+
+            for tab in self.tabs:
+                if tab not in sheet_names:
+                    print(f"⚠️ Tab '{tab}' no encontrada")
+                    continue
+
+                sheet = workbook[tab]
+                rows = sheet.iter_rows(values_only=True)
+                next(rows, None)
+                columns = self.sheet_columns[tab]
+
+                # pandas conserva las filas vacías intermedias y descarta las finales
+                blank_rows = 0
+                for values in rows:
+                    if all(value is None for value in values):
+                        blank_rows += 1
+                        continue
+                    for _ in range(blank_rows):
+                        row = dict.fromkeys(columns, float('nan'))
+                        row['Category'] = tab
+                        yield row
+                    blank_rows = 0
+
+                    row = {}
+                    for i, value in enumerate(values):
+                        if i < len(columns):
+                            row[columns[i]] = cell_value(value)
+                        elif value is not None:
+                            row[f"Unnamed: {i}"] = cell_value(value)
+                    for column in columns[len(values):]:
+                        row[column] = float('nan')
+                    row['Category'] = tab
+                    yield row
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def combined_columns(sheet_columns):
+        """Columnas de todas las tabs más Category, en el orden del DataFrame combinado"""
+        columns = []
+        for tab_columns in sheet_columns.values():
+            for column in list(tab_columns) + ['Category']:
+                if column not in columns:
+                    columns.append(column)
+        return columns
+
+
+class FlatFileReader(WorkbookReader, ABC):
+    """
+    Base de los exports planos (una tabla con todas las tabs).
+
+    La tab de cada fila sale de la columna Category; igual que con las hojas
+    del Excel solo se convierten las filas de TABS. Las subclases implementan open_rows(), que devuelve las
+    columnas y un iterador de dicts con los valores ya normalizados.
+    """
+
+    CATEGORY_COLUMN = 'Category'
+    FORMAT = None
+
+    @abstractmethod
+    def open_rows(self):
+        """(columnas, iterador de filas como dicts) del archivo"""
+
+    def iter_rows(self):
+        header, rows = self.open_rows()
+        print(f"📋 Archivo {self.FORMAT}: {os.path.basename(str(self.excel_path))}")
+        if self.CATEGORY_COLUMN not in header:
+            raise ValueError(f"El archivo {self.FORMAT} no tiene la columna {self.CATEGORY_COLUMN} (nombre de la tab)")
+
+        self.sheet_columns = {tab: header for tab in self.tabs}
+        # sheet_names se completa a medida que aparecen las tabs (es la misma lista que ve el conversor)
+        self.sheet_names = []
+        seen = set()
+        for row in rows:
+            tab = row.get(self.CATEGORY_COLUMN)
+            if tab not in self.sheet_columns:
+                continue
+            if tab not in seen:
+                seen.add(tab)
+                self.sheet_names.append(tab)
+            yield row
+
+        for tab in self.tabs:
+            if tab not in seen:
+                print(f"⚠️ Tab '{tab}' no encontrada")
+
+
+class CsvReader(FlatFileReader):
+    """CSV exportado por la herramienta de gestión de pruebas (separador , ; o tab)"""
+
+    FORMAT = 'CSV'
+
+    def open_rows(self):
+        f = open(self.excel_path, newline='', encoding='utf-8-sig')
+        sample = f.read(64 * 1024)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=',;\t')
+        except csv.Error:
+            dialect = csv.excel
+        reader = csv.reader(f, dialect)
+        header = sheet_header(next(reader, []))
+
+        def rows():
+            with f:
+                for values in reader:
+                    if not any(values):
+                        continue
+                    row = {column: text_value(value) for column, value in zip(header, values)}
+                    for column in header[len(values):]:
+                        row[column] = float('nan')
+                    yield row
+
+        return header, rows()
+
+
+class NdjsonReader(FlatFileReader):
+    """Un objeto JSON por línea"""
+
+    FORMAT = 'NDJSON'
+
+    def open_rows(self):
+        loads = orjson.loads if orjson else json.loads
+        f = open(self.excel_path, 'rb')
+        lines = (line for line in f if line.strip())
+        first = next(lines, None)
+        first = loads(first) if first is not None else {}
+        header = list(first)
+
+        def rows():
+            with f:
+                if first:
+                    yield {column: cell_value(value) for column, value in first.items()}
+                for line in lines:
+                    row = {column: cell_value(value) for column, value in loads(line).items()}
+                    for column in header:
+                        if column not in row:
+                            row[column] = float('nan')
+                    yield row
+
+        return header, rows()
+
+
+class ParquetReader(FlatFileReader):
+    """Parquet leído por lotes con pyarrow (dependencia opcional)"""
+
+    FORMAT = 'Parquet'
+    BATCH_SIZE = 10000
+
+    def open_rows(self):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Leer Parquet requiere pyarrow: pip install pyarrow") from None
+
+        parquet_file = pq.ParquetFile(self.excel_path)
+        header = list(parquet_file.schema_arrow.names)
+
+        def rows():
+            for batch in parquet_file.iter_batches(batch_size=self.BATCH_SIZE):
+                for row in batch.to_pylist():
+                    yield {column: cell_value(value) for column, value in row.items()}
+
+        return header, rows()
+
+
+# Lector por extensión de archivo; otros formatos se agregan con register_reader
+READERS = {
+    '.xlsx': WorkbookReader,
+    '.csv': CsvReader,
+    '.ndjson': NdjsonReader,
+    '.jsonl': NdjsonReader,
+    '.parquet': ParquetReader,
+}
+
+
+def register_reader(extension, reader_class):
+    """Registra un lector para una extensión ('.xlsx', '.csv', ...)"""
+    READERS[extension.lower()] = reader_class
+
+
+def reader_for(path):
+    """Clase lectora según la extensión del archivo (None si no está soportada)"""
+    return READERS.get(os.path.splitext(str(path))[1].lower())
@@ -0,0 +1,160 @@
+import os
+import threading
+import time
+import zipfile
+
+from workbook_reader import reader_for
+
+# watchdog es opcional y no está en requirements.txt: por defecto se revisa el
+# directorio periódicamente (polling). Con pip install watchdog se usa inotify en
+# Linux (FSEvents/ReadDirectoryChangesW en macOS/Windows) para reaccionar apenas
+# se guarda el archivo
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+
+
+class _WakeUpHandler(FileSystemEventHandler):
+    """Despierta el loop del watcher ante cualquier evento del directorio"""
+
+    def __init__(self, wake_up):
+        self.wake_up = wake_up
+
+    def on_any_event(self, event):
+        self.wake_up.set()
+
+
+class WorkbookWatcher:
+    """
+    Observa un directorio de workbooks y avisa cuando uno cambió.
+
+    Se observan los archivos con un lector registrado en workbook_reader
+    (.xlsx, .csv, .parquet, .ndjson, ...).
+
+    Los eventos del sistema de archivos solo despiertan el loop: qué cambió se
+    decide comparando (mtime, tamaño) de cada .xlsx, así que los guardados
+    que Excel hace con archivo temporal + rename se detectan igual. Cada
+    cambio espera debounce segundos sin nuevas modificaciones antes de
+    notificarse, se ignoran los archivos de bloqueo (~$archivo.xlsx) y los
+    .xlsx/.parquet que todavía no están completos.
+
+    Sin watchdog instalado (el default, no está en requirements.txt) el
+    directorio se revisa cada interval segundos.
+    """
+
+    def __init__(self, directory, debounce=1.0, interval=0.5):
+        self.directory = directory
+        self.debounce = debounce
+        # Con watchdog el polling es solo un respaldo por si se pierde un evento
+        self.interval = interval if Observer is None else max(interval, 5)
+        self._wake_up = threading.Event()
+        self._stop = threading.Event()
+
+    @staticmethod
+    def is_workbook(path):
+        """True para archivos con lector (no archivos de bloqueo ni temporales de Excel/LibreOffice)"""
+        name = os.path.basename(path)
+        return reader_for(name) is not None and not name.startswith(('~$', '.~lock', '.'))
+
+    @staticmethod
+    def is_complete(path):
+        """
+        Un .xlsx a medio escribir todavía no tiene el directorio central del zip
+        ni un .parquet el footer PAR1; los formatos de texto se leen tal cual.
+        """
+        extension = os.path.splitext(path)[1].lower()
+        try:
+            if extension == '.xlsx':
+                return zipfile.is_zipfile(path)
+            if extension == '.parquet':
+                with open(path, 'rb') as f:
+                    f.seek(-4, os.SEEK_END)
+                    return f.read(4) == b'PAR1'
+            return os.path.exists(path)
+        except OSError:
+            return False
+
+    def snapshot(self):
+        """{path: (mtime_ns, tamaño)} de los archivos de casos del directorio"""
+        workbooks = {}
+        try:
+            entries = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return workbooks
+        for entry in entries:
+            if not self.is_workbook(entry.name):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                # Se borró entre el listado y el stat (guardado en curso)
+                continue
+            workbooks[entry.path] = (stat.st_mtime_ns, stat.st_size)
+        return workbooks
+
+    def stop(self):
+        self._stop.set()
+        self._wake_up.set()
+
+    def run(self, on_change):
+        """
+        Bloquea hasta Ctrl+C (o stop()) llamando on_change(paths) con los
+        workbooks modificados, creados o eliminados desde el último aviso.
+
+        Un error dentro de on_change se informa y el watcher sigue corriendo.
+        """
+        observer = None
+        if Observer is not None:
+            observer = Observer()
+            observer.schedule(_WakeUpHandler(self._wake_up), self.directory, recursive=False)
+            observer.start()
+        mode = 'eventos del sistema de archivos' if observer else f"polling cada {self.interval}s"
+        print(f"\n👀 Observando {self.directory} ({mode}, debounce {self.debounce}s). Ctrl+C para salir.")
+
+        known = self.snapshot()
+        # path → (firma, momento del último cambio)
+        pending = {}
+        try:
+            while not self._stop.is_set():
+                timeout = self.debounce / 2 if pending else self.interval
+                self._wake_up.wait(timeout)
+                self._wake_up.clear()
+
+                now = time.monotonic()
+                current = self.snapshot()
+                for path in set(current) | set(known):
+                    signature = current.get(path)
+                    if signature == known.get(path):
+                        pending.pop(path, None)
+                    elif path not in pending or pending[path][0] != signature:
+                        # Cada guardado nuevo reinicia el debounce
+                        pending[path] = (signature, now)
+
+                ready = []
+                for path, (signature, since) in list(pending.items()):
+                    if now - since < self.debounce:
+                        continue
+                    del pending[path]
+                    known[path] = signature
+                    if signature is None:
+                        known.pop(path)
+                    elif not self.is_complete(path):
+                        print(f"⏳ {path} está incompleto (guardado en curso), se espera al próximo cambio")
+                        continue
+                    ready.append(path)
+
+                if ready:
+                    try:
+                        on_change(sorted(ready))
+                    except Exception as e:
+                        print(f"❌ Error convirtiendo {', '.join(ready)}: {e}")
+                    print(f"\n👀 Esperando cambios en {self.directory}...")
+        except KeyboardInterrupt:
+            print("\n👋 Watch detenido")
+        finally:
+            if observer:
+                observer.stop()
+                observer.join()
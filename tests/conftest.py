@@ -0,0 +1,9 @@
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+# Los scripts se ejecutan como archivos sueltos: se importan desde scripts/ (y benchmarks desde la raíz)
+for path in (ROOT_DIR, ROOT_DIR / 'scripts'):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
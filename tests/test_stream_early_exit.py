@@ -0,0 +1,101 @@
+"""
+La conversión en streaming termina aunque el consumidor salga antes de leer todo.
+
+Con la cola llena el thread lector tiene que cortar al ver stop (también al
+avisar el fin o un error); si no, reader.join() deja colgado el CLI. Para que
+la cola esté llena, el consumidor recién procesa el primer bloque cuando el
+lector ya llenó la cola y quedó esperando. También se comprueba que cada bloque
+tenga exactamente batch_size filas.
+"""
+import contextlib
+import os
+import queue
+import threading
+import time
+
+import excel_to_allure_updated
+from excel_to_allure_updated import ExcelToAllureConverter
+
+# Segundos que puede tardar una conversión de pocas filas antes de considerarla colgada
+TIMEOUT_S = 15
+
+
+def write_csv(path, header, rows):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(','.join(header) + '\n')
+        for row in rows:
+            f.write(','.join(row) + '\n')
+    return path
+
+
+def hold_consumer(monkeypatch):
+    """Después de tomar un bloque, el consumidor espera a que el lector llene la cola"""
+    class HeldQueue(queue.Queue):
+        def get(self, *args, **kwargs):
+            item = super().get(*args, **kwargs)
+            deadline = time.monotonic() + TIMEOUT_S
+            while not self.full() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            # El lector queda bloqueado con el próximo put (bloque, fin o error)
+            time.sleep(0.3)
+            return item
+
+    monkeypatch.setattr(excel_to_allure_updated.queue, 'Queue', HeldQueue)
+
+
+def run_streaming(converter, **kwargs):
+    """convert_streaming en un thread: devuelve (terminó, resultado o excepción)"""
+    outcome = {}
+
+    def target():
+        with open(os.devnull, 'w') as null, contextlib.redirect_stdout(null):
+            try:
+                outcome['result'] = converter.convert_streaming(**kwargs)
+            except Exception as e:
+                outcome['result'] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(TIMEOUT_S)
+    return not thread.is_alive(), outcome.get('result')
+
+
+def test_missing_columns_with_full_queue_does_not_hang(tmp_path, monkeypatch):
+    # Sin Status: el consumidor sale en el primer bloque
+    csv_path = write_csv(tmp_path / 'suite.csv', ['ID', 'Title', 'Category'],
+                         [[f"TC{i}", f"Caso {i}", 'Functional TC'] for i in range(4)])
+    converter = ExcelToAllureConverter(str(csv_path), str(tmp_path / 'results'))
+    hold_consumer(monkeypatch)
+
+    finished, result = run_streaming(converter, batch_size=1, queue_size=2)
+
+    assert finished, 'convert_streaming quedó colgado esperando al lector'
+    assert result is False
+
+
+def test_error_while_writing_with_full_queue_does_not_hang(tmp_path, monkeypatch):
+    csv_path = write_csv(tmp_path / 'suite.csv', ['ID', 'Title', 'Status', 'Category'],
+                         [[f"TC{i}", f"Caso {i}", 'PASSED', 'Functional TC'] for i in range(4)])
+    converter = ExcelToAllureConverter(str(csv_path), str(tmp_path / 'results'))
+    hold_consumer(monkeypatch)
+
+    def fail(df, built, write=None):
+        raise OSError('disco lleno')
+    monkeypatch.setattr(converter, 'write_chunk', fail)
+
+    finished, result = run_streaming(converter, batch_size=1, queue_size=2)
+
+    assert finished, 'convert_streaming quedó colgado esperando al lector'
+    assert isinstance(result, OSError)
+
+
+def test_chunks_have_exactly_batch_size_rows(tmp_path):
+    csv_path = write_csv(tmp_path / 'suite.csv', ['ID', 'Title', 'Status', 'Category'],
+                         [[f"TC{i}", f"Caso {i}", 'PASSED', 'Functional TC'] for i in range(5)])
+    converter = ExcelToAllureConverter(str(csv_path), str(tmp_path / 'results'))
+
+    with open(os.devnull, 'w') as null, contextlib.redirect_stdout(null):
+        for batch_size, sizes in ((1, [1, 1, 1, 1, 1]), (2, [2, 2, 1]), (5, [5]), (10, [5])):
+            chunks = list(converter.iter_chunks(batch_size))
+            assert [len(chunk) for chunk in chunks] == sizes
+            assert [idx for chunk in chunks for idx in chunk.index] == list(range(5))
@@ -0,0 +1,54 @@
+"""
+La conversión en streaming (--stream) usa memoria acotada.
+
+Se convierte el mismo tipo de workbook sintético con 4 veces más filas y se
+compara el pico de tracemalloc: tiene que quedar debajo de un límite fijo y
+crecer mucho menos que la cantidad de filas (solo crece el set de uuid
+escritos, unos 100 bytes por caso).
+"""
+import contextlib
+import os
+import tracemalloc
+
+import pytest
+
+from benchmarks.generate_workbook import generate_workbook
+from excel_to_allure_updated import ExcelToAllureConverter
+
+ROWS = 500
+BATCH_SIZE = 100
+# Límite del pico de memoria de Python, el mismo para cualquier cantidad de filas
+MAX_PEAK_MB = 8
+
+
+def stream_peak_mb(workbook, output_dir):
+    """Pico de tracemalloc (MB) de convert_streaming sobre el workbook"""
+    converter = ExcelToAllureConverter(str(workbook), str(output_dir))
+    # El log por caso va a /dev/null: capturarlo en memoria también crecería con las filas
+    with open(os.devnull, 'w') as null, contextlib.redirect_stdout(null):
+        tracemalloc.start()
+        try:
+            assert converter.convert_streaming(batch_size=BATCH_SIZE, queue_size=2)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return peak / 2 ** 20
+
+
+@pytest.fixture(scope='module')
+def workbooks(tmp_path_factory):
+    data_dir = tmp_path_factory.mktemp('workbooks')
+    return {rows: generate_workbook(data_dir / f"suite_{rows}.xlsx", rows) for rows in (ROWS, ROWS * 4)}
+
+
+def test_stream_peak_memory_does_not_grow_with_rows(workbooks, tmp_path):
+    # Primera conversión descartada: carga módulos de openpyxl y pandas que no son de la conversión
+    stream_peak_mb(workbooks[ROWS], tmp_path / 'warmup')
+
+    small = stream_peak_mb(workbooks[ROWS], tmp_path / 'small')
+    large = stream_peak_mb(workbooks[ROWS * 4], tmp_path / 'large')
+
+    assert small < MAX_PEAK_MB
+    assert large < MAX_PEAK_MB
+    # 4 veces más filas: el pico crece menos de un 50% (sin límite en los memos de pasos crece ~2.5 veces)
+    assert large < small * 1.5, f"pico {small:.1f} MB con {ROWS} filas y {large:.1f} MB con {ROWS * 4}"